@@ -34,6 +34,8 @@ __all__ = [
     "WhenNotMatchedClause",
     "QueryRecord",
     "QueryHistory",
+    "AsyncJob",
+    "StreamWriter",
 ]
 
 
@@ -42,6 +44,7 @@ from snowflake.snowpark.version import VERSION
 __version__ = ".".join(str(x) for x in VERSION if x is not None)
 
 
+from snowflake.snowpark.async_job import AsyncJob
 from snowflake.snowpark.column import CaseExpr, Column
 from snowflake.snowpark.dataframe import DataFrame
 from snowflake.snowpark.dataframe_na_functions import DataFrameNaFunctions
@@ -56,6 +59,7 @@ from snowflake.snowpark.relational_grouped_dataframe import (
 )
 from snowflake.snowpark.row import Row
 from snowflake.snowpark.session import Session
+from snowflake.snowpark.stream_writer import StreamWriter
 from snowflake.snowpark.table import (
     DeleteResult,
     MergeResult,
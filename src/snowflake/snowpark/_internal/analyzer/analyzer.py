@@ -3,9 +3,10 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 from collections import Counter
-from typing import Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import snowflake.snowpark
+from snowflake.connector.options import installed_pandas
 from snowflake.snowpark._internal.analyzer.analyzer_utils import (
     alias_expression,
     binary_arithmetic_expression,
@@ -75,6 +76,18 @@ from snowflake.snowpark._internal.analyzer.grouping_set import (
     GroupingSet,
     GroupingSetsExpression,
 )
+from snowflake.snowpark._internal.analyzer.resolution_cache import ResolutionCache
+from snowflake.snowpark._internal.analyzer.schema_inference import (
+    infer_attributes,
+    referenced_column_name,
+)
+from snowflake.snowpark._internal.analyzer.select_statement import (
+    SelectColumn,
+    SelectStatement,
+    merge_filter,
+    merge_project,
+    referenced_column_names,
+)
 from snowflake.snowpark._internal.analyzer.snowflake_plan import (
     SnowflakePlan,
     SnowflakePlanBuilder,
@@ -85,6 +98,7 @@ from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
     Limit,
     LogicalPlan,
     Range,
+    SnowflakeArrowValues,
     SnowflakeCreateTable,
     SnowflakeValues,
     UnresolvedRelation,
@@ -135,9 +149,26 @@ from snowflake.snowpark._internal.analyzer.window_expression import (
     WindowSpecDefinition,
 )
 from snowflake.snowpark._internal.error_message import SnowparkClientExceptionMessages
+from snowflake.snowpark._internal.utils import (
+    deterministic_names,
+    is_sql_select_statement,
+)
 from snowflake.snowpark.types import VariantType, _NumericType
 
 ARRAY_BIND_THRESHOLD = 512
+# Local data with at least this number of cells is uploaded as Parquet files and
+# loaded with COPY INTO instead of being inserted with bound parameters
+BULK_LOAD_THRESHOLD = 100000
+
+_UNCACHED_PLAN_TYPES = (
+    SnowflakeCreateTable,
+    CopyIntoTableNode,
+    CopyIntoLocationNode,
+    CreateViewCommand,
+    TableUpdate,
+    TableDelete,
+    TableMerge,
+)
 
 
 class Analyzer:
@@ -147,6 +178,7 @@ class Analyzer:
         self.generated_alias_maps = {}
         self.subquery_plans = []
         self.alias_maps_to_use = None
+        self.resolution_cache = ResolutionCache()
 
     def analyze(self, expr: Union[Expression, NamedExpression]) -> str:
         if isinstance(expr, GroupingSetsExpression):
@@ -398,7 +430,116 @@ class Analyzer:
         else:
             return self.analyze(expr)
 
+    def project_select_statement(
+        self,
+        project_list: List[Expression],
+        project_sql: List[str],
+        child: SnowflakePlan,
+    ) -> Optional[SelectStatement]:
+        if (
+            len(project_list) == 1
+            and isinstance(project_list[0], Star)
+            and not project_list[0].expressions
+        ):
+            columns, referenced_names = [], []
+        else:
+            columns, referenced_names = [], []
+            for expr, sql in zip(project_list, project_sql):
+                if isinstance(expr, UnresolvedAlias):
+                    expr = expr.child
+                if isinstance(expr, Star):
+                    return None
+                name = referenced_column_name(expr, self.alias_maps_to_use)
+                if name is not None:
+                    columns.append(SelectColumn(sql, name, True))
+                    referenced_names.append({name})
+                    continue
+                if isinstance(expr, Alias):
+                    columns.append(SelectColumn(sql, quote_name(expr.name), False))
+                    expr = expr.child
+                else:
+                    columns.append(SelectColumn(sql, None, False))
+                referenced_names.append(
+                    referenced_column_names(expr, self.alias_maps_to_use)
+                )
+
+        statement = (
+            merge_project(child.select_statement, columns, referenced_names)
+            if child.select_statement
+            else None
+        )
+        if statement is None and self.is_select(child):
+            statement = SelectStatement(
+                columns, child.queries[-1].sql, child.schema_query
+            )
+        return statement
+
+    def filter_select_statement(
+        self, condition_expr: Expression, condition: str, child: SnowflakePlan
+    ) -> Optional[SelectStatement]:
+        statement = (
+            merge_filter(
+                child.select_statement,
+                condition,
+                referenced_column_names(condition_expr, self.alias_maps_to_use),
+            )
+            if child.select_statement
+            else None
+        )
+        if statement is None and self.is_select(child):
+            statement = SelectStatement(
+                [], child.queries[-1].sql, child.schema_query, condition
+            )
+        return statement
+
+    @staticmethod
+    def is_select(plan: SnowflakePlan) -> bool:
+        # whether the last query of the plan can be used in a FROM clause, see
+        # SnowflakePlanBuilder.add_result_scan_if_not_select
+        return isinstance(plan.source_plan, SetOperation) or is_sql_select_statement(
+            plan.queries[-1].sql
+        )
+
     def resolve(self, logical_plan: LogicalPlan) -> SnowflakePlan:
+        with deterministic_names(self.session.deterministic_names_enabled):
+            return self._resolve_with_cache(logical_plan)
+
+    def _resolve_with_cache(self, logical_plan: LogicalPlan) -> SnowflakePlan:
+        # A resolved plan doesn't need resolving, and commands (e.g., COPY INTO or
+        # CREATE TABLE) are built for a single action and may depend on the
+        # session state at the time they are executed, so they are not cached.
+        if isinstance(logical_plan, (SnowflakePlan, *_UNCACHED_PLAN_TYPES)):
+            return self._resolve_plan(logical_plan)
+
+        # The alias maps and subquery plans are copied in and out of the cache because
+        # the analyzer keeps updating them when it analyzes the parent plan.
+        settings = self.resolution_settings()
+        cached = self.resolution_cache.get(logical_plan, settings)
+        if cached is not None:
+            result, alias_maps, subquery_plans = cached
+            self.generated_alias_maps = dict(alias_maps)
+            self.subquery_plans = list(subquery_plans)
+            return result
+
+        result = self._resolve_plan(logical_plan)
+        self.resolution_cache.put(
+            logical_plan,
+            result,
+            dict(self.generated_alias_maps),
+            list(self.subquery_plans),
+            settings,
+        )
+        return result
+
+    def resolution_settings(self) -> Tuple[bool, bool, bool]:
+        """The settings of the session that change the SQL a plan is resolved to."""
+        return (
+            self.session.sql_simplifier_enabled,
+            self.session.cte_optimization_enabled,
+            self.session.deterministic_names_enabled,
+        )
+
+    def _resolve_plan(self, logical_plan: LogicalPlan) -> SnowflakePlan:
         self.subquery_plans = []
         self.generated_alias_maps = {}
         result = self.do_resolve(logical_plan)
@@ -431,7 +572,12 @@ class Analyzer:
                 )
 
         self.alias_maps_to_use = use_maps
-        return self.do_resolve_with_resolved_children(logical_plan, resolved_children)
+        result = self.do_resolve_with_resolved_children(logical_plan, resolved_children)
+        if result is not logical_plan:
+            result.attributes_inferrer = infer_attributes(
+                logical_plan, resolved_children, use_maps
+            )
+        return result
 
     def do_resolve_with_resolved_children(
         self,
@@ -469,18 +615,30 @@ class Analyzer:
             )
 
         if isinstance(logical_plan, Project):
-            return self.plan_builder.project(
-                list(map(self.analyze, logical_plan.project_list)),
-                resolved_children[logical_plan.child],
-                logical_plan,
-            )
+            project_list = list(map(self.analyze, logical_plan.project_list))
+            child = resolved_children[logical_plan.child]
+            if self.session.sql_simplifier_enabled:
+                statement = self.project_select_statement(
+                    logical_plan.project_list, project_list, child
+                )
+                if statement:
+                    return self.plan_builder.select_statement(
+                        statement, child, logical_plan
+                    )
+            return self.plan_builder.project(project_list, child, logical_plan)
 
         if isinstance(logical_plan, Filter):
-            return self.plan_builder.filter(
-                self.analyze(logical_plan.condition),
-                resolved_children[logical_plan.child],
-                logical_plan,
-            )
+            condition = self.analyze(logical_plan.condition)
+            child = resolved_children[logical_plan.child]
+            if self.session.sql_simplifier_enabled:
+                statement = self.filter_select_statement(
+                    logical_plan.condition, condition, child
+                )
+                if statement:
+                    return self.plan_builder.select_statement(
+                        statement, child, logical_plan
+                    )
+            return self.plan_builder.filter(condition, child, logical_plan)
 
         # Add a sample stop to the plan being built
         if isinstance(logical_plan, Sample):
@@ -538,7 +696,12 @@ class Analyzer:
                     )
                 else:
                     return self.plan_builder.large_local_relation_plan(
-                        logical_plan.output, logical_plan.data, logical_plan
+                        logical_plan.output,
+                        logical_plan.data,
+                        logical_plan,
+                        bulk_load=installed_pandas
+                        and len(logical_plan.output) * len(logical_plan.data)
+                        >= BULK_LOAD_THRESHOLD,
                     )
             else:
                 return self.plan_builder.query(
@@ -546,6 +709,15 @@ class Analyzer:
                     logical_plan,
                 )
 
+        if isinstance(logical_plan, SnowflakeArrowValues):
+            if logical_plan.data.num_rows == 0:
+                return self.plan_builder.query(
+                    empty_values_statement(logical_plan.output), logical_plan
+                )
+            return self.plan_builder.large_local_relation_plan(
+                logical_plan.output, logical_plan.data, logical_plan, bulk_load=True
+            )
+
         if isinstance(logical_plan, UnresolvedRelation):
             return self.plan_builder.table(logical_plan.name)
 
@@ -22,10 +22,10 @@ from snowflake.snowpark._internal.type_utils import convert_sp_to_sf_type
 from snowflake.snowpark._internal.utils import (
     TempObjectType,
     is_single_quoted,
-    random_name_for_temp_object,
+    name_for_generated_object,
 )
 from snowflake.snowpark.row import Row
-from snowflake.snowpark.types import DataType
+from snowflake.snowpark.types import BinaryType, DataType
 
 LEFT_PARENTHESIS = "("
 RIGHT_PARENTHESIS = ")"
@@ -123,6 +123,7 @@ WITHIN_GROUP = " WITHIN GROUP "
 VALIDATION_MODE = " VALIDATION_MODE "
 UPDATE = " UPDATE "
 DELETE = " DELETE "
+WITH = " WITH "
 SET = " SET "
 MERGE = " MERGE "
 MATCHED = " MATCHED "
@@ -131,6 +132,17 @@ HEADER = " HEADER "
 IGNORE_NULLS = " IGNORE NULLS "
 
 
+def cte_statement(ctes: List[Tuple[str, str]], child: str) -> str:
+    return (
+        WITH
+        + COMMA.join(
+            name + AS + LEFT_PARENTHESIS + query + RIGHT_PARENTHESIS
+            for name, query in ctes
+        )
+        + child
+    )
+
+
 def result_scan_statement(uuid_place_holder: str) -> str:
     return (
         SELECT
@@ -427,7 +439,6 @@ def range_statement(start: int, end: int, step: int, column_name: str) -> str:
 
 
 def values_statement(output: List[Attribute], data: List[Row]) -> str:
-    table_name = random_name_for_temp_object(TempObjectType.TABLE)
     data_types = [attr.datatype for attr in output]
     names = [quote_name(attr.name) for attr in output]
     rows = []
@@ -437,6 +448,7 @@ def values_statement(output: List[Attribute], data: List[Row]) -> str:
             for value, data_type in zip(row, data_types)
         ]
         rows.append(LEFT_PARENTHESIS + COMMA.join(cells) + RIGHT_PARENTHESIS)
+    table_name = name_for_generated_object(TempObjectType.TABLE, *names, *rows)
     query_source = (
         VALUES
         + COMMA.join(rows)
@@ -468,11 +480,20 @@ def set_operator_statement(left: str, right: str, operator: str) -> str:
     )
 
 
+def _join_aliases(
+    left: str, right: str, join_type: JoinType, condition: str
+) -> Tuple[str, str]:
+    contents = (left, right, type(join_type).__name__, condition or EMPTY_STRING)
+    return (
+        name_for_generated_object(TempObjectType.TABLE, "left", *contents),
+        name_for_generated_object(TempObjectType.TABLE, "right", *contents),
+    )
+
+
 def left_semi_or_anti_join_statement(
     left: str, right: str, join_type: JoinType, condition: str
 ) -> str:
-    left_alias = random_name_for_temp_object(TempObjectType.TABLE)
-    right_alias = random_name_for_temp_object(TempObjectType.TABLE)
+    left_alias, right_alias = _join_aliases(left, right, join_type, condition)
 
     if isinstance(join_type, LeftSemi):
         where_condition = WHERE + EXISTS
@@ -509,8 +530,7 @@ def left_semi_or_anti_join_statement(
 def snowflake_supported_join_statement(
     left: str, right: str, join_type: JoinType, condition: str
 ) -> str:
-    left_alias = random_name_for_temp_object(TempObjectType.TABLE)
-    right_alias = random_name_for_temp_object(TempObjectType.TABLE)
+    left_alias, right_alias = _join_aliases(left, right, join_type, condition)
 
     if isinstance(join_type, UsingJoin):
         join_sql = join_type.tpe.sql
@@ -1109,6 +1129,15 @@ def merge_statement(
     )
 
 
+def staged_parquet_column(column_name: str, datatype: DataType) -> str:
+    # a column of a staged Parquet file that is written by convert_sp_to_arrow_type,
+    # cast to the type of a table column in a COPY transformation
+    value = DOLLAR + "1:" + column_name
+    if isinstance(datatype, BinaryType):
+        return f"TO_BINARY({value}{DOUBLE_COLON}STRING, 'HEX')"
+    return value + DOUBLE_COLON + convert_sp_to_sf_type(datatype)
+
+
 def drop_table_if_exists_statement(table_name: str) -> str:
     return DROP + TABLE + IF + EXISTS + table_name
 
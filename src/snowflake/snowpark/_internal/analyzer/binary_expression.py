@@ -5,13 +5,14 @@ from snowflake.snowpark._internal.analyzer.expression import Expression
 
 
 class BinaryExpression(Expression):
+    __slots__ = ("left", "right")
     sql_operator: str
 
     def __init__(self, left: Expression, right: Expression) -> None:
         super().__init__()
         self.left = left
         self.right = right
-        self.children = [self.left, self.right]
+        self.children = (self.left, self.right)
         self.nullable = self.left.nullable or self.right.nullable
 
     def __str__(self):
@@ -19,76 +20,94 @@ class BinaryExpression(Expression):
 
 
 class BinaryArithmeticExpression(BinaryExpression):
-    pass
+    __slots__ = ()
 
 
 class EqualTo(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "="
 
 
 class NotEqualTo(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "!="
 
 
 class GreaterThan(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = ">"
 
 
 class LessThan(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "<"
 
 
 class GreaterThanOrEqual(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = ">="
 
 
 class LessThanOrEqual(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "<="
 
 
 class EqualNullSafe(BinaryExpression):
+    __slots__ = ()
     sql_operator = "EQUAL_NULL"
 
 
 class And(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "AND"
 
 
 class Or(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "OR"
 
 
 class Add(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "+"
 
 
 class Subtract(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "-"
 
 
 class Multiply(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "*"
 
 
 class Divide(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "/"
 
 
 class Remainder(BinaryArithmeticExpression):
+    __slots__ = ()
     sql_operator = "%"
 
 
 class Pow(BinaryExpression):
+    __slots__ = ()
     sql_operator = "POWER"
 
 
 class BitwiseAnd(BinaryExpression):
+    __slots__ = ()
     sql_operator = "BITAND"
 
 
 class BitwiseOr(BinaryExpression):
+    __slots__ = ()
     sql_operator = "BITOR"
 
 
 class BitwiseXor(BinaryExpression):
+    __slots__ = ()
     sql_operator = "BITXOR"
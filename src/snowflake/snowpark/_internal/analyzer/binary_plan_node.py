@@ -54,28 +54,33 @@ def create_join_type(join_type: str) -> "JoinType":
 
 
 class BinaryNode(LogicalPlan):
+    __slots__ = ("left", "right")
     sql: str
 
     def __init__(self, left: LogicalPlan, right: LogicalPlan) -> None:
         super().__init__()
         self.left = left
         self.right = right
-        self.children = [self.left, self.right]
+        self.children = (self.left, self.right)
 
 
 class SetOperation(BinaryNode):
-    pass
+    __slots__ = ()
 
 
 class Except(SetOperation):
+    __slots__ = ()
     sql = "EXCEPT"
 
 
 class Intersect(SetOperation):
+    __slots__ = ()
     sql = "INTERSECT"
 
 
 class Union(SetOperation):
+    __slots__ = ("is_all",)
+
     def __init__(self, left: LogicalPlan, right: LogicalPlan, is_all: bool) -> None:
         super().__init__(left, right)
         self.is_all = is_all
@@ -161,6 +166,8 @@ class UsingJoin(JoinType):
 
 
 class Join(BinaryNode):
+    __slots__ = ("join_type", "condition")
+
     def __init__(
         self,
         left: LogicalPlan,
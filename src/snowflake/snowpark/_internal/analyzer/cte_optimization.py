@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import re
+from typing import TYPE_CHECKING, List, Set, Tuple
+
+from snowflake.snowpark._internal.analyzer.analyzer_utils import (
+    FROM,
+    LEFT_PARENTHESIS,
+    RIGHT_PARENTHESIS,
+    SELECT,
+    STAR,
+    cte_statement,
+)
+from snowflake.snowpark._internal.utils import TempObjectType, name_for_generated_object
+
+if TYPE_CHECKING:
+    from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
+
+# A CTE referenced more than once might be evaluated only once, so queries whose
+# result differs between evaluations are kept inline.
+_NON_DETERMINISTIC_PATTERN = re.compile(
+    r"\b(random|uuid_string|seq[1248]|uniform|normal|randstr|zipf)\s*\(|\bsample\b",
+    re.IGNORECASE,
+)
+
+
+def subplan_queries(plans: List["SnowflakePlan"]) -> Set[str]:
+    """Returns the last queries of the given plans and all their descendant plans,
+    which are the candidate subqueries to be extracted as CTEs. The structure of a
+    resolved plan is fully determined by its SQL text, so identical subplans have
+    identical queries."""
+    queries = set()
+    visited = set()
+    stack = list(plans)
+    while stack:
+        plan = stack.pop()
+        if id(plan) in visited:
+            continue
+        visited.add(id(plan))
+        queries.add(plan.queries[-1].sql)
+        stack.extend(plan.child_plans)
+    return queries
+
+
+def with_common_table_expressions(query: str, candidates: Set[str]) -> str:
+    """Extracts the candidate subqueries that occur more than once in ``query`` as
+    ``WITH`` clauses, so the text of a repeated subplan is only compiled once.
+
+    Only occurrences as parenthesized subqueries are replaced. Longer candidates are
+    extracted first, so a repeated subplan is extracted as a whole rather than its
+    repeated parts, and the candidates are counted again in the text that remains after
+    each extraction.
+    """
+    main = query
+    ctes: List[Tuple[str, str]] = []
+    for candidate in sorted(candidates, key=len, reverse=True):
+        if _NON_DETERMINISTIC_PATTERN.search(candidate):
+            continue
+        subquery = LEFT_PARENTHESIS + candidate + RIGHT_PARENTHESIS
+        count = main.count(subquery) + sum(q.count(subquery) for _, q in ctes)
+        if count < 2:
+            continue
+        name = name_for_generated_object(TempObjectType.CTE, candidate)
+        reference = LEFT_PARENTHESIS + SELECT + STAR + FROM + name + RIGHT_PARENTHESIS
+        main = main.replace(subquery, reference)
+        ctes = [(n, q.replace(subquery, reference)) for n, q in ctes]
+        ctes.append((name, candidate))
+    if not ctes:
+        return query
+    if not main.strip().upper().startswith("SELECT"):
+        # e.g., a set operation of parenthesized subqueries
+        main = SELECT + STAR + FROM + LEFT_PARENTHESIS + main + RIGHT_PARENTHESIS
+    # a CTE can only reference the ones defined before it, and shorter candidates,
+    # which are extracted later, can only be referenced by longer ones
+    return cte_statement(ctes[::-1], main)
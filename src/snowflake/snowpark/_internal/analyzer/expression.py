@@ -1,14 +1,12 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
-import uuid
+import itertools
 from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
 
-from functools import cached_property
-
 import snowflake.snowpark._internal.analyzer.analyzer_utils as analyzer_utils
 from snowflake.snowpark._internal.error_message import SnowparkClientExceptionMessages
 from snowflake.snowpark._internal.type_utils import (
@@ -23,15 +21,21 @@ class Expression:
     """Consider removing attributes, and adding properties and methods.
     A subclass of Expression may have no child, one child, or multiple children.
     But the constructor accepts a single child. This might be refactored in the future.
+
+    Expressions are created for every operation on a :class:`Column`, so they have no
+    ``__dict__`` and their children are kept in tuples. A subclass must declare the
+    attributes it adds in its own ``__slots__``.
     """
 
+    __slots__ = ("child", "nullable", "children", "datatype")
+
     def __init__(self, child: Optional["Expression"] = None) -> None:
         """
         Subclasses will override these attributes
         """
         self.child = child
         self.nullable = True
-        self.children = [child] if child else None
+        self.children: Tuple[Expression, ...] = (child,) if child else ()
         self.datatype: Optional[DataType] = None
 
     @property
@@ -55,27 +59,39 @@ class Expression:
         return self.pretty_name
 
 
+# Returns a new ID of a named expression, which is only compared with the IDs of other
+# expressions in the same process, so a counter is enough
+next_expr_id = itertools.count().__next__
+
+
 class NamedExpression:
-    name: str = None
+    """A subclass declares the ``name`` and ``expr_id`` slots and sets ``expr_id`` to
+    :func:`next_expr_id`."""
 
-    @cached_property
-    def expr_id(self) -> uuid.UUID:
-        return uuid.uuid4()
+    __slots__ = ()
+    name: str = None
+    expr_id: int
 
 
 class ScalarSubquery(Expression):
+    __slots__ = ("plan",)
+
     def __init__(self, plan: "SnowflakePlan") -> None:
         super().__init__()
         self.plan = plan
 
 
 class MultipleExpression(Expression):
+    __slots__ = ("expressions",)
+
     def __init__(self, expressions: List[Expression]) -> None:
         super().__init__()
         self.expressions = expressions
 
 
 class InExpression(Expression):
+    __slots__ = ("columns", "values")
+
     def __init__(self, columns: Expression, values: List[Expression]) -> None:
         super().__init__()
         self.columns = columns
@@ -83,15 +99,20 @@ class InExpression(Expression):
 
 
 class Star(Expression):
+    __slots__ = ("expressions",)
+
     def __init__(self, expressions: List[NamedExpression]) -> None:
         super().__init__()
         self.expressions = expressions
 
 
 class Attribute(Expression, NamedExpression):
+    __slots__ = ("name", "expr_id")
+
     def __init__(self, name: str, datatype: DataType, nullable: bool = True) -> None:
         super().__init__()
         self.name = name
+        self.expr_id = next_expr_id()
         self.datatype = datatype
         self.nullable = nullable
 
@@ -114,9 +135,12 @@ class Attribute(Expression, NamedExpression):
 
 
 class UnresolvedAttribute(Expression, NamedExpression):
+    __slots__ = ("name", "expr_id")
+
     def __init__(self, name: str) -> None:
         super().__init__()
         self.name = name
+        self.expr_id = next_expr_id()
 
     @property
     def sql(self) -> str:
@@ -133,6 +157,8 @@ class UnresolvedAttribute(Expression, NamedExpression):
 
 
 class Literal(Expression):
+    __slots__ = ("value",)
+
     def __init__(self, value: Any, datatype: Optional[DataType] = None) -> None:
         super().__init__()
 
@@ -155,6 +181,8 @@ class Literal(Expression):
 
 
 class Like(Expression):
+    __slots__ = ("expr", "pattern")
+
     def __init__(self, expr: Expression, pattern: Expression) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -162,6 +190,8 @@ class Like(Expression):
 
 
 class RegExp(Expression):
+    __slots__ = ("expr", "pattern")
+
     def __init__(self, expr: Expression, pattern: Expression) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -169,6 +199,8 @@ class RegExp(Expression):
 
 
 class Collate(Expression):
+    __slots__ = ("expr", "collation_spec")
+
     def __init__(self, expr: Expression, collation_spec: str) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -176,6 +208,8 @@ class Collate(Expression):
 
 
 class SubfieldString(Expression):
+    __slots__ = ("expr", "field")
+
     def __init__(self, expr: Expression, field: str) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -183,6 +217,8 @@ class SubfieldString(Expression):
 
 
 class SubfieldInt(Expression):
+    __slots__ = ("expr", "field")
+
     def __init__(self, expr: Expression, field: int) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -190,12 +226,14 @@ class SubfieldInt(Expression):
 
 
 class FunctionExpression(Expression):
+    __slots__ = ("name", "is_distinct")
+
     def __init__(
         self, name: str, arguments: List[Expression], is_distinct: bool
     ) -> None:
         super().__init__()
         self.name = name
-        self.children = arguments
+        self.children = tuple(arguments)
         self.is_distinct = is_distinct
 
     @property
@@ -211,6 +249,8 @@ class FunctionExpression(Expression):
 
 
 class WithinGroup(Expression):
+    __slots__ = ("expr", "order_by_cols")
+
     def __init__(self, expr: Expression, order_by_cols: List[Expression]) -> None:
         super().__init__(expr)
         self.expr = expr
@@ -219,6 +259,8 @@ class WithinGroup(Expression):
 
 
 class CaseWhen(Expression):
+    __slots__ = ("branches", "else_value")
+
     def __init__(
         self,
         branches: List[Tuple[Expression, Expression]],
@@ -230,6 +272,8 @@ class CaseWhen(Expression):
 
 
 class SnowflakeUDF(Expression):
+    __slots__ = ("udf_name",)
+
     def __init__(
         self,
         udf_name: str,
@@ -239,12 +283,14 @@ class SnowflakeUDF(Expression):
     ) -> None:
         super().__init__()
         self.udf_name = udf_name
-        self.children = children
+        self.children = tuple(children)
         self.datatype = datatype
         self.nullable = nullable
 
 
 class ListAgg(Expression):
+    __slots__ = ("col", "delimiter", "is_distinct")
+
     def __init__(self, col: Expression, delimiter: str, is_distinct: bool) -> None:
         super().__init__()
         self.col = col
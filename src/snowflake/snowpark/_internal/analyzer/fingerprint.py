@@ -0,0 +1,199 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import enum
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from snowflake.connector.options import pyarrow
+from snowflake.snowpark._internal.analyzer.expression import Attribute, Expression
+from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
+from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
+    LogicalPlan,
+    SnowflakeArrowValues,
+)
+from snowflake.snowpark._internal.utils import TEMP_OBJECT_NAME_PREFIX, TempObjectType
+
+# The attributes that don't describe the computation: random ids, caches and the
+# session a plan belongs to
+_IGNORED_ATTRIBUTES = frozenset(
+    ("expr_id", "_resolution_cache_entry", "session", "_session")
+)
+# the children of a plan node are visited before its other attributes
+_IGNORED_PLAN_ATTRIBUTES = _IGNORED_ATTRIBUTES | {"children"}
+
+# The names that are generated for a plan and are local to its SQL, i.e., the prefixes
+# of the columns disambiguated by a join (see dataframe._generate_prefix), and the names
+# of temporary columns and CTEs. The names of temporary tables aren't normalized, since
+# different tables hold different data.
+_GENERATED_NAME_REGEX = re.compile(
+    r'"([alr])_[0-9a-z]{4}_'
+    rf"|{TEMP_OBJECT_NAME_PREFIX}({TempObjectType.COLUMN.value}|{TempObjectType.CTE.value})_[0-9A-Z]{{10}}"
+)
+
+
+def _normalize_generated_names(text: str) -> str:
+    return _GENERATED_NAME_REGEX.sub(
+        lambda m: f'"{m.group(1)}_#_'
+        if m.group(1)
+        else f"{TEMP_OBJECT_NAME_PREFIX}{m.group(2)}_#",
+        text,
+    )
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in ("__dict__", "__weakref__"))
+
+
+def _attributes(obj: Any) -> Iterator[Tuple[str, Any]]:
+    # expressions and plan nodes keep their attributes in slots, and other objects,
+    # e.g., a SnowflakePlan, in their __dict__
+    values = dict(getattr(obj, "__dict__", {}))
+    for name in _slot_names(type(obj)):
+        try:
+            values[name] = getattr(obj, name)
+        except AttributeError:
+            # an unset slot
+            pass
+    return iter(sorted(values.items()))
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Fingerprinter:
+    def __init__(self) -> None:
+        # the fingerprints of the plan nodes visited, by their ids, so a subtree that
+        # is shared by several nodes, e.g., the sides of a self join, is visited once
+        self._plans: Dict[int, str] = {}
+        # The output attributes of the resolved plans visited, by their expr_ids. An
+        # attribute is referred to by the plan it comes from and its position, instead
+        # of its random expr_id, so the columns of the sides of a join are distinct. The
+        # plans with the same fingerprint, e.g., the sides of a self join, are told
+        # apart by the order in which they're visited.
+        self._attributes: Dict[int, str] = {}
+        self._occurrences: Counter = Counter()
+
+    def plan(self, plan: LogicalPlan) -> str:
+        fingerprint = self._plans.get(id(plan))
+        if fingerprint is None:
+            fingerprint = self._plans[id(plan)] = self._plan(plan)
+        return fingerprint
+
+    def _plan(self, plan: LogicalPlan) -> str:
+        if isinstance(plan, SnowflakePlan):
+            # A resolved plan has the same fingerprint as its logical plan, so it
+            # doesn't depend on whether a DataFrame is analyzed lazily. A plan built
+            # from SQL text, e.g., by Session.sql(), is described by its queries.
+            fingerprint = (
+                self.plan(plan.source_plan)
+                if plan.source_plan is not None
+                else _digest(
+                    self.value(
+                        [
+                            [query.sql for query in plan.queries],
+                            [query.sql for query in plan.post_actions],
+                        ]
+                    )
+                )
+            )
+            # only an output that is already computed can be referred to
+            source = f"{fingerprint}#{self._occurrences[fingerprint]}"
+            self._occurrences[fingerprint] += 1
+            for i, attribute in enumerate(plan.__dict__.get("output", ())):
+                self._attributes[attribute.expr_id] = f"{source}:{i}"
+            return fingerprint
+
+        # the children are visited first, so the attributes of their outputs are known
+        # when the expressions of this node are visited
+        children = [self.plan(child) for child in plan.children if child is not None]
+        fields = self._fields(
+            plan,
+            {"data": self._arrow_table(plan.data)}
+            if isinstance(plan, SnowflakeArrowValues)
+            else None,
+        )
+        return _digest(f"{type(plan).__qualname__}{children}{fields}")
+
+    def expression(self, expr: Expression) -> str:
+        if isinstance(expr, Attribute):
+            source = self._attributes.get(expr.expr_id)
+            if source is not None:
+                return f"Attribute({expr.name},{source})"
+        return f"{type(expr).__qualname__}({self._fields(expr)})"
+
+    def value(self, value: Any) -> str:
+        if isinstance(value, LogicalPlan):
+            return self.plan(value)
+        if isinstance(value, Expression):
+            return self.expression(value)
+        if isinstance(value, str):
+            return repr(_normalize_generated_names(value))
+        if value is None or isinstance(value, (bool, int, float, bytes)):
+            return repr(value)
+        if isinstance(value, enum.Enum):
+            return f"{type(value).__qualname__}.{value.name}"
+        if isinstance(value, type):
+            return value.__qualname__
+        if isinstance(value, (list, tuple)):
+            # a Row is a tuple, whose field names are part of its value
+            fields = getattr(value, "_fields", None)
+            items = ",".join(self.value(v) for v in value)
+            return f"{type(value).__qualname__}{fields or ''}[{items}]"
+        if isinstance(value, dict):
+            items = sorted(f"{self.value(k)}:{self.value(v)}" for k, v in value.items())
+            return f"{{{','.join(items)}}}"
+        if isinstance(value, (set, frozenset)):
+            return f"{{{','.join(sorted(self.value(v) for v in value))}}}"
+        if not callable(value) and (
+            hasattr(value, "__dict__") or _slot_names(type(value))
+        ):
+            # e.g., a Column, a DataType or a JoinType
+            return f"{type(value).__qualname__}({self._fields(value)})"
+        # e.g., a Decimal, a date or a function
+        return f"{type(value).__qualname__}:{getattr(value, '__qualname__', value)!r}"
+
+    def _fields(self, obj: Any, overrides: Optional[Dict[str, str]] = None) -> str:
+        ignored = (
+            _IGNORED_PLAN_ATTRIBUTES
+            if isinstance(obj, LogicalPlan)
+            else _IGNORED_ATTRIBUTES
+        )
+        overrides = overrides or {}
+        return ",".join(
+            f"{name}={overrides[name] if name in overrides else self.value(value)}"
+            for name, value in _attributes(obj)
+            if name not in ignored
+        )
+
+    @staticmethod
+    def _arrow_table(table: "pyarrow.Table") -> str:
+        sink = pyarrow.BufferOutputStream()
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return hashlib.sha256(memoryview(sink.getvalue())).hexdigest()
+
+
+def fingerprint(node: Union[LogicalPlan, Expression]) -> str:
+    """Returns a hash of the structure of a logical plan, which may be a resolved
+    :class:`SnowflakePlan`, or of an expression.
+
+    Plans that describe the same computation have the same fingerprint even if they
+    are built separately: the random ``expr_id`` of named expressions and the names
+    generated for the plans, e.g., the aliases of the columns of a join, are ignored.
+    Tables and SQL text are referred to by their names and text, so the fingerprint
+    doesn't change when the data they read changes.
+    """
+    fingerprinter = _Fingerprinter()
+    if isinstance(node, LogicalPlan):
+        return fingerprinter.plan(node)
+    return _digest(fingerprinter.expression(node))
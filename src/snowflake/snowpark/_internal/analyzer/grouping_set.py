@@ -7,21 +7,25 @@ from snowflake.snowpark._internal.analyzer.expression import Expression
 
 
 class GroupingSet(Expression):
+    __slots__ = ("group_by_exprs",)
+
     def __init__(self, group_by_exprs: List[Expression]) -> None:
         super().__init__()
         self.group_by_exprs = group_by_exprs
-        self.children = group_by_exprs
+        self.children = tuple(group_by_exprs)
 
 
 class Cube(GroupingSet):
-    pass
+    __slots__ = ()
 
 
 class Rollup(GroupingSet):
-    pass
+    __slots__ = ()
 
 
 class GroupingSetsExpression(Expression):
+    __slots__ = ("args",)
+
     def __init__(self, args: List[List[Expression]]) -> None:
         super().__init__()
         self.args = args
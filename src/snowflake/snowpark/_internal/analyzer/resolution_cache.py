@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import threading
+import weakref
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from snowflake.snowpark._internal.analyzer.snowflake_plan_node import LogicalPlan
+
+if TYPE_CHECKING:
+    from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
+
+DEFAULT_RESOLUTION_CACHE_SIZE = 1024
+
+
+class ResolutionCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_size: int
+    current_size: int
+
+
+class ResolutionCache:
+    """An LRU cache that maps logical plan nodes, by identity, to the
+    :class:`SnowflakePlan` they were resolved to, along with the alias maps and
+    subquery plans generated while resolving them.
+
+    A resolved plan usually references its source logical plan, so the entry is
+    stored on the node itself and the cache only keeps a weak reference to the node
+    for the LRU bookkeeping. This way an entry never keeps its node alive: it's
+    released when the node is garbage collected or when it's evicted.
+
+    An entry also records the settings of the session that change the generated SQL,
+    e.g., :attr:`Session.sql_simplifier_enabled`, at the time the node was resolved,
+    and it's only returned for the same settings.
+    """
+
+    _ENTRY_ATTR = "_resolution_cache_entry"
+
+    def __init__(self, max_size: int = DEFAULT_RESOLUTION_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._nodes: "OrderedDict[int, weakref.ref]" = OrderedDict()
+        # The keys and references of the nodes that are garbage collected. The
+        # callback of a reference can run in any thread, even while it holds the
+        # lock, so it only appends to this deque, which is thread-safe, and the
+        # entries are removed by the next call that holds the lock.
+        self._collected: "deque[Tuple[int, weakref.ref]]" = deque()
+        self._lock = threading.Lock()
+
+    def get(
+        self, node: LogicalPlan, settings: Hashable = None
+    ) -> Optional[Tuple["SnowflakePlan", Dict[int, str], List["SnowflakePlan"]]]:
+        key = id(node)
+        with self._lock:
+            self._remove_collected()
+            ref = self._nodes.get(key)
+            if ref is not None and ref() is node:
+                entry_settings, *entry = getattr(node, self._ENTRY_ATTR)
+                if entry_settings == settings:
+                    self._nodes.move_to_end(key)
+                    self.hits += 1
+                    return tuple(entry)
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        node: LogicalPlan,
+        plan: "SnowflakePlan",
+        alias_maps: Dict[int, str],
+        subquery_plans: List["SnowflakePlan"],
+        settings: Hashable = None,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        key = id(node)
+        with self._lock:
+            self._remove_collected()
+            setattr(
+                node, self._ENTRY_ATTR, (settings, plan, alias_maps, subquery_plans)
+            )
+            self._nodes[key] = weakref.ref(node, self._make_remover(key))
+            self._nodes.move_to_end(key)
+            while len(self._nodes) > self.max_size:
+                _, evicted_ref = self._nodes.popitem(last=False)
+                evicted = evicted_ref()
+                if evicted is not None:
+                    delattr(evicted, self._ENTRY_ATTR)
+
+    def clear(self) -> None:
+        with self._lock:
+            while self._nodes:
+                _, ref = self._nodes.popitem()
+                node = ref()
+                if node is not None:
+                    delattr(node, self._ENTRY_ATTR)
+            self._collected.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> ResolutionCacheInfo:
+        with self._lock:
+            self._remove_collected()
+            return ResolutionCacheInfo(
+                self.hits, self.misses, self.max_size, len(self._nodes)
+            )
+
+    def _make_remover(self, key: int):
+        # the callback must not reference the node, otherwise it can't be collected
+        collected = self._collected
+
+        def remove(ref: weakref.ref) -> None:
+            collected.append((key, ref))
+
+        return remove
+
+    def _remove_collected(self) -> None:
+        # called with the lock held
+        while self._collected:
+            key, ref = self._collected.popleft()
+            # the key may be reused by a node that is cached since then
+            if self._nodes.get(key) is ref:
+                del self._nodes[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._remove_collected()
+            return len(self._nodes)
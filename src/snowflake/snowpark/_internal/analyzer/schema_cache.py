@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import re
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.utils import TEMP_OBJECT_NAME_PREFIX
+from snowflake.snowpark.query_history import QueryRecord
+
+DEFAULT_SCHEMA_CACHE_SIZE = 512
+
+# Statements that can change the schema of a query that has already been described:
+# DDL on the objects it reads, or a change of the current database, schema, role or
+# session parameters (e.g., TIMESTAMP_TYPE_MAPPING).
+_SCHEMA_CHANGING_STATEMENT_PATTERN = re.compile(
+    r"^\s*(alter|create|drop|replace|undrop|use)\b", re.IGNORECASE
+)
+# Statements that can't change the schema of a query that has already been described:
+# query tags, and DDL on temporary objects created by Snowpark, which have fresh
+# random names that no cached query can depend on.
+_SCHEMA_PRESERVING_STATEMENT_PATTERN = re.compile(
+    r"^\s*(alter\s+session\s+(un)?set\s+query_tag\b"
+    r"|(create|drop)\s+((or|replace|scoped|temporary|temp|table|view|stage|file"
+    rf"|format|function|sequence|if|not|exists)\s+)*\"?{TEMP_OBJECT_NAME_PREFIX})",
+    re.IGNORECASE,
+)
+
+
+def _normalize_query(query: str) -> str:
+    return query.strip().rstrip(";").rstrip()
+
+
+def is_schema_changing_statement(query: str) -> bool:
+    return bool(
+        _SCHEMA_CHANGING_STATEMENT_PATTERN.match(query)
+    ) and not _SCHEMA_PRESERVING_STATEMENT_PATTERN.match(query)
+
+
+class SchemaCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    max_size: int
+    current_size: int
+
+
+class SchemaCache:
+    """An LRU cache that maps the normalized text of a schema query to the attributes
+    returned by describing it, so that building the same pipeline again doesn't need
+    another round trip to the server.
+
+    The cache is registered as a query listener of the session's connection, and is
+    cleared whenever a statement that can change the schema of a described query
+    (e.g., ``ALTER TABLE``, ``CREATE OR REPLACE``, ``USE SCHEMA``) is executed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SCHEMA_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._attributes: "OrderedDict[str, List[Attribute]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, query: str) -> Optional[List[Attribute]]:
+        key = _normalize_query(query)
+        with self._lock:
+            attributes = self._attributes.get(key)
+            if attributes is None:
+                self.misses += 1
+                return None
+            self._attributes.move_to_end(key)
+            self.hits += 1
+            return list(attributes)
+
+    def put(self, query: str, attributes: List[Attribute]) -> None:
+        if self.max_size <= 0:
+            return
+        key = _normalize_query(query)
+        with self._lock:
+            self._attributes[key] = list(attributes)
+            self._attributes.move_to_end(key)
+            while len(self._attributes) > self.max_size:
+                self._attributes.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._attributes.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._attributes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self) -> SchemaCacheInfo:
+        return SchemaCacheInfo(
+            self.hits, self.misses, self.max_size, len(self._attributes)
+        )
+
+    def _add_query(self, query_record: QueryRecord) -> None:
+        # called by the connection after every query it executes
+        if is_schema_changing_statement(query_record.sql_text):
+            self.invalidate()
+
+    def __len__(self) -> int:
+        return len(self._attributes)
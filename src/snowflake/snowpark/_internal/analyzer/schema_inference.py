@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import re
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from snowflake.snowpark._internal.analyzer.analyzer_utils import quote_name
+from snowflake.snowpark._internal.analyzer.binary_plan_node import Union
+from snowflake.snowpark._internal.analyzer.expression import (
+    Attribute,
+    Expression,
+    Star,
+    UnresolvedAttribute,
+)
+from snowflake.snowpark._internal.analyzer.snowflake_plan_node import Limit, LogicalPlan
+from snowflake.snowpark._internal.analyzer.unary_expression import (
+    Alias,
+    UnresolvedAlias,
+)
+from snowflake.snowpark._internal.analyzer.unary_plan_node import (
+    Filter,
+    Project,
+    Sample,
+    Sort,
+)
+
+if TYPE_CHECKING:
+    from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
+
+AttributesInferrer = Callable[[], Optional[List[Attribute]]]
+
+_QUOTED_NAME_PATTERN = re.compile('^"([^"]|"")+"$')
+# A placeholder in the projected columns for all columns of the child
+_ALL_COLUMNS = ("*", "*")
+
+
+def infer_attributes(
+    logical_plan: LogicalPlan,
+    resolved_children: Dict[LogicalPlan, "SnowflakePlan"],
+    alias_map: Dict[int, str],
+) -> Optional[AttributesInferrer]:
+    """Returns a function that computes the output attributes of ``logical_plan`` from
+    the attributes of its resolved children, or ``None`` if they can't be derived on
+    the client and the schema query has to be described by the server.
+
+    Column names are determined here, when the alias map of the plan is known, while
+    the attributes of the children are only read when the returned function is called.
+    """
+    if isinstance(logical_plan, (Filter, Sort, Limit, Sample)):
+        child = resolved_children[logical_plan.children[0]]
+        return lambda: _copy_attributes(child.attributes)
+
+    if isinstance(logical_plan, Project):
+        columns = _projected_columns(logical_plan.project_list, alias_map)
+        if columns is None:
+            return None
+        child = resolved_children[logical_plan.child]
+        return lambda: _project_attributes(columns, child.attributes)
+
+    if isinstance(logical_plan, Union):
+        left = resolved_children[logical_plan.left]
+        right = resolved_children[logical_plan.right]
+        return lambda: _union_attributes(left.attributes, right.attributes)
+
+    return None
+
+
+def _copy_attributes(attributes: List[Attribute]) -> List[Attribute]:
+    return [Attribute(a.name, a.datatype, a.nullable) for a in attributes]
+
+
+def referenced_column_name(
+    expr: Expression, alias_map: Dict[int, str]
+) -> Optional[str]:
+    if isinstance(expr, Attribute):
+        return quote_name(alias_map.get(expr.expr_id, expr.name))
+    if isinstance(expr, UnresolvedAttribute) and _QUOTED_NAME_PATTERN.match(expr.name):
+        return expr.name
+    return None
+
+
+def _projected_columns(
+    project_list: List[Expression], alias_map: Dict[int, str]
+) -> Optional[List[Tuple[str, str]]]:
+    # Returns (output name, referenced name) pairs if every projected column is a
+    # column of the child, optionally renamed, and None otherwise (e.g., for function
+    # calls, UDFs or SQL expressions, whose types are only known by the server).
+    columns = []
+    for expr in project_list:
+        if isinstance(expr, UnresolvedAlias):
+            expr = expr.child
+        if isinstance(expr, Star):
+            if not expr.expressions:
+                columns.append(_ALL_COLUMNS)
+                continue
+            star_columns = _projected_columns(expr.expressions, alias_map)
+            if star_columns is None:
+                return None
+            columns.extend(star_columns)
+            continue
+        if isinstance(expr, Alias):
+            name = referenced_column_name(expr.child, alias_map)
+            if name is None:
+                return None
+            columns.append((quote_name(expr.name), name))
+            continue
+        name = referenced_column_name(expr, alias_map)
+        if name is None:
+            return None
+        columns.append((name, name))
+    return columns
+
+
+def _project_attributes(
+    columns: List[Tuple[str, str]], child_attributes: List[Attribute]
+) -> Optional[List[Attribute]]:
+    by_name = {}
+    for a in child_attributes:
+        # an ambiguous name is reported by the server
+        by_name[a.name] = None if a.name in by_name else a
+    attributes = []
+    for output_name, referenced_name in columns:
+        if (output_name, referenced_name) == _ALL_COLUMNS:
+            attributes.extend(_copy_attributes(child_attributes))
+            continue
+        a = by_name.get(referenced_name)
+        if a is None:
+            return None
+        attributes.append(Attribute(output_name, a.datatype, a.nullable))
+    return attributes
+
+
+def _union_attributes(
+    left_attributes: List[Attribute], right_attributes: List[Attribute]
+) -> Optional[List[Attribute]]:
+    if len(left_attributes) != len(right_attributes) or any(
+        left.name != right.name or left.datatype != right.datatype
+        for left, right in zip(left_attributes, right_attributes)
+    ):
+        return None
+    return [
+        Attribute(left.name, left.datatype, left.nullable or right.nullable)
+        for left, right in zip(left_attributes, right_attributes)
+    ]
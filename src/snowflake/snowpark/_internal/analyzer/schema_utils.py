@@ -75,8 +75,9 @@ def analyze_attributes(
     if lowercase.startswith("get"):
         return get_attributes()
     if lowercase.startswith("describe"):
-        session._run_query(sql)
-        return convert_result_meta_to_attribute(session._conn._cursor.description)
+        with session._conn._leased_cursor():
+            session._run_query(sql)
+            return convert_result_meta_to_attribute(session._conn._cursor.description)
 
     return session._get_result_attributes(sql)
 
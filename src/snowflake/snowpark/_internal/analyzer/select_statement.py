@@ -0,0 +1,167 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from snowflake.snowpark._internal.analyzer.analyzer_utils import (
+    AND,
+    LEFT_PARENTHESIS,
+    RIGHT_PARENTHESIS,
+    WHERE,
+    project_statement,
+)
+from snowflake.snowpark._internal.analyzer.binary_expression import BinaryExpression
+from snowflake.snowpark._internal.analyzer.expression import (
+    CaseWhen,
+    Expression,
+    FunctionExpression,
+    Literal,
+    SnowflakeUDF,
+)
+from snowflake.snowpark._internal.analyzer.schema_inference import (
+    referenced_column_name,
+)
+from snowflake.snowpark._internal.analyzer.unary_expression import UnaryExpression
+
+
+class SelectColumn(NamedTuple):
+    #: The SQL text of the column in the projection
+    sql: str
+    #: The quoted output name of the column, or ``None`` if it's generated by the server
+    name: Optional[str]
+    #: Whether the column is a reference to a column of the FROM clause by its name
+    is_reference: bool
+
+
+class SelectStatement(NamedTuple):
+    """The parts of the ``SELECT ... FROM (...) WHERE ...`` statement generated for a
+    Project or Filter plan. It's kept on the resolved plan, so the statement of a parent
+    Project or Filter can be merged into it instead of being nested around it.
+    """
+
+    #: The projected columns, or an empty list for ``*``
+    columns: List[SelectColumn]
+    from_: str
+    from_schema_query: str
+    where: Optional[str] = None
+
+    @property
+    def is_pass_through(self) -> bool:
+        # whether the columns of the FROM clause are projected without changes
+        return all(c.is_reference for c in self.columns)
+
+    def projects(self, names: Optional[Set[str]]) -> bool:
+        # whether the columns with the given names are among the output columns, so
+        # a parent that references them can be evaluated on the FROM clause
+        if not self.columns:
+            return True
+        return names is not None and names <= {c.name for c in self.columns}
+
+    def to_sql(self, from_: str) -> str:
+        sql = project_statement([c.sql for c in self.columns], from_)
+        return sql if self.where is None else sql + WHERE + self.where
+
+    @property
+    def sql(self) -> str:
+        return self.to_sql(self.from_)
+
+    @property
+    def schema_query(self) -> str:
+        return self.to_sql(self.from_schema_query)
+
+
+def referenced_column_names(
+    expr: Expression, alias_map: Dict[int, str]
+) -> Optional[Set[str]]:
+    """Returns the names of the columns referenced by a scalar expression, or ``None``
+    if they can't be determined, e.g., for SQL text, window functions or subqueries."""
+    if isinstance(expr, Literal):
+        return set()
+    name = referenced_column_name(expr, alias_map)
+    if name is not None:
+        return {name}
+    if isinstance(expr, CaseWhen):
+        children = [e for branch in expr.branches for e in branch]
+        if expr.else_value is not None:
+            children.append(expr.else_value)
+    elif isinstance(
+        expr, (UnaryExpression, BinaryExpression, FunctionExpression, SnowflakeUDF)
+    ):
+        children = expr.children or []
+    else:
+        return None
+    names = set()
+    for child in children:
+        child_names = referenced_column_names(child, alias_map)
+        if child_names is None:
+            return None
+        names |= child_names
+    return names
+
+
+def merge_filter(
+    child: SelectStatement, condition: str, referenced_names: Optional[Set[str]]
+) -> Optional[SelectStatement]:
+    """Merges a filter into the statement of its child when the child projects the
+    columns of its FROM clause without changes, so the condition can be evaluated on
+    them. Computed columns, e.g., window functions, must be evaluated before the filter,
+    so the statements are not merged in that case. ``referenced_names`` are the names of
+    the columns referenced by the condition, which must be projected by the child,
+    otherwise the condition would be evaluated on columns the child drops."""
+    if not child.is_pass_through or not child.projects(referenced_names):
+        return None
+    if child.where is not None:
+        condition = (
+            LEFT_PARENTHESIS
+            + child.where
+            + RIGHT_PARENTHESIS
+            + AND
+            + LEFT_PARENTHESIS
+            + condition
+            + RIGHT_PARENTHESIS
+        )
+    return child._replace(where=condition)
+
+
+def merge_project(
+    child: SelectStatement,
+    columns: List[SelectColumn],
+    referenced_names: List[Optional[Set[str]]],
+) -> Optional[SelectStatement]:
+    """Merges a projection into the statement of its child. ``referenced_names`` are
+    the names of the columns referenced by each projected column that is not a plain
+    reference, see :func:`referenced_column_names`.
+
+    A projection on top of a child that projects the columns of its FROM clause without
+    changes replaces the child's projection (a WHERE clause is evaluated before the
+    projection either way), as long as it only references the columns the child
+    projects. Otherwise, a reference to a column of the child is replaced
+    by the child's column, and a computed column is kept as long as it only depends on
+    the columns the child passes through. It must depend on at least one, otherwise it
+    could be evaluated once per row instead of once per row of an aggregated child.
+    """
+    if not columns:
+        return child
+    if child.is_pass_through:
+        if not all(child.projects(names) for names in referenced_names):
+            return None
+        return child._replace(columns=columns)
+
+    counts = Counter(c.name for c in child.columns)
+    by_name = {c.name: c for c in child.columns if c.name and counts[c.name] == 1}
+    pass_through_names = {
+        c.name for c in child.columns if c.is_reference and counts[c.name] == 1
+    }
+    merged = []
+    for column, names in zip(columns, referenced_names):
+        if column.is_reference:
+            source = by_name.get(column.name)
+            if source is None:
+                return None
+            merged.append(source)
+        elif names and names <= pass_through_names:
+            merged.append(column)
+        else:
+            return None
+    return child._replace(columns=merged)
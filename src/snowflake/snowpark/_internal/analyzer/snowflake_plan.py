@@ -2,11 +2,11 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
+import itertools
 import re
 import sys
-import uuid
 from functools import cached_property, reduce
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 import snowflake.connector
 import snowflake.snowpark
@@ -41,6 +41,7 @@ from snowflake.snowpark._internal.analyzer.analyzer_utils import (
     select_from_path_with_format_statement,
     set_operator_statement,
     sort_statement,
+    staged_parquet_column,
     table_function_statement,
     unpivot_statement,
     update_statement,
@@ -49,6 +50,10 @@ from snowflake.snowpark._internal.analyzer.binary_plan_node import (
     JoinType,
     SetOperation,
 )
+from snowflake.snowpark._internal.analyzer.cte_optimization import (
+    subplan_queries,
+    with_common_table_expressions,
+)
 from snowflake.snowpark._internal.analyzer.expression import Attribute
 from snowflake.snowpark._internal.analyzer.schema_utils import analyze_attributes
 from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
@@ -60,12 +65,18 @@ from snowflake.snowpark._internal.utils import (
     COPY_OPTIONS,
     INFER_SCHEMA_FORMAT_TYPES,
     TempObjectType,
-    generate_random_alphanumeric,
+    generate_alphanumeric,
+    is_sql_select_statement,
     random_name_for_temp_object,
 )
 from snowflake.snowpark.row import Row
 from snowflake.snowpark.types import StructType
 
+if TYPE_CHECKING:
+    import pyarrow
+
+    from snowflake.snowpark._internal.analyzer.select_statement import SelectStatement
+
 
 class SnowflakePlan(LogicalPlan):
     class Decorator:
@@ -154,7 +165,7 @@ class SnowflakePlan(LogicalPlan):
         queries: List["Query"],
         schema_query: str,
         post_actions: Optional[List["Query"]] = None,
-        expr_to_alias: Optional[Dict[uuid.UUID, str]] = None,
+        expr_to_alias: Optional[Dict[int, str]] = None,
         session: Optional["snowflake.snowpark.session.Session"] = None,
         source_plan: Optional[LogicalPlan] = None,
         is_ddl_on_temp_object: bool = False,
@@ -167,6 +178,16 @@ class SnowflakePlan(LogicalPlan):
         self.session = session
         self.source_plan = source_plan
         self.is_ddl_on_temp_object = is_ddl_on_temp_object
+        # Computes the attributes on the client when they can be derived from the
+        # attributes of the children, see schema_inference.infer_attributes
+        self.attributes_inferrer: Optional[
+            Callable[[], Optional[List[Attribute]]]
+        ] = None
+        # The plans whose last queries are used in the last query of this plan
+        self.child_plans: List[SnowflakePlan] = []
+        # The parts of the last query if it's a SELECT statement generated for a
+        # Project or Filter plan, see select_statement.SelectStatement
+        self.select_statement: Optional["SelectStatement"] = None
 
     def with_subqueries(self, subquery_plans: List["SnowflakePlan"]) -> "SnowflakePlan":
         pre_queries = self.queries[:-1]
@@ -184,7 +205,7 @@ class SnowflakePlan(LogicalPlan):
                 if action not in new_post_actions:
                     new_post_actions.append(action)
 
-        return SnowflakePlan(
+        plan = SnowflakePlan(
             pre_queries + [self.queries[-1]],
             new_schema_query,
             post_actions=new_post_actions,
@@ -192,10 +213,18 @@ class SnowflakePlan(LogicalPlan):
             session=self.session,
             source_plan=self.source_plan,
         )
+        plan.attributes_inferrer = self.attributes_inferrer
+        plan.select_statement = self.select_statement
+        plan.child_plans = self.child_plans
+        return plan
 
     @cached_property
     def attributes(self) -> List[Attribute]:
-        output = analyze_attributes(self.schema_query, self.session)
+        output = self.attributes_inferrer() if self.attributes_inferrer else None
+        if output is None:
+            output = analyze_attributes(self.schema_query, self.session)
+        # the inferrer references the children, which are no longer needed
+        self.attributes_inferrer = None
         self.schema_query = schema_value_statement(output)
         return output
 
@@ -204,7 +233,7 @@ class SnowflakePlan(LogicalPlan):
         return [Attribute(a.name, a.datatype, a.nullable) for a in self.attributes]
 
     def __copy__(self) -> "SnowflakePlan":
-        return SnowflakePlan(
+        plan = SnowflakePlan(
             self.queries.copy() if self.queries else [],
             self.schema_query,
             self.post_actions.copy() if self.post_actions else None,
@@ -212,6 +241,10 @@ class SnowflakePlan(LogicalPlan):
             self.session,
             self.source_plan,
         )
+        plan.attributes_inferrer = self.attributes_inferrer
+        plan.select_statement = self.select_statement
+        plan.child_plans = self.child_plans
+        return plan
 
     def add_aliases(self, to_add: Dict) -> None:
         self.expr_to_alias = {**self.expr_to_alias, **to_add}
@@ -242,7 +275,7 @@ class SnowflakePlanBuilder:
             schema_query if schema_query else sql_generator(child.schema_query)
         )
 
-        return SnowflakePlan(
+        plan = SnowflakePlan(
             queries,
             new_schema_query,
             select_child.post_actions,
@@ -251,6 +284,8 @@ class SnowflakePlanBuilder:
             source_plan,
             is_ddl_on_temp_object,
         )
+        plan.child_plans = [select_child]
+        return plan
 
     @SnowflakePlan.Decorator.wrap_exception
     def build_from_multiple_queries(
@@ -272,7 +307,7 @@ class SnowflakePlanBuilder:
             else multi_sql_generator(child.schema_query)[-1]
         )
 
-        return SnowflakePlan(
+        plan = SnowflakePlan(
             queries,
             new_schema_query,
             select_child.post_actions,
@@ -280,6 +315,8 @@ class SnowflakePlanBuilder:
             self.session,
             source_plan,
         )
+        plan.child_plans = [select_child]
+        return plan
 
     @SnowflakePlan.Decorator.wrap_exception
     def build_binary(
@@ -291,17 +328,13 @@ class SnowflakePlanBuilder:
     ) -> SnowflakePlan:
         select_left = self.add_result_scan_if_not_select(left)
         select_right = self.add_result_scan_if_not_select(right)
+        sql = sql_generator(select_left.queries[-1].sql, select_right.queries[-1].sql)
+        if self.session.cte_optimization_enabled:
+            sql = with_common_table_expressions(
+                sql, subplan_queries([select_left, select_right])
+            )
         queries = (
-            select_left.queries[:-1]
-            + select_right.queries[:-1]
-            + [
-                Query(
-                    sql_generator(
-                        select_left.queries[-1].sql, select_right.queries[-1].sql
-                    ),
-                    None,
-                )
-            ]
+            select_left.queries[:-1] + select_right.queries[:-1] + [Query(sql, None)]
         )
 
         left_schema_query = schema_value_statement(select_left.attributes)
@@ -320,7 +353,7 @@ class SnowflakePlanBuilder:
             if k not in common_columns
         }
 
-        return SnowflakePlan(
+        plan = SnowflakePlan(
             queries,
             schema_query,
             select_left.post_actions + select_right.post_actions,
@@ -328,6 +361,8 @@ class SnowflakePlanBuilder:
             self.session,
             source_plan,
         )
+        plan.child_plans = [select_left, select_right]
+        return plan
 
     def query(self, sql: str, source_plan: Optional[LogicalPlan]) -> SnowflakePlan:
         return SnowflakePlan(
@@ -340,8 +375,9 @@ class SnowflakePlanBuilder:
     def large_local_relation_plan(
         self,
         output: List[Attribute],
-        data: List[Row],
+        data: Union[List[Row], "pyarrow.Table"],
         source_plan: Optional[LogicalPlan],
+        bulk_load: bool = False,
     ) -> SnowflakePlan:
         temp_table_name = random_name_for_temp_object(TempObjectType.TABLE)
         attributes = [
@@ -353,15 +389,44 @@ class SnowflakePlanBuilder:
             replace=True,
             temp=True,
         )
-        insert_stmt = batch_insert_into_statement(
-            temp_table_name, [attr.name for attr in attributes]
-        )
+        if bulk_load:
+            # the rows are uploaded as Parquet files to a directory of the session
+            # stage, which are removed after they're loaded
+            stage_location = f"{self.session.get_session_stage()}/{temp_table_name}"
+            file_column_names = [f"C{i}" for i in range(len(attributes))]
+            load_query = BulkLoadQuery(
+                copy_into_table(
+                    temp_table_name,
+                    f"{stage_location}/",
+                    "PARQUET",
+                    # binary columns without a string annotation are read as binary
+                    {"BINARY_AS_TEXT": False},
+                    {"PURGE": True},
+                    None,
+                    column_names=[attr.name for attr in attributes],
+                    transformations=[
+                        staged_parquet_column(name, attr.datatype)
+                        for name, attr in zip(file_column_names, attributes)
+                    ],
+                ),
+                data,
+                attributes,
+                stage_location,
+                file_column_names,
+            )
+        else:
+            load_query = BatchInsertQuery(
+                batch_insert_into_statement(
+                    temp_table_name, [attr.name for attr in attributes]
+                ),
+                data,
+            )
         select_stmt = project_statement([], temp_table_name)
         drop_table_stmt = drop_table_if_exists_statement(temp_table_name)
         schema_query = schema_value_statement(attributes)
         queries = [
             Query(create_table_stmt, is_ddl_on_temp_object=True),
-            BatchInsertQuery(insert_stmt, data),
+            load_query,
             Query(select_stmt),
         ]
         return SnowflakePlan(
@@ -414,6 +479,21 @@ class SnowflakePlanBuilder:
     ) -> SnowflakePlan:
         return self.build(lambda x: filter_statement(condition, x), child, source_plan)
 
+    def select_statement(
+        self,
+        statement: "SelectStatement",
+        child: SnowflakePlan,
+        source_plan: Optional[LogicalPlan],
+    ) -> SnowflakePlan:
+        plan = self.build(
+            lambda x: statement.sql,
+            child,
+            source_plan,
+            schema_query=statement.schema_query,
+        )
+        plan.select_statement = statement
+        return plan
+
     def sample(
         self,
         child: SnowflakePlan,
@@ -569,7 +649,7 @@ class SnowflakePlanBuilder:
         if len(child.queries) != 1:
             raise SnowparkClientExceptionMessages.PLAN_CREATE_VIEW_FROM_DDL_DML_OPERATIONS()
 
-        if not child.queries[0].sql.lower().strip().startswith("select"):
+        if not is_sql_select_statement(child.queries[0].sql):
             raise SnowparkClientExceptionMessages.PLAN_CREATE_VIEWS_FROM_SELECT_ONLY()
 
         return self.build(
@@ -579,28 +659,14 @@ class SnowflakePlanBuilder:
         )
 
     def create_temp_table(self, name: str, child: SnowflakePlan) -> SnowflakePlan:
-        return self.build_from_multiple_queries(
-            lambda x: self.create_table_and_insert(
-                self.session, name, child.schema_query, x
-            ),
+        return self.build(
+            lambda x: create_table_as_select_statement(name, x, temp=True),
             child,
             None,
             child.schema_query,
             is_ddl_on_temp_object=True,
         )
 
-    def create_table_and_insert(
-        self, session, name: str, schema_query: str, query: str
-    ) -> List[str]:
-        attributes = session._get_result_attributes(schema_query)
-        create_table = create_table_statement(
-            name,
-            attribute_to_schema_string(attributes),
-            temp=True,
-        )
-
-        return [create_table, insert_into_statement(name, query)]
-
     def read_file(
         self,
         path: str,
@@ -906,7 +972,7 @@ class SnowflakePlanBuilder:
     def add_result_scan_if_not_select(self, plan: SnowflakePlan) -> SnowflakePlan:
         if isinstance(plan.source_plan, SetOperation):
             return plan
-        elif plan.queries[-1].sql.strip().lower().startswith("select"):
+        elif is_sql_select_statement(plan.queries[-1].sql):
             return plan
         else:
             new_queries = plan.queries + [
@@ -925,6 +991,12 @@ class SnowflakePlanBuilder:
             )
 
 
+# The number of a query, which makes the placeholders of the ids of queries with the
+# same SQL text distinct, e.g., when the results of the same SHOW command run twice by
+# a plan are read with RESULT_SCAN
+_next_query_number = itertools.count().__next__
+
+
 class Query:
     def __init__(
         self,
@@ -936,7 +1008,8 @@ class Query:
         self.query_id_place_holder = (
             query_id_place_holder
             if query_id_place_holder
-            else f"query_id_place_holder_{generate_random_alphanumeric()}"
+            else "query_id_place_holder_"
+            f"{generate_alphanumeric(sql, str(_next_query_number()))}"
         )
         self.is_ddl_on_temp_object = is_ddl_on_temp_object
 
@@ -949,3 +1022,24 @@ class BatchInsertQuery(Query):
     ) -> None:
         super().__init__(sql)
         self.rows = rows
+
+
+class BulkLoadQuery(Query):
+    """A ``COPY INTO`` statement that loads ``rows`` from the Parquet files that are
+    written and uploaded to ``stage_location`` before it runs. ``rows`` is a list of
+    rows or a PyArrow Table. ``file_column_names`` are the names of the columns of the
+    files, one per attribute."""
+
+    def __init__(
+        self,
+        sql: str,
+        rows: Union[List[Row], "pyarrow.Table"],
+        attributes: List[Attribute],
+        stage_location: str,
+        file_column_names: List[str],
+    ) -> None:
+        super().__init__(sql)
+        self.rows = rows
+        self.attributes = attributes
+        self.stage_location = stage_location
+        self.file_column_names = file_column_names
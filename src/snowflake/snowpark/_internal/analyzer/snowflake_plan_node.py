@@ -3,24 +3,34 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import snowflake.snowpark
 from snowflake.snowpark._internal.analyzer.expression import Attribute, Expression
 from snowflake.snowpark.row import Row
 from snowflake.snowpark.types import StructType
 
+if TYPE_CHECKING:
+    import pyarrow
+
 
 class LogicalPlan:
+    # A subclass declares the attributes it adds in its own __slots__. The resolved
+    # plan of a node is stored on it by the resolution cache, which refers to the node
+    # by a weak reference.
+    __slots__ = ("children", "_resolution_cache_entry", "__weakref__")
+
     def __init__(self) -> None:
-        self.children = []
+        self.children: Tuple[LogicalPlan, ...] = ()
 
 
 class LeafNode(LogicalPlan):
-    pass
+    __slots__ = ()
 
 
 class Range(LeafNode):
+    __slots__ = ("start", "end", "step", "num_slices")
+
     def __init__(self, start: int, end: int, step: int, num_slices: int = 1) -> None:
         super().__init__()
         if step == 0:
@@ -32,18 +42,34 @@ class Range(LeafNode):
 
 
 class UnresolvedRelation(LeafNode):
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         super().__init__()
         self.name = name
 
 
 class SnowflakeValues(LeafNode):
+    __slots__ = ("output", "data")
+
     def __init__(self, output: List[Attribute], data: List[Row]) -> None:
         super().__init__()
         self.output = output
         self.data = data
 
 
+class SnowflakeArrowValues(LeafNode):
+    """Local data held by a PyArrow Table, whose columns are written to Parquet files
+    and loaded into a temporary table without converting them to rows."""
+
+    __slots__ = ("output", "data")
+
+    def __init__(self, output: List[Attribute], data: "pyarrow.Table") -> None:
+        super().__init__()
+        self.output = output
+        self.data = data
+
+
 class SaveMode(Enum):
     APPEND = "append"
     OVERWRITE = "overwrite"
@@ -52,6 +78,8 @@ class SaveMode(Enum):
 
 
 class SnowflakeCreateTable(LogicalPlan):
+    __slots__ = ("table_name", "mode", "query", "create_temp_table")
+
     def __init__(
         self,
         table_name: str,
@@ -64,18 +92,36 @@ class SnowflakeCreateTable(LogicalPlan):
         self.mode = mode
         self.query = query
         self.create_temp_table = create_temp_table
-        self.children.append(query)
+        self.children = (query,)
 
 
 class Limit(LogicalPlan):
+    __slots__ = ("limit_expr", "child")
+
     def __init__(self, limit_expr: Expression, child: LogicalPlan) -> None:
         super().__init__()
         self.limit_expr = limit_expr
         self.child = child
-        self.children.append(child)
+        self.children = (child,)
 
 
 class CopyIntoTableNode(LeafNode):
+    __slots__ = (
+        "table_name",
+        "file_path",
+        "files",
+        "pattern",
+        "file_format",
+        "column_names",
+        "transformations",
+        "copy_options",
+        "format_type_options",
+        "validation_mode",
+        "user_schema",
+        "cur_options",
+        "create_table_from_infer_schema",
+    )
+
     def __init__(
         self,
         table_name: str,
@@ -110,6 +156,17 @@ class CopyIntoTableNode(LeafNode):
 
 
 class CopyIntoLocationNode(LogicalPlan):
+    __slots__ = (
+        "child",
+        "stage_location",
+        "partition_by",
+        "format_type_options",
+        "header",
+        "file_format_name",
+        "file_format_type",
+        "copy_options",
+    )
+
     def __init__(
         self,
         child: LogicalPlan,
@@ -124,7 +181,7 @@ class CopyIntoLocationNode(LogicalPlan):
     ) -> None:
         super().__init__()
         self.child = child
-        self.children.append(child)
+        self.children = (child,)
         self.stage_location = stage_location
         self.partition_by = partition_by
         self.format_type_options = format_type_options
@@ -34,6 +34,8 @@ class Descending(SortDirection):
 
 
 class SortOrder(Expression):
+    __slots__ = ("direction", "null_ordering")
+
     def __init__(
         self,
         child: Expression,
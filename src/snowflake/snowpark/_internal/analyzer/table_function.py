@@ -10,6 +10,8 @@ from snowflake.snowpark._internal.analyzer.sort_expression import SortOrder
 
 
 class TableFunctionPartitionSpecDefinition(Expression):
+    __slots__ = ("over", "partition_spec", "order_spec")
+
     def __init__(
         self,
         over: bool = False,
@@ -23,6 +25,8 @@ class TableFunctionPartitionSpecDefinition(Expression):
 
 
 class TableFunctionExpression(Expression):
+    __slots__ = ("func_name", "partition_spec")
+
     def __init__(
         self,
         func_name: str,
@@ -34,6 +38,8 @@ class TableFunctionExpression(Expression):
 
 
 class FlattenFunction(TableFunctionExpression):
+    __slots__ = ("input", "path", "outer", "recursive", "mode")
+
     def __init__(
         self, input: Expression, path: str, outer: bool, recursive: bool, mode: str
     ) -> None:
@@ -46,6 +52,8 @@ class FlattenFunction(TableFunctionExpression):
 
 
 class PosArgumentsTableFunction(TableFunctionExpression):
+    __slots__ = ("args",)
+
     def __init__(
         self,
         func_name: str,
@@ -57,6 +65,8 @@ class PosArgumentsTableFunction(TableFunctionExpression):
 
 
 class NamedArgumentsTableFunction(TableFunctionExpression):
+    __slots__ = ("args",)
+
     def __init__(
         self,
         func_name: str,
@@ -68,24 +78,30 @@ class NamedArgumentsTableFunction(TableFunctionExpression):
 
 
 class TableFunctionRelation(LogicalPlan):
+    __slots__ = ("table_function",)
+
     def __init__(self, table_function: TableFunctionExpression) -> None:
         super().__init__()
         self.table_function = table_function
 
 
 class TableFunctionJoin(LogicalPlan):
+    __slots__ = ("table_function",)
+
     def __init__(
         self, child: LogicalPlan, table_function: TableFunctionExpression
     ) -> None:
         super().__init__()
-        self.children = [child]
+        self.children = (child,)
         self.table_function = table_function
 
 
 class Lateral(LogicalPlan):
+    __slots__ = ("table_function",)
+
     def __init__(
         self, child: LogicalPlan, table_function: TableFunctionExpression
     ) -> None:
         super().__init__()
-        self.children = [child]
+        self.children = (child,)
         self.table_function = table_function
@@ -8,12 +8,16 @@ from snowflake.snowpark._internal.analyzer.snowflake_plan import LogicalPlan
 
 
 class MergeExpression(Expression):
+    __slots__ = ("condition",)
+
     def __init__(self, condition: Optional[Expression]) -> None:
         super().__init__()
         self.condition = condition
 
 
 class UpdateMergeExpression(MergeExpression):
+    __slots__ = ("assignments",)
+
     def __init__(
         self, condition: Optional[Expression], assignments: Dict[Expression, Expression]
     ) -> None:
@@ -22,10 +26,12 @@ class UpdateMergeExpression(MergeExpression):
 
 
 class DeleteMergeExpression(MergeExpression):
-    pass
+    __slots__ = ()
 
 
 class InsertMergeExpression(MergeExpression):
+    __slots__ = ("keys", "values")
+
     def __init__(
         self,
         condition: Optional[Expression],
@@ -38,6 +44,8 @@ class InsertMergeExpression(MergeExpression):
 
 
 class TableUpdate(LogicalPlan):
+    __slots__ = ("table_name", "assignments", "condition", "source_data")
+
     def __init__(
         self,
         table_name: str,
@@ -50,10 +58,12 @@ class TableUpdate(LogicalPlan):
         self.assignments = assignments
         self.condition = condition
         self.source_data = source_data
-        self.children = [source_data] if source_data else []
+        self.children = (source_data,) if source_data else ()
 
 
 class TableDelete(LogicalPlan):
+    __slots__ = ("table_name", "condition", "source_data")
+
     def __init__(
         self,
         table_name: str,
@@ -64,10 +74,12 @@ class TableDelete(LogicalPlan):
         self.table_name = table_name
         self.condition = condition
         self.source_data = source_data
-        self.children = [source_data] if source_data else []
+        self.children = (source_data,) if source_data else ()
 
 
 class TableMerge(LogicalPlan):
+    __slots__ = ("table_name", "source", "join_expr", "clauses")
+
     def __init__(
         self,
         table_name: str,
@@ -80,4 +92,4 @@ class TableMerge(LogicalPlan):
         self.source = source
         self.join_expr = join_expr
         self.clauses = clauses
-        self.children = [source] if source else []
+        self.children = (source,) if source else ()
@@ -1,13 +1,16 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
-from typing import List
-
-from snowflake.snowpark._internal.analyzer.expression import Expression, NamedExpression
+from snowflake.snowpark._internal.analyzer.expression import (
+    Expression,
+    NamedExpression,
+    next_expr_id,
+)
 from snowflake.snowpark.types import DataType
 
 
 class UnaryExpression(Expression):
+    __slots__ = ()
     sql_operator: str
     operator_first: bool
 
@@ -15,12 +18,9 @@ class UnaryExpression(Expression):
         super().__init__()
         self.child = child
         self.nullable = child.nullable
-        self.children = [child]
+        self.children = (child,)
         self.datatype = self.child.datatype
 
-    def children(self) -> List[Expression]:
-        return self.children
-
     def __str__(self):
         return (
             f"{self.sql_operator} {self.child}"
@@ -30,6 +30,7 @@ class UnaryExpression(Expression):
 
 
 class Cast(UnaryExpression):
+    __slots__ = ("to", "try_")
     sql_operator = "CAST"
     operator_first = True
 
@@ -40,46 +41,55 @@ class Cast(UnaryExpression):
 
 
 class UnaryMinus(UnaryExpression):
+    __slots__ = ()
     sql_operator = "-"
     operator_first = True
 
 
 class IsNull(UnaryExpression):
+    __slots__ = ()
     sql_operator = "IS NULL"
     operator_first = False
 
 
 class IsNotNull(UnaryExpression):
+    __slots__ = ()
     sql_operator = "IS NOT NULL"
     operator_first = False
 
 
 class IsNaN(UnaryExpression):
+    __slots__ = ()
     sql_operator = "= 'NaN'"
     operator_first = False
 
 
 class Not(UnaryExpression):
+    __slots__ = ()
     sql_operator = "NOT"
     operator_first = True
 
 
 class Alias(UnaryExpression, NamedExpression):
+    __slots__ = ("name", "expr_id")
     sql_operator = "AS"
     operator_first = False
 
     def __init__(self, child: Expression, name: str) -> None:
         super().__init__(child)
         self.name = name
+        self.expr_id = next_expr_id()
 
     def __str__(self):
         return f"{self.child} {self.sql_operator} {self.name}"
 
 
 class UnresolvedAlias(UnaryExpression, NamedExpression):
+    __slots__ = ("name", "expr_id")
     sql_operator = "AS"
     operator_first = False
 
     def __init__(self, child: Expression) -> None:
         super().__init__(child)
         self.name = child.sql
+        self.expr_id = next_expr_id()
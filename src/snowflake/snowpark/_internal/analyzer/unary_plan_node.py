@@ -9,13 +9,17 @@ from snowflake.snowpark._internal.analyzer.sort_expression import SortOrder
 
 
 class UnaryNode(LogicalPlan):
+    __slots__ = ("child",)
+
     def __init__(self, child: LogicalPlan) -> None:
         super().__init__()
         self.child = child
-        self.children.append(child)
+        self.children = (child,)
 
 
 class Sample(UnaryNode):
+    __slots__ = ("probability_fraction", "row_count")
+
     def __init__(
         self,
         child: LogicalPlan,
@@ -33,6 +37,8 @@ class Sample(UnaryNode):
 
 
 class Sort(UnaryNode):
+    __slots__ = ("order", "is_global")
+
     def __init__(
         self, order: List[SortOrder], is_global: bool, child: LogicalPlan
     ) -> None:
@@ -42,6 +48,8 @@ class Sort(UnaryNode):
 
 
 class Aggregate(UnaryNode):
+    __slots__ = ("grouping_expressions", "aggregate_expressions")
+
     def __init__(
         self,
         grouping_expressions: List[Expression],
@@ -54,6 +62,8 @@ class Aggregate(UnaryNode):
 
 
 class Pivot(UnaryNode):
+    __slots__ = ("pivot_column", "pivot_values", "aggregates")
+
     def __init__(
         self,
         pivot_column: Expression,
@@ -68,6 +78,8 @@ class Pivot(UnaryNode):
 
 
 class Unpivot(UnaryNode):
+    __slots__ = ("value_column", "name_column", "column_list")
+
     def __init__(
         self,
         value_column: str,
@@ -82,12 +94,16 @@ class Unpivot(UnaryNode):
 
 
 class Filter(UnaryNode):
+    __slots__ = ("condition",)
+
     def __init__(self, condition: Expression, child: LogicalPlan) -> None:
         super().__init__(child)
         self.condition = condition
 
 
 class Project(UnaryNode):
+    __slots__ = ("project_list",)
+
     def __init__(self, project_list: List[NamedExpression], child: LogicalPlan) -> None:
         super().__init__(child)
         self.project_list = project_list
@@ -107,6 +123,8 @@ class PersistedView(ViewType):
 
 
 class CreateViewCommand(UnaryNode):
+    __slots__ = ("name", "view_type")
+
     def __init__(
         self,
         name: str,
@@ -8,6 +8,7 @@ from snowflake.snowpark._internal.analyzer.sort_expression import SortOrder
 
 
 class SpecialFrameBoundary(Expression):
+    __slots__ = ()
     sql: str
 
     def __init__(self) -> None:
@@ -15,14 +16,17 @@ class SpecialFrameBoundary(Expression):
 
 
 class UnboundedPreceding(SpecialFrameBoundary):
+    __slots__ = ()
     sql = "UNBOUNDED PRECEDING"
 
 
 class UnboundedFollowing(SpecialFrameBoundary):
+    __slots__ = ()
     sql = "UNBOUNDED FOLLOWING"
 
 
 class CurrentRow(SpecialFrameBoundary):
+    __slots__ = ()
     sql = "CURRENT ROW"
 
 
@@ -39,15 +43,19 @@ class RangeFrame(FrameType):
 
 
 class WindowFrame(Expression):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__()
 
 
 class UnspecifiedFrame(WindowFrame):
-    pass
+    __slots__ = ()
 
 
 class SpecifiedWindowFrame(WindowFrame):
+    __slots__ = ("frame_type", "lower", "upper")
+
     def __init__(
         self, frame_type: FrameType, lower: Expression, upper: Expression
     ) -> None:
@@ -58,6 +66,8 @@ class SpecifiedWindowFrame(WindowFrame):
 
 
 class WindowSpecDefinition(Expression):
+    __slots__ = ("partition_spec", "order_spec", "frame_spec")
+
     def __init__(
         self,
         partition_spec: List[Expression],
@@ -71,6 +81,8 @@ class WindowSpecDefinition(Expression):
 
 
 class WindowExpression(Expression):
+    __slots__ = ("window_function", "window_spec")
+
     def __init__(
         self, window_function: Expression, window_spec: WindowSpecDefinition
     ) -> None:
@@ -80,6 +92,7 @@ class WindowExpression(Expression):
 
 
 class RankRelatedFunctionExpression(Expression):
+    __slots__ = ("expr", "offset", "default", "ignore_nulls")
     sql: str
 
     def __init__(
@@ -93,8 +106,10 @@ class RankRelatedFunctionExpression(Expression):
 
 
 class Lag(RankRelatedFunctionExpression):
+    __slots__ = ()
     sql = "LAG"
 
 
 class Lead(RankRelatedFunctionExpression):
+    __slots__ = ()
     sql = "LEAD"
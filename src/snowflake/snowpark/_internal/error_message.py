@@ -323,6 +323,12 @@ class SnowparkClientExceptionMessages:
             f"Failed to fetch a Pandas Dataframe. The error is: {message}", "1406"
         )
 
+    @staticmethod
+    def SERVER_FAILED_FETCH_ARROW(message: str) -> SnowparkFetchDataException:
+        return SnowparkFetchDataException(
+            f"Failed to fetch an Arrow Table. The error is: {message}", "1412"
+        )
+
     @staticmethod
     def SERVER_UDF_UPLOAD_FILE_STREAM_CLOSED(
         dest_filename: str,
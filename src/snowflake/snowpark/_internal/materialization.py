@@ -0,0 +1,230 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import itertools
+import queue
+import re
+import threading
+import weakref
+from logging import getLogger
+from typing import Dict, FrozenSet, Hashable, NamedTuple, Optional, Set
+
+import snowflake.snowpark
+from snowflake.snowpark._internal.analyzer.analyzer_utils import (
+    drop_table_if_exists_statement,
+)
+from snowflake.snowpark._internal.analyzer.cte_optimization import (
+    _NON_DETERMINISTIC_PATTERN,
+)
+from snowflake.snowpark._internal.analyzer.fingerprint import fingerprint
+from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
+from snowflake.snowpark._internal.result_cache import (
+    is_data_changing_statement,
+    object_name,
+    referenced_names,
+    target_table_name,
+)
+from snowflake.snowpark._internal.utils import (
+    TempObjectType,
+    is_in_stored_procedure,
+    is_sql_select_statement,
+    random_name_for_temp_object,
+)
+from snowflake.snowpark.query_history import QueryRecord
+
+logger = getLogger(__name__)
+
+
+# The functions whose result differs between statements, besides the non-deterministic
+# ones, e.g., CURRENT_TIMESTAMP is the same within a statement but not across them
+_STATEMENT_DEPENDENT_PATTERN = re.compile(
+    r"\b(current_(timestamp|date|time)|localtimestamp|localtime|sysdate|getdate)\b",
+    re.IGNORECASE,
+)
+
+
+def _is_reusable(plan: SnowflakePlan) -> bool:
+    # The result of a statement that isn't a query, e.g., SHOW TABLES, can change
+    # without a change of the tables it refers to, and a non-deterministic query, e.g.,
+    # one that samples a table, returns a different result every time it's run.
+    return all(
+        is_sql_select_statement(query.sql)
+        and not _NON_DETERMINISTIC_PATTERN.search(query.sql)
+        and not _STATEMENT_DEPENDENT_PATTERN.search(query.sql)
+        for query in plan.queries
+    )
+
+
+class _Materialization(NamedTuple):
+    table_name: str
+    names: FrozenSet[str]
+    # whether the table is dropped when its plans are garbage collected
+    auto_drop: bool
+
+
+class Materializations:
+    """The temporary tables created by :meth:`DataFrame.cache_result` in a session.
+
+    A table is created by one ``CREATE TEMPORARY TABLE ... AS SELECT`` statement. If
+    :attr:`Session.cache_result_reuse_enabled` is ``True`` and the cached plan only
+    consists of deterministic queries, the table is keyed by the fingerprint of the
+    plan and the current role, warehouse, database and schema, so caching the same
+    plan again, even if it's built separately, reuses the table instead of creating
+    another one. Every call returns a new :class:`SnowflakePlan` that reads the table,
+    so the DataFrames it returns can be joined with each other.
+
+    If :attr:`Session.cache_result_auto_drop_enabled` is ``True`` when the table is
+    created, the plans returned for it are counted, and the table is dropped when all
+    of them are garbage collected, i.e., no DataFrame refers to the table anymore.
+    Otherwise, the table is kept until the session ends, since a view or SQL text may
+    still read it.
+
+    Like the result cache, this is a query listener of the session's connection. When
+    a statement of this session that changes a table the SQL of a cached plan refers
+    to is executed, the plan is cached again by the next call. Changes made by other
+    sessions, or to the tables read by views and UDFs, aren't seen, so the table of a
+    plan is reused until then.
+    """
+
+    def __init__(self, session: "snowflake.snowpark.session.Session") -> None:
+        self._session = session
+        self._tables: Dict[Hashable, _Materialization] = {}
+        # The names referenced by the plans being cached, by the ids of the calls, and
+        # the ids of the calls whose names were invalidated, so a table created while
+        # the data it was read from changed is not reused.
+        self._pending: Dict[int, FrozenSet[str]] = {}
+        self._stale: Set[int] = set()
+        self._call_ids = itertools.count()
+        self._lock = threading.Lock()
+        # The number of plans returned for each table that is dropped automatically
+        # that aren't garbage collected yet
+        self._references: Dict[str, int] = {}
+        # The names of the tables whose plans are garbage collected. The finalizer of
+        # a plan can run in any thread while it holds any lock, so it only puts the name
+        # in this queue, which is reentrant, and a background thread drops the table.
+        self._released: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._dropper: Optional[threading.Thread] = None
+
+    def cache(self, plan: SnowflakePlan, **kwargs) -> SnowflakePlan:
+        """Returns a plan that reads a temporary table that holds the result of
+        ``plan``, which is created unless the same plan is already cached."""
+        key = (
+            (fingerprint(plan), *self._session._conn._session_context())
+            if self._session.cache_result_reuse_enabled and _is_reusable(plan)
+            else None
+        )
+        names = referenced_names("\n".join(query.sql for query in plan.queries))
+        with self._lock:
+            entry = self._tables.get(key) if key is not None else None
+            if entry is not None:
+                if entry.auto_drop:
+                    # counted with the lookup, so the table isn't dropped meanwhile
+                    self._references[entry.table_name] += 1
+            else:
+                call_id = next(self._call_ids)
+                self._pending[call_id] = names
+        if entry is not None:
+            return self._table_plan(entry.table_name, entry.auto_drop)
+
+        # temporary tables are dropped when a stored procedure returns
+        auto_drop = (
+            self._session.cache_result_auto_drop_enabled
+            and not is_in_stored_procedure()
+        )
+        try:
+            self._start_listening()
+            table_name = random_name_for_temp_object(TempObjectType.TABLE)
+            self._session._conn.execute(
+                self._session._plan_builder.create_temp_table(table_name, plan),
+                **kwargs,
+            )
+            if auto_drop:
+                with self._lock:
+                    self._references[table_name] = 1
+            cached_plan = self._table_plan(table_name, auto_drop)
+        finally:
+            with self._lock:
+                del self._pending[call_id]
+                stale = call_id in self._stale
+                self._stale.discard(call_id)
+        if key is not None and not stale:
+            with self._lock:
+                self._tables[key] = _Materialization(table_name, names, auto_drop)
+        return cached_plan
+
+    def _table_plan(self, table_name: str, auto_drop: bool) -> SnowflakePlan:
+        # a plan whose reference is already counted if the table is dropped
+        # automatically
+        try:
+            plan = self._session.table(table_name)._plan
+        except BaseException:
+            if auto_drop:
+                self._released.put(table_name)
+            raise
+        if auto_drop:
+            weakref.finalize(plan, self._released.put, table_name)
+        return plan
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """Makes the plans that read ``table_name``, or all plans if it's ``None``,
+        be cached again. Their existing tables are kept while they're referenced."""
+        name = object_name(table_name) if table_name is not None else None
+        with self._lock:
+            self._tables = {
+                key: entry
+                for key, entry in self._tables.items()
+                if name is not None and name not in entry.names
+            }
+            self._stale.update(
+                call_id
+                for call_id, names in self._pending.items()
+                if name is None or name in names
+            )
+
+    def close(self) -> None:
+        if self._dropper is not None:
+            self._session._conn.remove_query_listener(self)
+            self._released.put(None)
+
+    def _add_query(self, query_record: QueryRecord) -> None:
+        # called by the connection after every query it executes
+        if is_data_changing_statement(query_record.sql_text):
+            self.invalidate(target_table_name(query_record.sql_text))
+
+    def _start_listening(self) -> None:
+        # the listener and the thread are only needed once a table is created
+        with self._lock:
+            if self._dropper is None:
+                self._session._conn.add_query_listener(self)
+                self._dropper = threading.Thread(
+                    target=self._drop_released,
+                    name="snowpark-cache-result-drop",
+                    daemon=True,
+                )
+                self._dropper.start()
+
+    def _drop_released(self) -> None:
+        while True:
+            table_name = self._released.get()
+            if table_name is None:
+                return
+            with self._lock:
+                count = self._references.pop(table_name) - 1
+                if count:
+                    # other plans that read the table are still referenced
+                    self._references[table_name] = count
+                    continue
+                self._tables = {
+                    key: entry
+                    for key, entry in self._tables.items()
+                    if entry.table_name != table_name
+                }
+            try:
+                # it's not waited for, and uses its own cursor, so it doesn't block or
+                # interfere with the queries of the session
+                self._session._conn.submit_query(
+                    drop_table_if_exists_statement(table_name),
+                    is_ddl_on_temp_object=True,
+                )
+            except Exception as ex:
+                logger.debug(f"Failed to drop cached result {table_name}: {ex}")
@@ -0,0 +1,364 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import FrozenSet, Hashable, List, NamedTuple, Optional, Tuple, Union
+
+from snowflake.connector.cursor import ResultMetadata
+from snowflake.connector.options import installed_pandas, pandas, pyarrow
+from snowflake.snowpark._internal.utils import TEMP_OBJECT_NAME_PREFIX
+from snowflake.snowpark.query_history import QueryRecord
+
+logger = getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_TTL = 300
+DEFAULT_RESULT_CACHE_MEMORY_SIZE = 256 * 1024 * 1024
+DEFAULT_RESULT_CACHE_DISK_SIZE = 1024 * 1024 * 1024
+
+_Result = Union[List[tuple], "pandas.DataFrame", "pyarrow.Table"]
+
+_IDENTIFIER_PATTERN = re.compile(r'"((?:[^"]|"")+)"|([A-Za-z_][\w$]*)')
+_QUALIFIED_NAME = r'(?:"(?:[^"]|"")+"|[\w$]+)(?:\s*\.\s*(?:"(?:[^"]|"")+"|[\w$]+))*'
+# Statements that can change the data read by a cached query. Other statements (e.g.,
+# SELECT, SHOW, PUT or USE, which changes the context the results are cached by) don't
+# invalidate the cache.
+_DATA_CHANGING_STATEMENT_PATTERN = re.compile(
+    r"^\s*(insert|update|delete|merge|truncate|copy|create|drop|alter|undrop|replace"
+    r"|call|execute)\b",
+    re.IGNORECASE,
+)
+# Data changing statements that can't change the result of a cached query: query
+# tags, and DDL on temporary objects created by Snowpark, which have fresh random names
+# that no cached query can depend on.
+_RESULT_PRESERVING_STATEMENT_PATTERN = re.compile(
+    r"^\s*(alter\s+session\s+(un)?set\s+query_tag\b"
+    r"|(create|drop)\s+((or|replace|scoped|temporary|temp|table|view|stage|file"
+    rf"|format|function|sequence|if|not|exists)\s+)*\"?{TEMP_OBJECT_NAME_PREFIX})",
+    re.IGNORECASE,
+)
+# The table that a data changing statement writes to, if it's a single one
+_TARGET_TABLE_PATTERN = re.compile(
+    r"^\s*(?:insert\s+(?:overwrite\s+)?into|update|delete\s+from|merge\s+into"
+    r"|truncate\s+(?:table\s+)?(?:if\s+exists\s+)?|copy\s+into"
+    r"|(?:create|drop|undrop)\s+(?:or\s+replace\s+)?(?:(?:local|global|temporary|temp"
+    r"|transient|volatile|secure|materialized|dynamic)\s+)*(?:table|view)\s+"
+    rf"(?:if\s+(?:not\s+)?exists\s+)?)\s*({_QUALIFIED_NAME})",
+    re.IGNORECASE,
+)
+
+
+def _normalize_identifier(quoted: Optional[str], unquoted: Optional[str]) -> str:
+    return quoted.replace('""', '"') if quoted else unquoted.upper()
+
+
+def referenced_names(sql: str) -> FrozenSet[str]:
+    """Returns the normalized identifiers in a query, which include the names of the
+    tables it reads."""
+    return frozenset(
+        _normalize_identifier(quoted, unquoted)
+        for quoted, unquoted in _IDENTIFIER_PATTERN.findall(sql)
+    )
+
+
+def is_data_changing_statement(sql: str) -> bool:
+    return bool(
+        _DATA_CHANGING_STATEMENT_PATTERN.match(sql)
+    ) and not _RESULT_PRESERVING_STATEMENT_PATTERN.match(sql)
+
+
+def target_table_name(sql: str) -> Optional[str]:
+    """Returns the name of the table that a data changing statement writes to, or
+    ``None`` if it isn't known."""
+    target = _TARGET_TABLE_PATTERN.match(sql)
+    return target.group(1) if target else None
+
+
+def object_name(table_name: str) -> str:
+    # the last part of a qualified name, e.g., T of DB.SCHEMA.T, which is compared to
+    # the identifiers of cached queries
+    return _normalize_identifier(*_IDENTIFIER_PATTERN.findall(table_name)[-1])
+
+
+def _result_size(result: _Result) -> int:
+    if isinstance(result, pyarrow.Table):
+        return result.nbytes
+    if installed_pandas and isinstance(result, pandas.DataFrame):
+        return int(result.memory_usage(index=True, deep=True).sum())
+    # an estimate of the memory used by the rows and their values
+    return sys.getsizeof(result) + sum(
+        sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+        for row in result
+    )
+
+
+def _copy_result(result: _Result) -> _Result:
+    # Arrow tables are immutable, and rows are tuples, but DataFrames and the list of
+    # rows can be changed by the caller
+    if isinstance(result, list):
+        return list(result)
+    if installed_pandas and isinstance(result, pandas.DataFrame):
+        return result.copy()
+    return result
+
+
+def _result_to_arrow_table(result: _Result) -> "pyarrow.Table":
+    if isinstance(result, pyarrow.Table):
+        return result
+    return pyarrow.Table.from_pandas(result, preserve_index=False)
+
+
+def _arrow_table_to_result(table: "pyarrow.Table", kind: str) -> _Result:
+    return table if kind == "arrow" else table.to_pandas()
+
+
+def _result_kind(result: _Result) -> str:
+    if isinstance(result, pyarrow.Table):
+        return "arrow"
+    if installed_pandas and isinstance(result, pandas.DataFrame):
+        return "pandas"
+    return "rows"
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _CacheEntry(NamedTuple):
+    # the result, or the path of its Arrow IPC file in the disk tier
+    value: Union[_Result, str]
+    result_meta: List[ResultMetadata]
+    kind: str
+    size: int
+    expires_at: float
+    names: FrozenSet[str]
+
+
+class ResultCacheInfo(NamedTuple):
+    hits: int
+    disk_hits: int
+    misses: int
+    memory_entries: int
+    memory_size: int
+    disk_entries: int
+    disk_size: int
+
+
+class ResultCache:
+    """A cache of the results of the queries of DataFrame actions, so the same
+    DataFrame can be collected again without running its queries in the warehouse.
+
+    Entries are keyed by the SQL text of the queries of a plan, the type of the result
+    and the current role, warehouse, database and schema of the session. Each entry
+    expires ``ttl`` seconds after it's cached. The results are held in memory, and the
+    least recently used ones are evicted when their estimated size exceeds
+    ``max_memory_size`` bytes. If ``disk_cache_dir`` is set, evicted results are
+    written to Arrow IPC files in it instead of being dropped, up to ``max_disk_size``
+    bytes, and are memory-mapped when they're read. Only Pandas DataFrames and Arrow
+    tables are written, and evicted rows are dropped, since their values don't keep
+    their Python types through Arrow.
+
+    The cache is registered as a query listener of the session's connection. When a
+    statement that can change data (e.g., ``INSERT``, ``MERGE``, ``CREATE OR REPLACE
+    TABLE``) is executed, the entries whose queries refer to the table it writes to are
+    invalidated, or all entries if the table isn't known. Changes made from another
+    session are not detected, so call :meth:`invalidate` in that case.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_RESULT_CACHE_TTL,
+        max_memory_size: int = DEFAULT_RESULT_CACHE_MEMORY_SIZE,
+        disk_cache_dir: Optional[str] = None,
+        max_disk_size: int = DEFAULT_RESULT_CACHE_DISK_SIZE,
+    ) -> None:
+        self.ttl = ttl
+        self.max_memory_size = max_memory_size
+        self.max_disk_size = max_disk_size
+        # a directory of this cache, so caches of different sessions don't share files
+        self._disk_dir = (
+            tempfile.mkdtemp(prefix="snowpark_result_cache_", dir=disk_cache_dir)
+            if disk_cache_dir is not None
+            else None
+        )
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._disk: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._memory_size = 0
+        self._disk_size = 0
+        self._file_id = 0
+        # incremented by every invalidation, so a result fetched while the data it
+        # was read from changed is not cached
+        self.version = 0
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[_Result, List[ResultMetadata]]]:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._memory.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return _copy_result(entry.value), entry.result_meta
+            entry = self._disk.get(key)
+            if entry is not None and entry.expires_at > now:
+                try:
+                    table = pyarrow.ipc.open_file(
+                        pyarrow.memory_map(entry.value)
+                    ).read_all()
+                except (OSError, pyarrow.ArrowInvalid) as ex:
+                    logger.debug(f"Failed to read cached result {entry.value}: {ex}")
+                    self._remove(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return _arrow_table_to_result(table, entry.kind), entry.result_meta
+            # an expired entry is removed when it's looked up
+            self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(
+        self,
+        key: Hashable,
+        sql: str,
+        result: _Result,
+        result_meta: List[ResultMetadata],
+        version: int,
+    ) -> None:
+        """Caches the result of the queries ``sql``, unless the cache was invalidated
+        after ``version`` was read, i.e., while the queries ran."""
+        if self.ttl <= 0:
+            return
+        entry = _CacheEntry(
+            _copy_result(result),
+            result_meta,
+            _result_kind(result),
+            _result_size(result),
+            time.monotonic() + self.ttl,
+            referenced_names(sql),
+        )
+        with self._lock:
+            if version != self.version:
+                return
+            self._remove(key)
+            self._memory[key] = entry
+            self._memory_size += entry.size
+            evicted = []
+            while self._memory_size > self.max_memory_size:
+                evicted_key, evicted_entry = self._memory.popitem(last=False)
+                self._memory_size -= evicted_entry.size
+                evicted.append((evicted_key, evicted_entry))
+        for evicted_key, evicted_entry in evicted:
+            self._spill(evicted_key, evicted_entry, version)
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """Removes the entries whose queries refer to ``table_name``, or all entries
+        if it's ``None``."""
+        with self._lock:
+            self.version += 1
+            if table_name is None:
+                keys = list(self._memory) + list(self._disk)
+            else:
+                name = object_name(table_name)
+                keys = [
+                    key
+                    for tier in (self._memory, self._disk)
+                    for key, entry in tier.items()
+                    if name in entry.names
+                ]
+            for key in keys:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidate()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            if self._disk_dir is not None:
+                shutil.rmtree(self._disk_dir, ignore_errors=True)
+                os.makedirs(self._disk_dir, exist_ok=True)
+
+    def close(self) -> None:
+        """Clears the cache and removes its directory."""
+        with self._lock:
+            self.clear()
+            if self._disk_dir is not None:
+                shutil.rmtree(self._disk_dir, ignore_errors=True)
+
+    def cache_info(self) -> ResultCacheInfo:
+        return ResultCacheInfo(
+            self.hits,
+            self.disk_hits,
+            self.misses,
+            len(self._memory),
+            self._memory_size,
+            len(self._disk),
+            self._disk_size,
+        )
+
+    def _add_query(self, query_record: QueryRecord) -> None:
+        # called by the connection after every query it executes
+        if is_data_changing_statement(query_record.sql_text):
+            self.invalidate(target_table_name(query_record.sql_text))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_size -= entry.size
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_size -= entry.size
+            _remove_file(entry.value)
+
+    def _spill(self, key: Hashable, entry: _CacheEntry, version: int) -> None:
+        # Rows are not written, since the types of their values don't survive a round
+        # trip through Arrow, e.g., a bytearray is read back as bytes, and the time
+        # zone of a datetime is normalized. The file is written without holding the
+        # lock, and is only added if the cache wasn't invalidated or the key cached
+        # again meanwhile.
+        if (
+            self._disk_dir is None
+            or entry.kind == "rows"
+            or entry.expires_at <= time.monotonic()
+        ):
+            return
+        with self._lock:
+            self._file_id += 1
+            path = os.path.join(self._disk_dir, f"{self._file_id}.arrow")
+        try:
+            table = _result_to_arrow_table(entry.value)
+            with pyarrow.OSFile(path, "wb") as sink:
+                with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            size = os.path.getsize(path)
+        except (OSError, pyarrow.ArrowInvalid, pyarrow.ArrowTypeError) as ex:
+            # e.g., a DataFrame with values of mixed types in a column, which is dropped
+            logger.debug(f"Failed to write cached result to {path}: {ex}")
+            _remove_file(path)
+            return
+        with self._lock:
+            if version != self.version or key in self._memory or key in self._disk:
+                _remove_file(path)
+                return
+            self._disk[key] = entry._replace(value=path, size=size)
+            self._disk_size += size
+            while self._disk_size > self.max_disk_size:
+                self._remove(next(iter(self._disk)))
+
+    def __len__(self) -> int:
+        return len(self._memory) + len(self._disk)
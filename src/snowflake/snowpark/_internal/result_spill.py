@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import atexit
+import bisect
+import itertools
+import os
+import tempfile
+from logging import getLogger
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from snowflake.connector.cursor import ResultMetadata
+from snowflake.connector.options import pyarrow
+from snowflake.snowpark.row import Row
+
+logger = getLogger(__name__)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError as ex:
+        logger.debug(f"Failed to remove spill file {path}: {ex}")
+
+
+def _column_to_pylist(
+    column: Union["pyarrow.Array", "pyarrow.ChunkedArray"]
+) -> List[Any]:
+    # The values are converted to the Python types of the rows that the connector
+    # fetches: timestamps and times with nanoseconds to datetime objects instead of
+    # pandas.Timestamp objects, and binary values to bytearrays. A timestamp with a time
+    # zone is converted to UTC, since Arrow doesn't keep the offset of each value.
+    arrow_type = column.type
+    if pyarrow.types.is_timestamp(arrow_type) and arrow_type.unit == "ns":
+        column = column.cast(pyarrow.timestamp("us", arrow_type.tz), safe=False)
+    elif pyarrow.types.is_time64(arrow_type) and arrow_type.unit == "ns":
+        column = column.cast(pyarrow.time64("us"), safe=False)
+    values = column.to_pylist()
+    if pyarrow.types.is_binary(arrow_type) or pyarrow.types.is_large_binary(arrow_type):
+        return [bytearray(v) if v is not None else None for v in values]
+    return values
+
+
+def arrow_table_to_tuples(
+    table: Union["pyarrow.Table", "pyarrow.RecordBatch"]
+) -> Iterator[tuple]:
+    return zip(*(_column_to_pylist(column) for column in table.columns))
+
+
+def spill_arrow_batches(
+    batches: Iterable["pyarrow.Table"], threshold: int, directory: Optional[str] = None
+) -> Union[List["pyarrow.Table"], "pyarrow.Table"]:
+    """Returns the Arrow tables of a result if their total size is at most
+    ``threshold`` bytes. Otherwise, the tables are written to a temporary Arrow IPC file
+    as they are fetched, so at most ``threshold`` bytes of them are held in memory, and
+    a table memory-mapped from the file is returned, whose data is paged in from disk
+    when it's accessed.
+
+    The file is removed once it's mapped, so it's deleted when the table and all
+    arrays that refer to its data are garbage collected. On platforms that can't remove
+    a mapped file, it's removed when the process exits.
+    """
+    batches = iter(batches)
+    buffered = []
+    size = 0
+    for batch in batches:
+        buffered.append(batch)
+        size += batch.nbytes
+        if size > threshold:
+            break
+    else:
+        return buffered
+
+    fd, path = tempfile.mkstemp(
+        prefix="snowpark_result_", suffix=".arrow", dir=directory
+    )
+    os.close(fd)
+    try:
+        schema = buffered[0].schema
+        with pyarrow.OSFile(path, "wb") as sink:
+            with pyarrow.ipc.new_file(sink, schema) as writer:
+
+                def write(batch: "pyarrow.Table") -> None:
+                    # the connector can return chunks of a column with different types,
+                    # e.g., integers of different widths
+                    writer.write_table(
+                        batch if batch.schema == schema else batch.cast(schema)
+                    )
+
+                for batch in buffered:
+                    write(batch)
+                # the tables written to the file are released
+                buffered.clear()
+                for batch in batches:
+                    write(batch)
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+    except BaseException:
+        _remove_file(path)
+        raise
+    try:
+        os.remove(path)
+    except OSError:
+        atexit.register(_remove_file, path)
+    return table
+
+
+class SpilledRows(Sequence[Row]):
+    """A read-only sequence of the :class:`Row` objects of a result that is spilled to
+    a memory-mapped Arrow table. The rows are converted from the table when they're
+    accessed, one Arrow record batch at a time when the sequence is iterated, so the
+    whole result is never held in memory as Python objects. The values have the types
+    of the rows that the connector fetches, except that timestamps with a time zone
+    are in UTC."""
+
+    def __init__(
+        self, table: "pyarrow.Table", result_meta: List[ResultMetadata]
+    ) -> None:
+        self._row_class = Row._with_fields(col.name for col in result_meta)
+        self._batches = table.to_batches()
+        self._offsets = list(
+            itertools.accumulate(batch.num_rows for batch in self._batches)
+        )
+        self._num_rows = table.num_rows
+
+    def __len__(self) -> int:
+        return self._num_rows
+
+    @overload
+    def __getitem__(self, index: int) -> Row:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Row]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Row, List[Row]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._num_rows))]
+        if index < 0:
+            index += self._num_rows
+        if not 0 <= index < self._num_rows:
+            raise IndexError("row index out of range")
+        i = bisect.bisect_right(self._offsets, index)
+        batch = self._batches[i]
+        offset = index - (self._offsets[i - 1] if i > 0 else 0)
+        return self._row_class._make(
+            next(arrow_table_to_tuples(batch.slice(offset, 1)))
+        )
+
+    def __iter__(self) -> Iterator[Row]:
+        for batch in self._batches:
+            yield from map(self._row_class._make, arrow_table_to_tuples(batch))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"SpilledRows(<{self._num_rows} rows>)"
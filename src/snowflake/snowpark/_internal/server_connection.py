@@ -3,11 +3,31 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 import functools
+import io
+import itertools
 import os
+import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from logging import getLogger
-from typing import IO, Any, Dict, Iterator, List, Optional, Set, Union
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import snowflake.connector
 from snowflake.connector import SnowflakeConnection, connect
@@ -15,7 +35,8 @@ from snowflake.connector.constants import FIELD_ID_TO_NAME
 from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
 from snowflake.connector.errors import NotSupportedError, ProgrammingError
 from snowflake.connector.network import ReauthenticationRequest
-from snowflake.connector.options import pandas
+from snowflake.connector.options import pandas, pyarrow
+from snowflake.connector.result_batch import ArrowResultBatch
 from snowflake.snowpark._internal.analyzer.analyzer_utils import (
     escape_quotes,
     quote_name,
@@ -28,33 +49,65 @@ from snowflake.snowpark._internal.analyzer.schema_utils import (
 )
 from snowflake.snowpark._internal.analyzer.snowflake_plan import (
     BatchInsertQuery,
+    BulkLoadQuery,
+    Query,
     SnowflakePlan,
 )
 from snowflake.snowpark._internal.error_message import SnowparkClientExceptionMessages
+from snowflake.snowpark._internal.result_spill import (
+    SpilledRows,
+    arrow_table_to_tuples,
+    spill_arrow_batches,
+)
 from snowflake.snowpark._internal.telemetry import TelemetryClient
+from snowflake.snowpark._internal.type_utils import convert_sp_to_arrow_type
 from snowflake.snowpark._internal.utils import (
+    QUERY_STATUS_POLL_DELAYS,
+    TEMP_OBJECT_NAME_PREFIX,
     get_application_name,
     get_version,
     is_in_stored_procedure,
+    is_sql_select_statement,
     normalize_local_file,
     normalize_remote_file_or_dir,
     result_set_to_iter,
     result_set_to_rows,
     unwrap_stage_location_single_quote,
 )
+from snowflake.snowpark.async_job import AsyncJob, _AsyncResultType
 from snowflake.snowpark.query_history import QueryHistory, QueryRecord
 from snowflake.snowpark.row import Row
+from snowflake.snowpark.types import ArrayType, BinaryType, MapType, VariantType
+
+if TYPE_CHECKING:
+    import numpy
 
 logger = getLogger(__name__)
 
 # set `paramstyle` to qmark for batch insertion
 snowflake.connector.paramstyle = "qmark"
 
+# The number of cells of local data written to one Parquet file for a bulk load
+_BULK_LOAD_CELLS_PER_FILE = 1000000
+# The number of Parquet files that are written and uploaded concurrently
+_BULK_LOAD_PARALLELISM = 4
+# The number of queries of a plan that run concurrently with pipelined execution
+_PIPELINED_QUERY_PARALLELISM = 4
+
 # parameters needed for usage tracking
 PARAM_APPLICATION = "application"
 PARAM_INTERNAL_APPLICATION_NAME = "internal_application_name"
 PARAM_INTERNAL_APPLICATION_VERSION = "internal_application_version"
 
+# A statement that creates a temporary object with a random name from its column
+# definitions or options only, so it doesn't depend on any previous query of its plan
+_STANDALONE_TEMP_OBJECT_DDL_PATTERN = re.compile(
+    r"^\s*create\s+(or\s+replace\s+)?(temporary|temp)\s+(table|file\s+format)\s+"
+    rf"(if\s+not\s+exists\s+)?(\S+\.)?({TEMP_OBJECT_NAME_PREFIX}\w+)",
+    re.IGNORECASE,
+)
+_SELECT_PATTERN = re.compile(r"\bselect\b", re.IGNORECASE)
+
 
 def _build_target_path(stage_location: str, dest_prefix: str = "") -> str:
     qualified_stage_name = unwrap_stage_location_single_quote(stage_location)
@@ -66,6 +119,62 @@ def _build_target_path(stage_location: str, dest_prefix: str = "") -> str:
     return f"{qualified_stage_name}{dest_prefix_name if dest_prefix_name else ''}"
 
 
+def _created_temp_object_name(query: Query) -> Optional[str]:
+    # Returns the name of the temporary object created by a standalone DDL statement
+    if isinstance(query, BatchInsertQuery) or _SELECT_PATTERN.search(query.sql):
+        return None
+    match = _STANDALONE_TEMP_OBJECT_DDL_PATTERN.match(query.sql)
+    return match.group(6) if match else None
+
+
+def _loaded_temp_object_name(query: Query, created_names: Set[str]) -> Optional[str]:
+    # Returns the name of the temporary table created by a previous statement of the
+    # plan that a batch insert or a bulk load writes local data to
+    if not isinstance(query, (BatchInsertQuery, BulkLoadQuery)):
+        return None
+    return next((name for name in created_names if name in query.sql), None)
+
+
+def _query_dependencies(queries: List[Query]) -> List[Set[int]]:
+    """Returns the indices of the queries each query of a plan depends on.
+
+    A query depends on a previous query whose query id it reads with a placeholder,
+    and on a previous query that mentions the temporary object it creates or the one it
+    mentions. A statement that creates a temporary object from its column definitions
+    or options only, e.g., the temporary table of a large local relation or the
+    temporary file format of a file read, and a batch insert or a bulk load of local
+    data into such a table only have these dependencies, so the tables of different
+    local relations are created and loaded concurrently. Any other statement may depend
+    on a previous one in a way that can't be seen from the SQL text, e.g., by reading a
+    table written by it, so these statements keep their order, and they also depend on
+    the loads before them.
+    """
+    dependencies = []
+    created_names = [_created_temp_object_name(q) for q in queries]
+    last_ordered = None
+    # the loads of local data since the last ordered statement
+    loads = set()
+    for i, query in enumerate(queries):
+        deps = {
+            j
+            for j in range(i)
+            if queries[j].query_id_place_holder in query.sql
+            or (created_names[j] and created_names[j] in query.sql)
+            or (created_names[i] and created_names[i] in queries[j].sql)
+        }
+        if created_names[i] is None:
+            if _loaded_temp_object_name(query, set(filter(None, created_names[:i]))):
+                loads.add(i)
+            else:
+                if last_ordered is not None:
+                    deps.add(last_ordered)
+                deps |= loads
+                loads = set()
+                last_ordered = i
+        dependencies.append(deps)
+    return dependencies
+
+
 def _build_put_statement(
     local_path: str,
     stage_location: str,
@@ -86,6 +195,211 @@ def _build_put_statement(
     return final_statement
 
 
+def _arrow_type(column_metadata: ResultMetadata) -> "pyarrow.DataType":
+    type_name = FIELD_ID_TO_NAME.get(column_metadata.type_code)
+    if type_name == "FIXED":
+        return (
+            pyarrow.int64()
+            if not column_metadata.scale
+            else pyarrow.decimal128(column_metadata.precision, column_metadata.scale)
+        )
+    if type_name == "REAL":
+        return pyarrow.float64()
+    if type_name == "BOOLEAN":
+        return pyarrow.bool_()
+    if type_name == "BINARY":
+        return pyarrow.binary()
+    if type_name == "DATE":
+        return pyarrow.date32()
+    if type_name == "TIME":
+        return pyarrow.time64("ns")
+    if type_name in ("TIMESTAMP_LTZ", "TIMESTAMP_TZ"):
+        return pyarrow.timestamp("ns", tz="UTC")
+    if type_name in ("TIMESTAMP", "TIMESTAMP_NTZ"):
+        return pyarrow.timestamp("ns")
+    # text and semi-structured values
+    return pyarrow.string()
+
+
+def _result_batches_size(results_cursor: SnowflakeCursor) -> int:
+    # The uncompressed size of the result chunks of a query, which is known before they
+    # are downloaded. The first chunk is returned with the response of the query, and
+    # its size isn't known, but it's small.
+    try:
+        batches = results_cursor.get_result_batches()
+    except NotSupportedError:
+        return 0
+    return sum(batch.uncompressed_size or 0 for batch in batches or [])
+
+
+def _is_integer_column(column_metadata: ResultMetadata) -> bool:
+    return (
+        FIELD_ID_TO_NAME.get(column_metadata.type_code) == "FIXED"
+        and column_metadata.precision is not None
+        and column_metadata.scale == 0
+    )
+
+
+def _empty_arrow_table(description: List[ResultMetadata]) -> "pyarrow.Table":
+    return pyarrow.schema(
+        [pyarrow.field(c.name, _arrow_type(c), c.is_nullable) for c in description]
+    ).empty_table()
+
+
+def _rows_to_arrow_table(
+    rows: List[Row], attributes: List[Attribute], column_names: List[str]
+) -> "pyarrow.Table":
+    columns = []
+    for i, attr in enumerate(attributes):
+        values = [row[i] for row in rows]
+        arrow_type = convert_sp_to_arrow_type(attr.datatype)
+        if pyarrow.types.is_string(arrow_type):
+            values = [
+                v.hex() if isinstance(v, (bytes, bytearray)) else v for v in values
+            ]
+        try:
+            columns.append(pyarrow.array(values, type=arrow_type))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+            # values that are not of the type of their column are written as text,
+            # which is cast to the type of the column by COPY INTO
+            columns.append(
+                pyarrow.array(
+                    [None if v is None else str(v) for v in values], pyarrow.string()
+                )
+            )
+    return pyarrow.Table.from_arrays(columns, names=column_names)
+
+
+def _arrow_table_to_file_table(
+    table: "pyarrow.Table", attributes: List[Attribute], column_names: List[str]
+) -> "pyarrow.Table":
+    columns = []
+    for column, attr in zip(table.columns, attributes):
+        arrow_type = convert_sp_to_arrow_type(attr.datatype)
+        if column.type == arrow_type or isinstance(
+            attr.datatype, (BinaryType, ArrayType, MapType, VariantType)
+        ):
+            # binary and nested columns are read from Parquet as they are
+            columns.append(column)
+            continue
+        try:
+            columns.append(column.cast(arrow_type))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+            # e.g., timestamps in nanoseconds or unsigned integers out of the range
+            # of int64, which are written as text and cast by COPY INTO
+            columns.append(
+                pyarrow.array(
+                    [None if v is None else str(v) for v in column.to_pylist()],
+                    pyarrow.string(),
+                )
+            )
+    return pyarrow.Table.from_arrays(columns, names=column_names)
+
+
+def _numpy_dtype(column_metadata: ResultMetadata) -> str:
+    type_name = FIELD_ID_TO_NAME.get(column_metadata.type_code)
+    if type_name == "FIXED":
+        return "int64" if not column_metadata.scale else "float64"
+    if type_name == "REAL":
+        return "float64"
+    if type_name == "BOOLEAN":
+        return "bool"
+    if type_name == "DATE":
+        return "datetime64[D]"
+    if type_name in ("TIMESTAMP", "TIMESTAMP_NTZ", "TIMESTAMP_LTZ", "TIMESTAMP_TZ"):
+        # the values of TIMESTAMP_LTZ and TIMESTAMP_TZ columns are in UTC
+        return "datetime64[ns]"
+    # text, binary, time and semi-structured values
+    return "object"
+
+
+def _arrow_array_to_numpy(array: "pyarrow.Array", dtype: str) -> "numpy.ndarray":
+    import numpy
+
+    values = array.to_numpy(zero_copy_only=False)
+    mask = array.is_null().to_numpy(zero_copy_only=False) if array.null_count else None
+    if mask is not None and numpy.dtype(dtype).kind in "biu":
+        # a null value is masked, so any value of the dtype can be its placeholder
+        values = numpy.where(mask, 0, values)
+    try:
+        values = values.astype(dtype, copy=False)
+    except (OverflowError, ValueError, TypeError):
+        # e.g., the values of a NUMBER(38, 0) column out of the range of int64
+        values = values.astype(object, copy=False)
+    return values if mask is None else numpy.ma.masked_array(values, mask)
+
+
+def _arrow_batches_to_numpy(
+    batches: Iterable["pyarrow.Table"], description: List[ResultMetadata]
+) -> Dict[str, "numpy.ndarray"]:
+    """Converts the Arrow tables of a result to a NumPy array per column, with the
+    dtypes derived from the result metadata. A column with null values is converted
+    to a masked array. The Arrow chunks of a column are converted one by one, so no
+    Python object is created for a numeric value."""
+    import numpy
+
+    parts: List[List["numpy.ndarray"]] = [[] for _ in description]
+    for table in batches:
+        for i, column_metadata in enumerate(description):
+            dtype = _numpy_dtype(column_metadata)
+            parts[i].extend(
+                _arrow_array_to_numpy(chunk, dtype) for chunk in table.column(i).chunks
+            )
+    columns = {}
+    for column_metadata, column_parts in zip(description, parts):
+        if column_metadata.name in columns:
+            # like a Row, the first column of a duplicate name is returned
+            continue
+        if not column_parts:
+            array = numpy.empty(0, dtype=_numpy_dtype(column_metadata))
+        elif len(column_parts) == 1:
+            array = column_parts[0]
+        elif any(isinstance(p, numpy.ma.MaskedArray) for p in column_parts):
+            array = numpy.ma.concatenate(column_parts)
+        else:
+            array = numpy.concatenate(column_parts)
+        columns[column_metadata.name] = array
+    return columns
+
+
+class CursorPool:
+    """A bounded pool of cursors of a connection. A cursor is leased by a thread for
+    an action, so concurrent actions don't share the result state of one cursor.
+
+    All cursors of a connection run their queries in the same Snowflake session, so
+    the session state, e.g., the query tag, the current database and schema and the
+    temporary objects, is the same whichever cursor runs a query.
+    """
+
+    def __init__(self, conn: SnowflakeConnection, max_size: int) -> None:
+        self.max_size = max_size
+        self._conn = conn
+        self._semaphore = threading.BoundedSemaphore(max_size)
+        self._idle_cursors: List[SnowflakeCursor] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> SnowflakeCursor:
+        """Leases a cursor, and waits for one to be released if ``max_size`` cursors
+        are leased."""
+        self._semaphore.acquire()
+        with self._lock:
+            if self._idle_cursors:
+                return self._idle_cursors.pop()
+        try:
+            return self._conn.cursor()
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self, cursor: SnowflakeCursor, reuse: bool = True) -> None:
+        """Returns a leased cursor to the pool. A cursor whose result is still being
+        read, e.g., by an iterator returned by an action, is not leased again."""
+        if reuse:
+            with self._lock:
+                self._idle_cursors.append(cursor)
+        self._semaphore.release()
+
+
 class ServerConnection:
     class _Decorator:
         @classmethod
@@ -127,6 +441,15 @@ class ServerConnection:
 
             return log_and_telemetry
 
+        @classmethod
+        def with_leased_cursor(cls, func):
+            @functools.wraps(func)
+            def wrap(*args, **kwargs):
+                with args[0]._leased_cursor():
+                    return func(*args, **kwargs)
+
+            return wrap
+
     def __init__(
         self,
         options: Dict[str, Union[int, str]],
@@ -137,9 +460,17 @@ class ServerConnection:
         self._conn = conn if conn else connect(**self._lower_case_parameters)
         if "password" in self._lower_case_parameters:
             self._lower_case_parameters["password"] = None
-        self._cursor = self._conn.cursor()
+        self._default_cursor = self._conn.cursor()
+        self._cursor_pool: Optional[CursorPool] = None
+        # the cursor leased by the current thread for the running action
+        self._thread_local = threading.local()
         self._telemetry_client = TelemetryClient(self._conn)
         self._query_listener: Set[QueryHistory] = set()
+        # The query ids of the post actions of pipelined actions that aren't waited
+        # for, which are finished before the next action starts, since it can create
+        # the same temporary objects again
+        self._pending_post_actions: List[str] = []
+        self._pending_post_actions_lock = threading.Lock()
         # The session in this case refers to a Snowflake session, not a
         # Snowpark session
         self._telemetry_client.send_session_created_telemetry(not bool(conn))
@@ -156,6 +487,48 @@ class ServerConnection:
                 PARAM_INTERNAL_APPLICATION_VERSION
             ] = get_version()
 
+    @property
+    def _cursor(self) -> SnowflakeCursor:
+        return getattr(self._thread_local, "cursor", None) or self._default_cursor
+
+    @property
+    def cursor_pool_size(self) -> Optional[int]:
+        return self._cursor_pool.max_size if self._cursor_pool else None
+
+    @cursor_pool_size.setter
+    def cursor_pool_size(self, value: Optional[int]) -> None:
+        # the cursors leased from the previous pool are released to it
+        self._cursor_pool = CursorPool(self._conn, value) if value else None
+
+    @contextmanager
+    def _leased_cursor(self) -> Iterator[None]:
+        # Leases a cursor from the pool for the current thread, which is used by all
+        # queries run by the thread until the outermost call returns.
+        pool = self._cursor_pool
+        if pool is None or getattr(self._thread_local, "cursor", None) is not None:
+            yield
+            return
+        cursor = pool.acquire()
+        self._thread_local.cursor = cursor
+        self._thread_local.reuse_cursor = True
+        try:
+            yield
+        finally:
+            self._thread_local.cursor = None
+            pool.release(cursor, self._thread_local.reuse_cursor)
+
+    @contextmanager
+    def _own_cursor(self) -> Iterator[None]:
+        # Runs the queries of the current thread, e.g., a worker thread of an action
+        # whose queries run concurrently, with a new cursor, which is closed afterwards
+        cursor = self._conn.cursor()
+        self._thread_local.cursor = cursor
+        try:
+            yield
+        finally:
+            self._thread_local.cursor = None
+            cursor.close()
+
     def add_query_listener(self, listener: QueryHistory) -> None:
         self._query_listener.add(listener)
 
@@ -203,6 +576,7 @@ class ServerConnection:
         return rows[0][0] if len(rows) > 0 else None
 
     @SnowflakePlan.Decorator.wrap_exception
+    @_Decorator.with_leased_cursor
     def get_result_attributes(self, query: str) -> List[Attribute]:
         return convert_result_meta_to_attribute(self._cursor.describe(query))
 
@@ -301,12 +675,16 @@ class ServerConnection:
             listener._add_query(query_record)
 
     @_Decorator.wrap_exception
+    @_Decorator.with_leased_cursor
     def run_query(
         self,
         query: str,
         to_pandas: bool = False,
         to_iter: bool = False,
         is_ddl_on_temp_object: bool = False,
+        to_arrow: bool = False,
+        max_workers: Optional[int] = None,
+        arrow_threshold: Optional[int] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         try:
@@ -320,11 +698,66 @@ class ServerConnection:
                 QueryRecord(results_cursor.sfqid, results_cursor.query)
             )
             logger.debug(f"Execute query [queryID: {results_cursor.sfqid}] {query}")
+            if (
+                arrow_threshold is not None
+                and _result_batches_size(results_cursor) > arrow_threshold
+            ):
+                # a large result is fetched as Arrow batches
+                to_iter = to_arrow = True
+            if to_iter:
+                # the result is read from the cursor after the action returns
+                self._thread_local.reuse_cursor = False
         except Exception as ex:
             query_id_log = f" [queryID: {ex.sfqid}]" if hasattr(ex, "sfqid") else ""
             logger.error(f"Failed to execute query{query_id_log} {query}\n{ex}")
             raise ex
 
+        return {
+            "data": self._fetch_result(
+                results_cursor, to_pandas, to_iter, to_arrow, max_workers
+            ),
+            "sfqid": results_cursor.sfqid,
+        }
+
+    def _fetch_result(
+        self,
+        results_cursor: SnowflakeCursor,
+        to_pandas: bool,
+        to_iter: bool,
+        to_arrow: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Union[
+        List[Any],
+        "pandas.DataFrame",
+        SnowflakeCursor,
+        Iterator["pandas.DataFrame"],
+        "pyarrow.Table",
+        Iterator["pyarrow.Table"],
+    ]:
+        if to_arrow:
+            # The Arrow tables of the connector are returned without a conversion,
+            # only the integer columns fetched as decimals are cast.
+            try:
+                fix_integer = functools.partial(
+                    self._fix_arrow_table_integer, results_cursor=results_cursor
+                )
+                if to_iter:
+                    return self._fix_arrow_batches_integer(
+                        results_cursor.fetch_arrow_batches(), results_cursor
+                    )
+                table = results_cursor.fetch_arrow_all()
+                # the connector returns None for an empty result
+                return (
+                    fix_integer(table)
+                    if table is not None
+                    else _empty_arrow_table(results_cursor.description)
+                )
+            except NotSupportedError:
+                return iter(results_cursor) if to_iter else results_cursor.fetchall()
+            except KeyboardInterrupt:
+                raise
+            except BaseException as ex:
+                raise SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_ARROW(str(ex))
         # fetch_pandas_all/batches() only works for SELECT statements
         # We call fetchall() if fetch_pandas_all/batches() fails,
         # because when the query plan has multiple queries, it will
@@ -332,14 +765,19 @@ class ServerConnection:
         # calls to_pandas() to execute the query.
         if to_pandas:
             try:
-                data_or_iter = (
-                    map(
-                        self._fix_pandas_df_integer,
-                        results_cursor.fetch_pandas_batches(),
-                    )
-                    if to_iter
-                    else self._fix_pandas_df_integer(results_cursor.fetch_pandas_all())
+                fix_integer = functools.partial(
+                    self._fix_pandas_df_integer, results_cursor=results_cursor
                 )
+                if to_iter:
+                    data_or_iter = map(
+                        fix_integer, results_cursor.fetch_pandas_batches()
+                    )
+                elif max_workers:
+                    data_or_iter = self._fetch_pandas_parallel(
+                        results_cursor, max_workers
+                    )
+                else:
+                    data_or_iter = fix_integer(results_cursor.fetch_pandas_all())
             except NotSupportedError:
                 data_or_iter = (
                     iter(results_cursor) if to_iter else results_cursor.fetchall()
@@ -354,35 +792,266 @@ class ServerConnection:
             data_or_iter = (
                 iter(results_cursor) if to_iter else results_cursor.fetchall()
             )
+        return data_or_iter
+
+    def _fetch_pandas_parallel(
+        self, results_cursor: SnowflakeCursor, max_workers: int
+    ) -> "pandas.DataFrame":
+        # The result chunks are downloaded and converted to Pandas DataFrames by a pool
+        # of threads. At most 2 * max_workers chunks are submitted but not collected at
+        # a time, so the downloaded Arrow data of the chunks ahead of the ones being
+        # collected is bounded. The converted DataFrames are kept until they're
+        # concatenated with one copy, so the peak memory is the size of the result as
+        # DataFrames twice, plus the Arrow data of the chunks in flight.
+        batches = results_cursor.get_result_batches()
+        if not batches or len(batches) == 1 or max_workers <= 1:
+            return self._fix_pandas_df_integer(
+                results_cursor.fetch_pandas_all(), results_cursor
+            )
+        if not all(isinstance(batch, ArrowResultBatch) for batch in batches):
+            raise NotSupportedError("The result is not fetched in the Arrow format")
+
+        def convert(batch: ArrowResultBatch) -> "pandas.DataFrame":
+            return self._fix_pandas_df_integer(
+                batch.to_pandas(connection=self._conn), results_cursor
+            )
 
-        return {"data": data_or_iter, "sfqid": results_cursor.sfqid}
+        frames = []
+        in_flight: Deque[Future] = deque()
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="snowpark-fetch"
+        ) as executor:
+            try:
+                for batch in batches:
+                    if len(in_flight) >= 2 * max_workers:
+                        frames.append(in_flight.popleft().result())
+                    in_flight.append(executor.submit(convert, batch))
+                while in_flight:
+                    frames.append(in_flight.popleft().result())
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return pandas.concat(frames, ignore_index=True)
+
+    @_Decorator.wrap_exception
+    def get_result_from_query_id(
+        self,
+        sfqid: str,
+        to_pandas: bool = False,
+        to_iter: bool = False,
+        to_arrow: bool = False,
+    ) -> Tuple[
+        Union[
+            List[Any],
+            "pandas.DataFrame",
+            SnowflakeCursor,
+            Iterator["pandas.DataFrame"],
+        ],
+        List[ResultMetadata],
+    ]:
+        """Waits for a submitted query to finish and fetches its result."""
+        self.wait_for_query(sfqid)
+        results_cursor = self._conn.cursor()
+        results_cursor.query_result(sfqid)
+        data = self._fetch_result(results_cursor, to_pandas, to_iter, to_arrow)
+        return data, results_cursor.description
+
+    @_Decorator.wrap_exception
+    def submit_query(
+        self, query: str, is_ddl_on_temp_object: bool = False, **kwargs
+    ) -> str:
+        """Submits a query without waiting for it to finish and returns its query id."""
+        try:
+            if is_ddl_on_temp_object:
+                if not kwargs.get("_statement_params"):
+                    kwargs["_statement_params"] = {}
+                kwargs["_statement_params"]["SNOWPARK_SKIP_TXN_COMMIT_IN_DDL"] = True
+            # a separate cursor, so the results of the session cursor are kept
+            results_cursor = self._conn.cursor().execute_async(query, **kwargs)
+            sfqid = results_cursor["queryId"]
+            self.notify_query_listeners(QueryRecord(sfqid, query))
+            logger.debug(f"Submit query [queryID: {sfqid}] {query}")
+        except Exception as ex:
+            query_id_log = f" [queryID: {ex.sfqid}]" if hasattr(ex, "sfqid") else ""
+            logger.error(f"Failed to submit query{query_id_log} {query}\n{ex}")
+            raise ex
+        return sfqid
+
+    @_Decorator.wrap_exception
+    def wait_for_query(self, sfqid: str) -> None:
+        """Waits for a submitted query to finish, and raises its error if it failed."""
+        attempt = 0
+        while self._conn.is_still_running(
+            self._conn.get_query_status_throw_if_error(sfqid)
+        ):
+            time.sleep(
+                QUERY_STATUS_POLL_DELAYS[
+                    min(attempt, len(QUERY_STATUS_POLL_DELAYS) - 1)
+                ]
+            )
+            attempt += 1
 
     def execute(
         self,
         plan: SnowflakePlan,
         to_pandas: bool = False,
         to_iter: bool = False,
+        block: bool = True,
+        data_type: _AsyncResultType = _AsyncResultType.ROW,
+        to_arrow: bool = False,
+        to_numpy: bool = False,
+        max_workers: Optional[int] = None,
         **kwargs,
     ) -> Union[
-        List[Row], "pandas.DataFrame", Iterator[Row], Iterator["pandas.DataFrame"]
+        List[Row],
+        "pandas.DataFrame",
+        Iterator[Row],
+        Iterator["pandas.DataFrame"],
+        "pyarrow.Table",
+        Iterator["pyarrow.Table"],
+        Dict[str, "numpy.ndarray"],
+        AsyncJob,
     ]:
-        result_set, result_meta = self.get_result_set(
-            plan, to_pandas, to_iter, **kwargs
+        cache = plan.session._result_cache
+        cache_key = (
+            self._result_cache_key(plan, to_pandas, to_arrow)
+            if cache is not None and block and not (to_iter or to_numpy)
+            else None
         )
-        if to_pandas:
+        cached = cache.get(cache_key) if cache_key is not None else None
+        spill_threshold = plan.session._result_spill_threshold
+        if cached is not None:
+            result_set, result_meta = cached
+        else:
+            cache_version = cache.version if cache_key is not None else None
+            if (
+                spill_threshold is not None
+                and block
+                and not (to_iter or to_arrow or to_numpy)
+            ):
+                result_set, result_meta, spilled = self._get_result_set_with_spill(
+                    plan, to_pandas, spill_threshold, **kwargs
+                )
+            else:
+                result_set, result_meta = self.get_result_set(
+                    plan,
+                    to_pandas,
+                    to_iter or to_numpy,
+                    block=block,
+                    data_type=data_type,
+                    to_arrow=to_arrow or to_numpy,
+                    max_workers=max_workers,
+                    **kwargs,
+                )
+                spilled = False
+            # a spilled result is not held in memory, so it's not cached
+            if cache_key is not None and not spilled:
+                cache.put(
+                    cache_key,
+                    "\n".join(query.sql for query in plan.queries),
+                    result_set,
+                    result_meta,
+                    cache_version,
+                )
+        if not block:
+            return result_set
+        if to_numpy:
+            batches = list(result_set)
+            # the rows of a non-SELECT statement are not fetched as Arrow tables
+            if not all(isinstance(b, pyarrow.Table) for b in batches):
+                return result_set_to_rows(batches, result_meta)
+            return _arrow_batches_to_numpy(batches, result_meta)
+        if to_pandas or to_arrow:
             return result_set
         else:
             if to_iter:
                 return result_set_to_iter(result_set, result_meta)
+            elif isinstance(result_set, SpilledRows):
+                return result_set
             else:
                 return result_set_to_rows(result_set, result_meta)
 
+    def _get_result_set_with_spill(
+        self, plan: SnowflakePlan, to_pandas: bool, threshold: int, **kwargs
+    ) -> Tuple[
+        Union[List[Any], "pandas.DataFrame", SpilledRows], List[ResultMetadata], bool
+    ]:
+        # The result is fetched as Arrow tables, which are spilled to a memory-mapped
+        # file when their size exceeds the threshold. It's returned as rows or a Pandas
+        # DataFrame, and whether it's spilled. Rows are fetched by the connector as
+        # usual when the size of the result chunks doesn't exceed the threshold.
+        if to_pandas:
+            result_set, result_meta = self.get_result_set(
+                plan, to_iter=True, to_arrow=True, **kwargs
+            )
+        else:
+            result_set, result_meta = self.get_result_set(
+                plan, arrow_threshold=threshold, **kwargs
+            )
+            if isinstance(result_set, list):
+                return result_set, result_meta, False
+        first = next(result_set, None)
+        if first is not None and not isinstance(first, pyarrow.Table):
+            # the rows of a non-SELECT statement are not fetched as Arrow tables
+            return [first, *result_set], result_meta, False
+        tables = spill_arrow_batches(
+            itertools.chain([first] if first is not None else [], result_set),
+            threshold,
+        )
+        if isinstance(tables, pyarrow.Table):
+            if to_pandas:
+                # the numeric columns without null values refer to the mapped file
+                return tables.to_pandas(split_blocks=True), result_meta, True
+            return SpilledRows(tables, result_meta), result_meta, True
+        if not to_pandas:
+            return (
+                [row for table in tables for row in arrow_table_to_tuples(table)],
+                result_meta,
+                False,
+            )
+        if not tables:
+            return _empty_arrow_table(result_meta).to_pandas(), result_meta, False
+        return pyarrow.concat_tables(tables).to_pandas(), result_meta, False
+
+    def _result_cache_key(
+        self, plan: SnowflakePlan, to_pandas: bool, to_arrow: bool
+    ) -> Optional[Tuple]:
+        # Only the results of plans of queries that read data are cached, and not the
+        # ones that load local data into temporary tables, whose names are random.
+        if not all(
+            type(query) is Query for query in plan.queries
+        ) or not is_sql_select_statement(plan.queries[-1].sql):
+            return None
+        return (
+            tuple(query.sql for query in plan.queries),
+            to_pandas,
+            to_arrow,
+            *self._session_context(),
+        )
+
+    def _session_context(self) -> Tuple[Optional[str], ...]:
+        # the current role, warehouse, database and schema, which the connector
+        # updates from the response of every query, e.g., after a USE statement
+        return (
+            self._conn.role,
+            self._conn.warehouse,
+            self._conn.database,
+            self._conn.schema,
+        )
+
     @SnowflakePlan.Decorator.wrap_exception
+    @_Decorator.with_leased_cursor
     def get_result_set(
         self,
         plan: SnowflakePlan,
         to_pandas: bool = False,
         to_iter: bool = False,
+        block: bool = True,
+        data_type: _AsyncResultType = _AsyncResultType.ROW,
+        to_arrow: bool = False,
+        max_workers: Optional[int] = None,
+        arrow_threshold: Optional[int] = None,
         **kwargs,
     ) -> Union[
         List[Any],
@@ -390,44 +1059,181 @@ class ServerConnection:
         SnowflakeCursor,
         Iterator["pandas.DataFrame"],
         List[ResultMetadata],
+        AsyncJob,
     ]:
+        self._wait_for_post_actions()
         action_id = plan.session._generate_new_action_id()
+        # the job of the last query when it's submitted without waiting for it
+        async_job = None
+        pipelined = (
+            plan.session.pipelined_execution_enabled and not is_in_stored_procedure()
+        )
 
         result, result_meta = None, None
         try:
             placeholders = {}
+            if pipelined:
+                # the queries before the last one run concurrently when they don't
+                # depend on each other
+                self._run_pipelined_queries(
+                    plan.queries[:-1], placeholders, plan.session, action_id, **kwargs
+                )
             for i, query in enumerate(plan.queries):
+                if pipelined and i < len(plan.queries) - 1:
+                    continue
                 if isinstance(query, BatchInsertQuery):
                     self.run_batch_insert(query.sql, query.rows, **kwargs)
+                elif isinstance(query, BulkLoadQuery):
+                    self.run_bulk_load(query, **kwargs)
                 else:
                     final_query = query.sql
                     for holder, id_ in placeholders.items():
                         final_query = final_query.replace(holder, id_)
-                    result = self.run_query(
-                        final_query,
-                        to_pandas,
-                        to_iter and (i == len(plan.queries) - 1),
-                        is_ddl_on_temp_object=query.is_ddl_on_temp_object,
-                        **kwargs,
-                    )
-                    placeholders[query.query_id_place_holder] = result["sfqid"]
-                    result_meta = self._cursor.description
+                    if not block and i == len(plan.queries) - 1:
+                        async_job = AsyncJob(
+                            self.submit_query(
+                                final_query,
+                                is_ddl_on_temp_object=query.is_ddl_on_temp_object,
+                                **kwargs,
+                            ),
+                            final_query,
+                            plan.session,
+                            data_type,
+                            # they're run when the query finishes or is canceled
+                            plan.post_actions,
+                            action_id,
+                            **kwargs,
+                        )
+                    else:
+                        result = self.run_query(
+                            final_query,
+                            to_pandas,
+                            to_iter and (i == len(plan.queries) - 1),
+                            is_ddl_on_temp_object=query.is_ddl_on_temp_object,
+                            to_arrow=to_arrow,
+                            max_workers=max_workers,
+                            arrow_threshold=arrow_threshold
+                            if i == len(plan.queries) - 1
+                            else None,
+                            **kwargs,
+                        )
+                        placeholders[query.query_id_place_holder] = result["sfqid"]
+                        result_meta = self._cursor.description
                 if action_id < plan.session._last_canceled_id:
                     raise SnowparkClientExceptionMessages.SERVER_QUERY_IS_CANCELLED()
         finally:
             # delete created tmp object
-            for action in plan.post_actions:
-                self.run_query(
-                    action.sql,
-                    is_ddl_on_temp_object=action.is_ddl_on_temp_object,
-                    **kwargs,
-                )
+            for action in plan.post_actions if async_job is None else []:
+                if pipelined:
+                    # it's not waited for, so it doesn't delay the result
+                    sfqid = self.submit_query(
+                        action.sql,
+                        is_ddl_on_temp_object=action.is_ddl_on_temp_object,
+                        **kwargs,
+                    )
+                    with self._pending_post_actions_lock:
+                        self._pending_post_actions.append(sfqid)
+                else:
+                    self.run_query(
+                        action.sql,
+                        is_ddl_on_temp_object=action.is_ddl_on_temp_object,
+                        **kwargs,
+                    )
 
+        if async_job is not None:
+            return async_job, None
         if result is None:
             raise SnowparkClientExceptionMessages.SQL_LAST_QUERY_RETURN_RESULTSET()
 
         return result["data"], result_meta
 
+    def _wait_for_post_actions(self) -> None:
+        # The plan of a DataFrame is resolved once, so its temporary objects have the
+        # same names in all its actions, and Snowflake doesn't order the queries that
+        # are submitted asynchronously in a session, so the drops of the previous
+        # action would otherwise race with their creation by the next one.
+        with self._pending_post_actions_lock:
+            sfqids, self._pending_post_actions = self._pending_post_actions, []
+        for sfqid in sfqids:
+            try:
+                self.wait_for_query(sfqid)
+            except Exception as ex:
+                logger.debug(f"Post action [queryID: {sfqid}] failed: {ex}")
+
+    def _run_pipelined_queries(
+        self,
+        queries: List[Query],
+        placeholders: Dict[str, str],
+        session: "snowflake.snowpark.session.Session",
+        action_id: int,
+        **kwargs,
+    ) -> None:
+        # Runs the queries by a pool of threads in the order of their dependencies: a
+        # query is started as soon as the queries it depends on are finished, so
+        # independent chains, e.g., the creation and the load of the temporary tables
+        # of the two sides of a join, overlap. Each thread blocks on its query until it
+        # finishes, and all started queries are finished when this returns, since a
+        # temporary object can only be dropped after it is created.
+        dependencies = _query_dependencies(queries)
+        finished: Set[int] = set()
+        running: Dict[Future, int] = {}
+        pending = list(range(len(queries)))
+        with ThreadPoolExecutor(
+            max_workers=_PIPELINED_QUERY_PARALLELISM,
+            thread_name_prefix="snowpark-query",
+        ) as executor:
+            try:
+                while pending or running:
+                    for i in [i for i in pending if dependencies[i] <= finished]:
+                        pending.remove(i)
+                        running[
+                            executor.submit(
+                                self._run_plan_query,
+                                queries[i],
+                                # a copy, since it's updated while the query runs
+                                dict(placeholders),
+                                **kwargs,
+                            )
+                        ] = i
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = running.pop(future)
+                        sfqid = future.result()
+                        if sfqid is not None:
+                            placeholders[queries[i].query_id_place_holder] = sfqid
+                        finished.add(i)
+                    if action_id < session._last_canceled_id:
+                        raise SnowparkClientExceptionMessages.SERVER_QUERY_IS_CANCELLED()
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                for future in wait(running).done:
+                    if not future.cancelled() and future.exception() is not None:
+                        logger.debug(
+                            f"Query {queries[running[future]].sql} failed: "
+                            f"{future.exception()}"
+                        )
+                raise
+
+    def _run_plan_query(
+        self, query: Query, placeholders: Dict[str, str], **kwargs
+    ) -> Optional[str]:
+        # Runs a query of a plan by a thread of _run_pipelined_queries with a cursor of
+        # its own, and returns its query id
+        with self._own_cursor():
+            if isinstance(query, BatchInsertQuery):
+                self.run_batch_insert(query.sql, query.rows, **kwargs)
+            elif isinstance(query, BulkLoadQuery):
+                self.run_bulk_load(query, **kwargs)
+            else:
+                sql = query.sql
+                for holder, id_ in placeholders.items():
+                    sql = sql.replace(holder, id_)
+                return self.run_query(
+                    sql, is_ddl_on_temp_object=query.is_ddl_on_temp_object, **kwargs
+                )["sfqid"]
+        return None
+
     def get_result_and_metadata(
         self, plan: SnowflakePlan, **kwargs
     ) -> Union[List[Row], List[Attribute]]:
@@ -437,6 +1243,7 @@ class ServerConnection:
         return result, meta
 
     @_Decorator.wrap_exception
+    @_Decorator.with_leased_cursor
     def run_batch_insert(self, query: str, rows: List[Row], **kwargs) -> None:
         # with qmark, Python data type will be dynamically mapped to Snowflake data type
         # https://docs.snowflake.com/en/user-guide/python-connector-api.html#data-type-mappings-for-qmark-and-numeric-bindings
@@ -468,9 +1275,69 @@ class ServerConnection:
             )
         logger.debug("Execute batch insertion query %s", query)
 
-    def _fix_pandas_df_integer(self, pd_df: "pandas.DataFrame") -> "pandas.DataFrame":
+    @_Decorator.wrap_exception
+    @_Decorator.with_leased_cursor
+    def run_bulk_load(self, query: BulkLoadQuery, **kwargs) -> None:
+        # The rows are written to Parquet files in memory and uploaded by a pool of
+        # threads, so at most _BULK_LOAD_PARALLELISM files are held in memory at a time.
+        # The COPY INTO statement loads all files after they're uploaded. A PyArrow
+        # Table is split into zero-copy slices, whose columns are written as they are.
+        import pyarrow.parquet
+
+        rows_per_file = max(1, _BULK_LOAD_CELLS_PER_FILE // len(query.attributes))
+        is_table = isinstance(query.rows, pyarrow.Table)
+        chunks = [
+            query.rows.slice(i, rows_per_file)
+            if is_table
+            else query.rows[i : i + rows_per_file]
+            for i in range(0, len(query.rows), rows_per_file)
+        ]
+
+        def upload(index: int, rows: Union[List[Row], "pyarrow.Table"]) -> None:
+            stream = io.BytesIO()
+            to_file_table = (
+                _arrow_table_to_file_table if is_table else _rows_to_arrow_table
+            )
+            pyarrow.parquet.write_table(
+                to_file_table(rows, query.attributes, query.file_column_names),
+                stream,
+            )
+            stream.seek(0)
+            self._put_stream(stream, query.stage_location, f"{index}.parquet")
+
+        with ThreadPoolExecutor(
+            max_workers=min(_BULK_LOAD_PARALLELISM, len(chunks)),
+            thread_name_prefix="snowpark-upload",
+        ) as executor:
+            for future in [
+                executor.submit(upload, i, rows) for i, rows in enumerate(chunks)
+            ]:
+                future.result()
+        self.run_query(query.sql, **kwargs)
+
+    def _put_stream(
+        self, input_stream: IO[bytes], stage_location: str, file_name: str
+    ) -> None:
+        # Files are uploaded concurrently by different threads, so each upload uses its
+        # own cursor. They're compressed by the Parquet writer already.
+        with self._own_cursor():
+            self.upload_stream(
+                input_stream,
+                stage_location,
+                file_name,
+                parallel=1,
+                compress_data=False,
+                overwrite=True,
+            )
+
+    def _fix_pandas_df_integer(
+        self,
+        pd_df: "pandas.DataFrame",
+        results_cursor: Optional[SnowflakeCursor] = None,
+    ) -> "pandas.DataFrame":
+        description = (results_cursor or self._cursor).description
         for column_metadata, pandas_dtype, pandas_col_name in zip(
-            self._cursor.description, pd_df.dtypes, pd_df.columns
+            description, pd_df.dtypes, pd_df.columns
         ):
             if (
                 FIELD_ID_TO_NAME.get(column_metadata.type_code) == "FIXED"
@@ -482,3 +1349,57 @@ class ServerConnection:
                     pd_df[pandas_col_name], downcast="integer"
                 )
         return pd_df
+
+    def _fix_arrow_table_integer(
+        self, table: "pyarrow.Table", results_cursor: SnowflakeCursor
+    ) -> "pyarrow.Table":
+        for i, (column_metadata, field) in enumerate(
+            zip(results_cursor.description, table.schema)
+        ):
+            if _is_integer_column(column_metadata) and not pyarrow.types.is_int64(
+                field.type
+            ):
+                try:
+                    table = table.set_column(
+                        i, field.name, table.column(i).cast(pyarrow.int64())
+                    )
+                except pyarrow.ArrowInvalid:
+                    # the values out of the range of int64 are kept as decimals
+                    table = table.set_column(
+                        i,
+                        field.name,
+                        table.column(i).cast(
+                            pyarrow.decimal128(column_metadata.precision, 0)
+                        ),
+                    )
+        return table
+
+    def _fix_arrow_batches_integer(
+        self, batches: Iterable["pyarrow.Table"], results_cursor: SnowflakeCursor
+    ) -> Iterator["pyarrow.Table"]:
+        # The connector fetches the integer columns of each batch as the narrowest type
+        # that holds its values, so the batches are cast to one schema, whose integer
+        # columns are int64. A batch with a value out of the range of int64 can't be
+        # cast, since the previous batches are already returned.
+        description = results_cursor.description
+        schema = None
+        for batch in batches:
+            if schema is None:
+                schema = pyarrow.schema(
+                    [
+                        field.with_type(pyarrow.int64())
+                        if _is_integer_column(column_metadata)
+                        else field
+                        for column_metadata, field in zip(description, batch.schema)
+                    ],
+                    batch.schema.metadata,
+                )
+            if batch.schema != schema:
+                try:
+                    batch = batch.cast(schema)
+                except pyarrow.ArrowInvalid as ex:
+                    raise SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_ARROW(
+                        f"{ex}. A value of an integer column is out of the range of "
+                        "int64, fetch the result with to_arrow() instead"
+                    )
+            yield batch
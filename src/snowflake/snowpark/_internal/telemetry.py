@@ -3,6 +3,7 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 import functools
+import inspect
 from enum import Enum, unique
 from typing import Any, Dict, Optional
 
@@ -71,6 +72,9 @@ def safe_telemetry(func):
 
 # Action telemetry decorator for DataFrame class
 def df_action_telemetry(func):
+    if inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func):
+        return _df_async_action_telemetry(func)
+
     @functools.wraps(func)
     def wrap(*args, **kwargs):
         result = func(*args, **kwargs)
@@ -82,6 +86,46 @@ def df_action_telemetry(func):
     return wrap
 
 
+# Action telemetry decorator for the coroutines and asynchronous iterators of DataFrame
+# class, which is sent when the action runs instead of when the coroutine or the
+# iterator is created, and keeps the decorated function a coroutine function or an
+# asynchronous generator function
+def _df_async_action_telemetry(func):
+    def send(df):
+        df._session._conn._telemetry_client.send_function_usage_telemetry(
+            f"action_{func.__name__}", TelemetryField.FUNC_CAT_ACTION.value
+        )
+
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def wrap_iterator(*args, **kwargs):
+            iterator = func(*args, **kwargs)
+            try:
+                # the query runs when the first item is requested
+                try:
+                    first = await iterator.__anext__()
+                except StopAsyncIteration:
+                    send(args[0])
+                    return
+                send(args[0])
+                yield first
+                async for item in iterator:
+                    yield item
+            finally:
+                await iterator.aclose()
+
+        return wrap_iterator
+
+    @functools.wraps(func)
+    async def wrap(*args, **kwargs):
+        result = await func(*args, **kwargs)
+        send(args[0])
+        return result
+
+    return wrap
+
+
 # Action telemetry decorator for DataFrameWriter class
 def dfw_action_telemetry(func):
     @functools.wraps(func)
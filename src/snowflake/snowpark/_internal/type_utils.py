@@ -30,7 +30,7 @@ from typing import (  # noqa: F401
 )
 
 import snowflake.snowpark.types  # type: ignore
-from snowflake.connector.options import installed_pandas, pandas
+from snowflake.connector.options import installed_pandas, pandas, pyarrow
 from snowflake.snowpark.types import (
     ArrayType,
     BinaryType,
@@ -160,6 +160,94 @@ def convert_sp_to_sf_type(datatype: DataType) -> str:
     raise TypeError(f"Unsupported data type: {datatype.__class__.__name__}")
 
 
+def convert_sp_to_arrow_type(datatype: DataType) -> "pyarrow.DataType":
+    """Converts the Snowpark type of a column of local data to the Arrow type it's
+    written as in a staged Parquet file. Semi-structured values are written as JSON
+    text and binary values as hex strings."""
+    if isinstance(datatype, DecimalType):
+        return pyarrow.decimal128(datatype.precision, datatype.scale)
+    if isinstance(datatype, (IntegerType, ShortType, ByteType, LongType)):
+        return pyarrow.int64()
+    if isinstance(datatype, (FloatType, DoubleType)):
+        return pyarrow.float64()
+    if isinstance(datatype, BooleanType):
+        return pyarrow.bool_()
+    if isinstance(datatype, DateType):
+        return pyarrow.date32()
+    if isinstance(datatype, TimeType):
+        return pyarrow.time64("us")
+    if isinstance(datatype, TimestampType):
+        return pyarrow.timestamp("us")
+    return pyarrow.string()
+
+
+def convert_arrow_to_sp_type(arrow_type: "pyarrow.DataType") -> DataType:
+    types = pyarrow.types
+    if types.is_dictionary(arrow_type):
+        return convert_arrow_to_sp_type(arrow_type.value_type)
+    if types.is_null(arrow_type):
+        return NullType()
+    if types.is_boolean(arrow_type):
+        return BooleanType()
+    if types.is_int8(arrow_type):
+        return ByteType()
+    if types.is_int16(arrow_type) or types.is_uint8(arrow_type):
+        return ShortType()
+    if types.is_int32(arrow_type) or types.is_uint16(arrow_type):
+        return IntegerType()
+    if types.is_integer(arrow_type):
+        return LongType()
+    if types.is_float16(arrow_type) or types.is_float32(arrow_type):
+        return FloatType()
+    if types.is_float64(arrow_type):
+        return DoubleType()
+    if types.is_decimal(arrow_type) and arrow_type.precision <= 38:
+        return DecimalType(arrow_type.precision, arrow_type.scale)
+    if types.is_string(arrow_type) or types.is_large_string(arrow_type):
+        return StringType()
+    if (
+        types.is_binary(arrow_type)
+        or types.is_large_binary(arrow_type)
+        or types.is_fixed_size_binary(arrow_type)
+    ):
+        return BinaryType()
+    if types.is_date(arrow_type):
+        return DateType()
+    if types.is_time(arrow_type):
+        return TimeType()
+    if types.is_timestamp(arrow_type):
+        return TimestampType()
+    if (
+        types.is_list(arrow_type)
+        or types.is_large_list(arrow_type)
+        or types.is_fixed_size_list(arrow_type)
+    ):
+        return ArrayType(convert_arrow_to_sp_type(arrow_type.value_type))
+    if types.is_map(arrow_type):
+        return MapType(
+            convert_arrow_to_sp_type(arrow_type.key_type),
+            convert_arrow_to_sp_type(arrow_type.item_type),
+        )
+    if types.is_struct(arrow_type):
+        return MapType(StringType(), StringType())
+    raise TypeError(f"Unsupported Arrow type: {arrow_type}")
+
+
+def convert_arrow_to_sp_schema(schema: "pyarrow.Schema") -> StructType:
+    """Converts the schema of a PyArrow Table to a :class:`StructType`. The names of
+    the fields are kept as they are, like the column names of a pandas DataFrame."""
+    return StructType(
+        [
+            StructField(
+                '"' + field.name.replace('"', '""') + '"',
+                convert_arrow_to_sp_type(field.type),
+                field.nullable,
+            )
+            for field in schema
+        ]
+    )
+
+
 # Mapping Python types to DataType
 NoneType = type(None)
 PYTHON_TO_SNOW_TYPE_MAPPINGS = {
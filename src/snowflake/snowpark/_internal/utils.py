@@ -9,18 +9,21 @@ import decimal
 import functools
 import hashlib
 import io
+import itertools
 import logging
 import os
 import platform
+import queue
 import random
 import re
 import string
+import threading
 import traceback
 import zipfile
 from enum import Enum
 from json import JSONEncoder
 from random import choice
-from typing import IO, Any, Iterator, List, Optional, Type
+from typing import IO, Any, Iterator, List, Optional, Type, TypeVar
 
 import snowflake.snowpark
 from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
@@ -58,6 +61,15 @@ SNOWFLAKE_STAGE_NAME_PATTERN = f"(%?{SNOWFLAKE_ID_PATTERN})"
 TEMP_OBJECT_NAME_PREFIX = "SNOWPARK_TEMP_"
 ALPHANUMERIC = string.digits + string.ascii_lowercase
 
+# Delays in seconds between polls of the status of an asynchronous query
+QUERY_STATUS_POLL_DELAYS = (0.05, 0.1, 0.2, 0.5, 1.0)
+
+# The interval in seconds at which a prefetching thread checks whether its consumer
+# has stopped while the buffer is full
+_PREFETCH_POLL_INTERVAL = 0.1
+
+T = TypeVar("T")
+
 
 # A set of widely-used packages,
 # whose names in pypi are different from their package name
@@ -121,6 +133,7 @@ class TempObjectType(Enum):
     COLUMN = "COLUMN"
     PROCEDURE = "PROCEDURE"
     TABLE_FUNCTION = "TABLE_FUNCTION"
+    CTE = "CTE"
 
 
 def validate_object_name(name: str):
@@ -410,6 +423,10 @@ def is_in_stored_procedure():
     return PLATFORM == "XP"
 
 
+def is_sql_select_statement(sql: str) -> bool:
+    return sql.strip().lower().startswith(("select", "with"))
+
+
 def random_name_for_temp_object(object_type: TempObjectType) -> str:
     return f"{TEMP_OBJECT_NAME_PREFIX}{object_type.value}_{generate_random_alphanumeric().upper()}"
 
@@ -418,6 +435,42 @@ def generate_random_alphanumeric(length: int = 10) -> str:
     return "".join(choice(ALPHANUMERIC) for _ in range(length))
 
 
+# Whether the names generated by the current thread are derived from their content,
+# see deterministic_names()
+_deterministic_names = threading.local()
+
+
+@contextlib.contextmanager
+def deterministic_names(enabled: bool = True) -> Iterator[None]:
+    """Within this context, :func:`name_for_generated_object` and
+    :func:`generate_alphanumeric` return names derived from the content they are
+    generated for instead of random names, so the same plan generates the same SQL."""
+    previous = getattr(_deterministic_names, "enabled", False)
+    _deterministic_names.enabled = enabled
+    try:
+        yield
+    finally:
+        _deterministic_names.enabled = previous
+
+
+def generate_alphanumeric(*contents: str, length: int = 10) -> str:
+    """Returns a random string, or a hash of ``contents`` if deterministic names are
+    enabled, e.g., for an alias or a placeholder that only has to be unique among the
+    names generated for different contents."""
+    if not getattr(_deterministic_names, "enabled", False):
+        return generate_random_alphanumeric(length)
+    digest = hashlib.sha256("\0".join(contents).encode("utf-8")).digest()
+    return "".join(ALPHANUMERIC[b % len(ALPHANUMERIC)] for b in digest[:length])
+
+
+def name_for_generated_object(object_type: TempObjectType, *contents: str) -> str:
+    """Like :func:`random_name_for_temp_object`, but the name is derived from
+    ``contents`` if deterministic names are enabled. It's only used for names that are
+    local to the generated SQL, e.g., aliases, and not for objects that are created,
+    which would be shared by concurrent actions of the same plan otherwise."""
+    return f"{TEMP_OBJECT_NAME_PREFIX}{object_type.value}_{generate_alphanumeric(*contents).upper()}"
+
+
 def column_to_bool(col_):
     """A replacement to bool(col_) to check if ``col_`` is None or Empty.
 
@@ -433,28 +486,74 @@ def column_to_bool(col_):
 def result_set_to_rows(
     result_set: List[Any], result_meta: Optional[List[ResultMetadata]] = None
 ) -> List[Row]:
-    if result_meta:
-        col_names = [col.name for col in result_meta]
-        rows = []
-        for data in result_set:
-            row = Row(*data)
-            # row might have duplicated column names
-            row._fields = col_names
-            rows.append(row)
-    else:
-        rows = [Row(*row) for row in result_set]
-    return rows
+    # All rows share the class that holds the column names, which might be duplicated.
+    row_class = (
+        Row._with_fields(col.name for col in result_meta) if result_meta else Row
+    )
+    return [row_class._make(data) for data in result_set]
 
 
 def result_set_to_iter(
     result_set: SnowflakeCursor, result_meta: Optional[List[ResultMetadata]] = None
 ) -> Iterator[Row]:
-    col_names = [col.name for col in result_meta] if result_meta else None
+    row_class = (
+        Row._with_fields(col.name for col in result_meta) if result_meta else Row
+    )
     for data in result_set:
-        row = Row(*data)
-        if col_names:
-            row._fields = col_names
-        yield row
+        yield row_class._make(data)
+
+
+def prefetch(iterator: Iterator[T], depth: int, batch_size: int = 1) -> Iterator[T]:
+    """Yields the items of ``iterator`` while a background thread fetches the next
+    ``depth`` batches of ``batch_size`` items, so fetching and converting the items,
+    e.g., downloading result chunks, overlaps with the processing of the consumer.
+
+    At most ``depth`` batches are buffered. When the returned generator is closed or
+    garbage collected before it's exhausted, the thread stops after the batch it's
+    fetching, and the generator waits for it, so ``iterator`` isn't used afterwards.
+    An exception raised by ``iterator`` is raised to the consumer after the items
+    fetched before it.
+    """
+    if not depth or depth <= 0:
+        yield from iterator
+        return
+
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=_PREFETCH_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def fetch() -> None:
+        try:
+            while True:
+                batch = list(itertools.islice(iterator, batch_size))
+                if not batch or not put((batch, None)):
+                    break
+        except BaseException as ex:
+            put((None, ex))
+            return
+        put(([], None))
+
+    thread = threading.Thread(target=fetch, name="snowpark-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            batch, error = buffer.get()
+            if error is not None:
+                raise error
+            if not batch:
+                return
+            yield from batch
+    finally:
+        stopped.set()
+        thread.join()
 
 
 class PythonObjJSONEncoder(JSONEncoder):
@@ -0,0 +1,268 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import asyncio
+import itertools
+import threading
+import weakref
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+import snowflake.snowpark
+from snowflake.connector.options import pandas
+from snowflake.snowpark._internal.error_message import SnowparkClientExceptionMessages
+from snowflake.snowpark._internal.utils import (
+    QUERY_STATUS_POLL_DELAYS,
+    result_set_to_iter,
+    result_set_to_rows,
+)
+from snowflake.snowpark.row import Row
+
+if TYPE_CHECKING:
+    from snowflake.snowpark._internal.analyzer.snowflake_plan import Query
+    from snowflake.snowpark._internal.server_connection import ServerConnection
+
+T = TypeVar("T")
+
+
+class _AsyncResultType(Enum):
+    ROW = "row"
+    PANDAS = "pandas"
+    COUNT = "count"
+    NO_RESULT = "no_result"
+    ITERATOR = "iterator"
+    PANDAS_BATCH = "pandas_batch"
+
+
+async def _iterate_async(
+    iterator: Iterator[T], batch_size: int = 1
+) -> AsyncIterator[T]:
+    # The items are fetched by a worker thread in batches, so the event loop isn't
+    # blocked while the connector downloads the result chunks.
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = await loop.run_in_executor(
+            None, lambda: list(itertools.islice(iterator, batch_size))
+        )
+        if not batch:
+            return
+        for item in batch:
+            yield item
+
+
+def _run_post_actions(
+    conn: "ServerConnection",
+    post_actions: List["Query"],
+    lock: threading.Lock,
+    **kwargs,
+) -> None:
+    # The post actions are shared by a job and its finalizer, and the first call runs
+    # them.
+    with lock:
+        actions = list(post_actions)
+        post_actions.clear()
+    for action in actions:
+        conn.run_query(
+            action.sql, is_ddl_on_temp_object=action.is_ddl_on_temp_object, **kwargs
+        )
+
+
+def _run_post_actions_after_query(
+    conn: "ServerConnection",
+    query_id: str,
+    post_actions: List["Query"],
+    lock: threading.Lock,
+    **kwargs,
+) -> None:
+    # Runs the post actions of a job that is garbage collected before they run, once
+    # its query finishes, by a thread, so the temporary objects the query reads are
+    # not dropped while it runs.
+    if not post_actions:
+        return
+
+    def run() -> None:
+        try:
+            conn.wait_for_query(query_id)
+        except Exception:
+            # the query failed or was canceled, and its objects are dropped anyway
+            pass
+        _run_post_actions(conn, post_actions, lock, **kwargs)
+
+    threading.Thread(target=run, name="snowpark-post-actions", daemon=True).start()
+
+
+class AsyncJob:
+    """
+    Provides a way to track a query of a DataFrame action that is executed
+    asynchronously in Snowflake, so the calling thread doesn't wait for it. It's
+    returned by non-blocking actions, e.g., :meth:`DataFrame.collect_nowait` and
+    :meth:`DataFrame.to_pandas_nowait`.
+
+    The query is recorded by :meth:`Session.query_history` when it's submitted, and is
+    canceled by :meth:`Session.cancel_all` like the queries of blocking actions. The
+    temporary objects created for the query are dropped when it's known to be finished,
+    e.g., by :meth:`is_done` or :meth:`result`, when it's canceled by :meth:`cancel`, or
+    after it finishes if the job is garbage collected first.
+
+    Example::
+
+        >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+        >>> async_job = df.collect_nowait()
+        >>> async_job.result()
+        [Row(A=1, B=2), Row(A=3, B=4)]
+        >>> async_job.is_done()
+        True
+    """
+
+    def __init__(
+        self,
+        query_id: str,
+        query: str,
+        session: "snowflake.snowpark.session.Session",
+        result_type: _AsyncResultType = _AsyncResultType.ROW,
+        post_actions: Optional[List["Query"]] = None,
+        action_id: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        #: The query id of the submitted query.
+        self.query_id: str = query_id
+        #: The SQL text of the submitted query.
+        self.query: str = query
+        self._session = session
+        self._result_type = result_type
+        self._post_actions = list(post_actions) if post_actions else []
+        self._post_actions_lock = threading.Lock()
+        self._action_id = action_id
+        self._kwargs = kwargs
+        self._has_result = False
+        self._result = None
+        # The post actions, e.g., dropping the temporary tables of large local
+        # relations, run once the query finishes or is canceled, whether or not its
+        # result is fetched.
+        finalizer = weakref.finalize(
+            self,
+            _run_post_actions_after_query,
+            session._conn,
+            query_id,
+            self._post_actions,
+            self._post_actions_lock,
+            **kwargs,
+        )
+        # the temporary objects are dropped with the session at exit
+        finalizer.atexit = False
+
+    def is_done(self) -> bool:
+        """Checks whether the query has finished, either successfully or not."""
+        if self._has_result:
+            return True
+        conn = self._session._conn._conn
+        done = not conn.is_still_running(conn.get_query_status(self.query_id))
+        if done:
+            self._run_post_actions()
+        return done
+
+    def cancel(self) -> None:
+        """Cancels the query if it's still running, and drops the temporary objects
+        created for it."""
+        self._session._conn.run_query(f"select SYSTEM$CANCEL_QUERY('{self.query_id}')")
+        self._run_post_actions()
+
+    def result(
+        self,
+    ) -> Union[List[Row], "pandas.DataFrame", int, None, Iterator]:
+        """Blocks until the query finishes and returns its result, which has the same
+        type as the result of the blocking action: a list of :class:`Row` objects for
+        :meth:`DataFrame.collect`, a Pandas DataFrame for :meth:`DataFrame.to_pandas`,
+        the number of rows for :meth:`DataFrame.count`, and ``None`` for
+        :meth:`DataFrameWriter.save_as_table`. The result is cached, so the query is
+        only fetched once.
+        """
+        if not self._has_result:
+            try:
+                self._result = self._fetch_result()
+                self._has_result = True
+            finally:
+                self._run_post_actions()
+        return self._result
+
+    async def result_async(
+        self,
+    ) -> Union[List[Row], "pandas.DataFrame", int, None, Iterator]:
+        """The coroutine version of :meth:`result`. The status of the query is polled
+        with increasing intervals while the event loop runs other tasks, so no thread
+        is blocked while the query runs. The result is fetched by a worker thread of
+        the default executor of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while not await loop.run_in_executor(None, self.is_done):
+            await asyncio.sleep(
+                QUERY_STATUS_POLL_DELAYS[
+                    min(attempt, len(QUERY_STATUS_POLL_DELAYS) - 1)
+                ]
+            )
+            attempt += 1
+        return await loop.run_in_executor(None, self.result)
+
+    def _fetch_result(
+        self,
+    ) -> Union[List[Row], "pandas.DataFrame", int, None, Iterator]:
+        conn = self._session._conn
+        try:
+            if self._result_type == _AsyncResultType.NO_RESULT:
+                conn.wait_for_query(self.query_id)
+                result_set, result_meta = None, None
+            else:
+                result_set, result_meta = conn.get_result_from_query_id(
+                    self.query_id,
+                    to_pandas=self._result_type
+                    in (_AsyncResultType.PANDAS, _AsyncResultType.PANDAS_BATCH),
+                    to_iter=self._result_type
+                    in (_AsyncResultType.ITERATOR, _AsyncResultType.PANDAS_BATCH),
+                )
+        except Exception:
+            if self._is_canceled():
+                raise SnowparkClientExceptionMessages.SERVER_QUERY_IS_CANCELLED()
+            raise
+        if self._is_canceled():
+            raise SnowparkClientExceptionMessages.SERVER_QUERY_IS_CANCELLED()
+        if self._result_type == _AsyncResultType.NO_RESULT:
+            return None
+        if self._result_type == _AsyncResultType.PANDAS:
+            if not isinstance(result_set, pandas.DataFrame):
+                raise SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_PANDAS(
+                    "to_pandas_nowait() did not return a Pandas DataFrame. The "
+                    "query of the DataFrame can only be a SELECT statement."
+                )
+            return result_set
+        if self._result_type == _AsyncResultType.PANDAS_BATCH:
+            return result_set
+        if self._result_type == _AsyncResultType.ITERATOR:
+            return result_set_to_iter(result_set, result_meta)
+        rows = result_set_to_rows(result_set, result_meta)
+        if self._result_type == _AsyncResultType.COUNT:
+            return rows[0][0]
+        return rows
+
+    def _is_canceled(self) -> bool:
+        # whether Session.cancel_all() was called after the query was submitted
+        return (
+            self._action_id is not None
+            and self._action_id < self._session._last_canceled_id
+        )
+
+    def _run_post_actions(self) -> None:
+        _run_post_actions(
+            self._session._conn,
+            self._post_actions,
+            self._post_actions_lock,
+            **self._kwargs,
+        )
@@ -209,6 +209,9 @@ class Column:
     This class has methods for the most frequently used column transformations and operators. Module :mod:`snowflake.snowpark.functions` defines many functions to transform columns.
     """
 
+    # a Column is created for every operation, like the expression it wraps
+    __slots__ = ("_expression",)
+
     def __init__(self, expr: Union[str, Expression]) -> None:
         if isinstance(expr, str):
             if expr == "*":
@@ -737,6 +740,8 @@ class CaseExpr(Column):
         [Row(CASE_WHEN_COLUMN=1), Row(CASE_WHEN_COLUMN=2), Row(CASE_WHEN_COLUMN=3)]
     """
 
+    __slots__ = ("_branches",)
+
     def __init__(self, expr: CaseWhen) -> None:
         super().__init__(expr)
         self._branches = expr.branches
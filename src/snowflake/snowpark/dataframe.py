@@ -2,16 +2,29 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
+import asyncio
 import copy
+import functools
 import itertools
 import re
 from collections import Counter
 from functools import cached_property
 from logging import getLogger
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import snowflake.snowpark
-from snowflake.connector.options import pandas
+from snowflake.connector.options import pandas, pyarrow
 from snowflake.snowpark._internal.analyzer.analyzer_utils import quote_name
 from snowflake.snowpark._internal.analyzer.binary_plan_node import (
     Cross,
@@ -33,6 +46,8 @@ from snowflake.snowpark._internal.analyzer.expression import (
     NamedExpression,
     Star,
 )
+from snowflake.snowpark._internal.analyzer.fingerprint import fingerprint
+from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlan
 from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
     CopyIntoTableNode,
     Limit,
@@ -75,11 +90,15 @@ from snowflake.snowpark._internal.utils import (
     column_to_bool,
     create_statement_query_tag,
     deprecate,
-    generate_random_alphanumeric,
+    deterministic_names,
+    generate_alphanumeric,
+    is_sql_select_statement,
     parse_positional_args_to_list,
+    prefetch,
     random_name_for_temp_object,
     validate_object_name,
 )
+from snowflake.snowpark.async_job import AsyncJob, _AsyncResultType, _iterate_async
 from snowflake.snowpark.column import Column, _to_col_if_sql_expr, _to_col_if_str
 from snowflake.snowpark.dataframe_na_functions import DataFrameNaFunctions
 from snowflake.snowpark.dataframe_stat_functions import DataFrameStatFunctions
@@ -106,15 +125,27 @@ from snowflake.snowpark.table_function import (
 )
 from snowflake.snowpark.types import StringType, StructType, _NumericType
 
+if TYPE_CHECKING:
+    import numpy
+
 _logger = getLogger(__name__)
 
+# The number of rows a worker thread fetches at a time for an asynchronous or
+# prefetching iterator
+_ASYNC_ITERATOR_BATCH_SIZE = 1000
+
 _ONE_MILLION = 1000000
 _NUM_PREFIX_DIGITS = 4
 _UNALIASED_REGEX = re.compile(f"""._[a-zA-Z0-9]{{{_NUM_PREFIX_DIGITS}}}_(.*)""")
 
 
-def _generate_prefix(prefix: str) -> str:
-    return f"{prefix}_{generate_random_alphanumeric(_NUM_PREFIX_DIGITS)}_"
+def _generate_prefix(
+    prefix: str, deterministic: bool = False, contents: Iterable[str] = ()
+) -> str:
+    # the prefix is derived from the column names it's generated for when
+    # deterministic names are enabled, see Session.deterministic_names_enabled
+    with deterministic_names(deterministic):
+        return f"{prefix}_{generate_alphanumeric(prefix, *contents, length=_NUM_PREFIX_DIGITS)}_"
 
 
 def _get_unaliased(col_name: str) -> List[str]:
@@ -164,8 +195,9 @@ def _disambiguate(
         # We use the session of the LHS DataFrame to report this telemetry
         lhs._session._conn._telemetry_client.send_alias_in_join_telemetry()
 
-    lhs_prefix = _generate_prefix("l")
-    rhs_prefix = _generate_prefix("r")
+    deterministic = lhs._session.deterministic_names_enabled
+    lhs_prefix = _generate_prefix("l", deterministic, lhs_names + rhs_names)
+    rhs_prefix = _generate_prefix("r", deterministic, lhs_names + rhs_names)
 
     lhs_remapped = lhs.select(
         [
@@ -410,7 +442,13 @@ class DataFrame:
         is_cached: bool = False,
     ) -> None:
         self._session = session
-        self._plan = session._analyzer.resolve(plan)
+        if session.lazy_analysis_enabled:
+            # defer resolution until an action or the schema needs the SnowflakePlan
+            self._unresolved_plan = plan
+            self._resolved_plan = None
+        else:
+            self._unresolved_plan = None
+            self._resolved_plan = session._analyzer.resolve(plan)
         self.is_cached: bool = is_cached  #: Whether it is a cached dataframe
 
         self._reader: Optional["snowflake.snowpark.DataFrameReader"] = None
@@ -428,23 +466,109 @@ class DataFrame:
         self.fillna = self._na.fill
         self.replace = self._na.replace
 
+    @property
+    def _plan(self) -> SnowflakePlan:
+        if self._resolved_plan is None:
+            self._resolved_plan = self._session._analyzer.resolve(self._unresolved_plan)
+            self._unresolved_plan = None
+        return self._resolved_plan
+
+    @property
+    def _logical_plan(self) -> LogicalPlan:
+        """The plan that DataFrames derived from this one use as their child.
+
+        It is the resolved :class:`SnowflakePlan` if this DataFrame has been resolved,
+        otherwise the unresolved logical plan, so building a chain of transformations
+        in lazy analysis mode doesn't resolve any intermediate DataFrame.
+        """
+        return (
+            self._resolved_plan
+            if self._resolved_plan is not None
+            else self._unresolved_plan
+        )
+
     @property
     def stat(self) -> DataFrameStatFunctions:
         return self._stat
 
     @df_action_telemetry
-    def collect(self) -> List["Row"]:
+    def collect(self, *, block: bool = True) -> Union[List["Row"], AsyncJob]:
         """Executes the query representing this DataFrame and returns the result as a
         list of :class:`Row` objects.
+
+        When the result exceeds :attr:`Session.result_spill_threshold`, it is returned
+        as a read-only sequence of :class:`Row` objects backed by a local file instead
+        of a list. It supports ``len()``, indexing, slicing and iteration, and can be
+        converted to a list with ``list()``.
+
+        Args:
+            block: A bool value indicating whether this function will wait until the
+                result is available. When it is ``False``, this function submits the
+                query and returns an :class:`AsyncJob` instead, see :meth:`collect_nowait`.
+        """
+        return self._internal_collect_with_tag(block=block)
+
+    @df_action_telemetry
+    def collect_nowait(self) -> AsyncJob:
+        """Submits the query representing this DataFrame without waiting for it to
+        finish, and returns an :class:`AsyncJob` whose :meth:`AsyncJob.result` is the
+        list of :class:`Row` objects :meth:`collect` returns.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> async_job = df.collect_nowait()
+            >>> async_job.result()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+        """
+        return self._internal_collect_with_tag(block=False)
+
+    @df_action_telemetry
+    async def collect_async(self) -> List[Row]:
+        """The coroutine version of :meth:`collect`, which doesn't block the event
+        loop or a thread while the query runs.
+
+        Example::
+
+            >>> import asyncio
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> asyncio.run(df.collect_async())
+            [Row(A=1, B=2), Row(A=3, B=4)]
         """
-        return self._internal_collect_with_tag()
+        return await self._execute_async(_AsyncResultType.ROW)
+
+    async def _execute_async(self, data_type: _AsyncResultType) -> Any:
+        # The queries are submitted by a worker thread, and the status of the last one
+        # is polled by the event loop until its result can be fetched.
+        kwargs = {}
+        if not self._session.query_tag:
+            kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(3)}
+        async_job = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                self._session._conn.execute,
+                self._plan,
+                to_pandas=data_type
+                in (_AsyncResultType.PANDAS, _AsyncResultType.PANDAS_BATCH),
+                block=False,
+                data_type=data_type,
+                **kwargs,
+            ),
+        )
+        return await async_job.result_async()
 
-    def _internal_collect_with_tag(self) -> List["Row"]:
+    def _internal_collect_with_tag(
+        self,
+        block: bool = True,
+        data_type: _AsyncResultType = _AsyncResultType.ROW,
+    ) -> Union[List["Row"], AsyncJob]:
         # When executing a DataFrame in any method of snowpark (either public or private),
         # we should always call this method instead of collect(), to make sure the
         # query tag is set properly.
         return self._session._conn.execute(
             self._plan,
+            block=block,
+            data_type=data_type,
             _statement_params={"QUERY_TAG": create_statement_query_tag(3)}
             if not self._session.query_tag
             else None,
@@ -466,25 +590,73 @@ class DataFrame:
             Row(PRODUCT_ID='id1', AMOUNT=Decimal('10.00'))
             Row(PRODUCT_ID='id2', AMOUNT=Decimal('20.00'))
         """
-        yield from self._session._conn.execute(
-            self._plan,
-            to_iter=True,
-            _statement_params={"QUERY_TAG": create_statement_query_tag(3)}
-            if not self._session.query_tag
-            else None,
+        yield from prefetch(
+            self._session._conn.execute(
+                self._plan,
+                to_iter=True,
+                _statement_params={"QUERY_TAG": create_statement_query_tag(3)}
+                if not self._session.query_tag
+                else None,
+            ),
+            self._session.result_prefetch_depth,
+            _ASYNC_ITERATOR_BATCH_SIZE,
         )
 
+    @df_action_telemetry
+    async def to_local_iterator_async(self) -> AsyncIterator[Row]:
+        """The asynchronous iterator version of :meth:`to_local_iterator`, which
+        doesn't block the event loop or a thread while the query runs or while the
+        result is downloaded.
+
+        Example::
+
+            >>> import asyncio
+            >>> async def print_rows(df):
+            ...     async for row in df.to_local_iterator_async():
+            ...         print(row)
+            >>> asyncio.run(print_rows(session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])))
+            Row(A=1, B=2)
+            Row(A=3, B=4)
+        """
+        rows = await self._execute_async(_AsyncResultType.ITERATOR)
+        async for row in _iterate_async(rows, _ASYNC_ITERATOR_BATCH_SIZE):
+            yield row
+
     def __copy__(self) -> "DataFrame":
         return DataFrame(self._session, copy.copy(self._plan))
 
     @df_action_telemetry
-    def to_pandas(self, **kwargs) -> "pandas.DataFrame":
+    def to_pandas(
+        self, *, block: bool = True, max_workers: Optional[int] = None, **kwargs
+    ) -> Union["pandas.DataFrame", AsyncJob]:
         """
         Executes the query representing this DataFrame and returns the result as a
         `Pandas DataFrame <https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.html>`_.
 
         When the data is too large to fit into memory, you can use :meth:`to_pandas_batches`.
 
+        Args:
+            block: A bool value indicating whether this function will wait until the
+                result is available. When it is ``False``, this function submits the
+                query and returns an :class:`AsyncJob` instead, see
+                :meth:`to_pandas_nowait`.
+            max_workers: The number of threads that download the chunks of the result
+                and convert them to Pandas DataFrames concurrently. At most
+                ``2 * max_workers`` chunks are downloaded ahead of the chunks that are
+                collected, so the peak memory is about twice the size of the result as
+                DataFrames plus that many chunks. The converted chunks are concatenated
+                with one copy. By default,
+                the chunks are fetched and converted by the connector one after another.
+                It's ignored when ``block`` is ``False``.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.to_pandas(max_workers=4)
+               A  B
+            0  1  2
+            1  3  4
+
         Note:
             1. This method is only available if Pandas is installed and available.
 
@@ -493,7 +665,16 @@ class DataFrame:
         """
         if not self._session.query_tag:
             kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
-        result = self._session._conn.execute(self._plan, to_pandas=True, **kwargs)
+        result = self._session._conn.execute(
+            self._plan,
+            to_pandas=True,
+            block=block,
+            data_type=_AsyncResultType.PANDAS,
+            max_workers=max_workers,
+            **kwargs,
+        )
+        if not block:
+            return result
 
         # if the returned result is not a pandas dataframe, raise Exception
         # this might happen when calling this method with non-select commands
@@ -509,6 +690,48 @@ class DataFrame:
 
         return result
 
+    @df_action_telemetry
+    async def to_pandas_async(self) -> "pandas.DataFrame":
+        """The coroutine version of :meth:`to_pandas`, which doesn't block the event
+        loop or a thread while the query runs.
+
+        Example::
+
+            >>> import asyncio
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> asyncio.run(df.to_pandas_async())
+               A  B
+            0  1  2
+            1  3  4
+        """
+        return await self._execute_async(_AsyncResultType.PANDAS)
+
+    @df_action_telemetry
+    def to_pandas_nowait(self) -> AsyncJob:
+        """Submits the query representing this DataFrame without waiting for it to
+        finish, and returns an :class:`AsyncJob` whose :meth:`AsyncJob.result` is the
+        Pandas DataFrame :meth:`to_pandas` returns.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> async_job = df.to_pandas_nowait()
+            >>> async_job.result()
+               A  B
+            0  1  2
+            1  3  4
+        """
+        kwargs = {}
+        if not self._session.query_tag:
+            kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
+        return self._session._conn.execute(
+            self._plan,
+            to_pandas=True,
+            block=False,
+            data_type=_AsyncResultType.PANDAS,
+            **kwargs,
+        )
+
     @df_action_telemetry
     def to_pandas_batches(self, **kwargs) -> Iterator["pandas.DataFrame"]:
         """
@@ -537,10 +760,157 @@ class DataFrame:
         """
         if not self._session.query_tag:
             kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
-        yield from self._session._conn.execute(
-            self._plan, to_pandas=True, to_iter=True, **kwargs
+        yield from prefetch(
+            self._session._conn.execute(
+                self._plan, to_pandas=True, to_iter=True, **kwargs
+            ),
+            self._session.result_prefetch_depth,
         )
 
+    @df_action_telemetry
+    def to_arrow(self, **kwargs) -> "pyarrow.Table":
+        """
+        Executes the query representing this DataFrame and returns the result as a
+        `PyArrow Table <https://arrow.apache.org/docs/python/generated/pyarrow.Table.html>`_.
+
+        The Arrow data fetched by the connector is returned without converting it to
+        Python objects or Pandas. Only the integer columns fetched as decimals are cast
+        to ``int64``. When the data is too large to fit into memory, you can use
+        :meth:`to_arrow_batches`.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.to_arrow().to_pydict()
+            {'A': [1, 3], 'B': [2, 4]}
+
+        Note:
+            1. This method is only available if PyArrow is installed and available.
+
+            2. If you use :func:`Session.sql` with this method, the input query of
+            :func:`Session.sql` can only be a SELECT statement.
+        """
+        if not self._session.query_tag:
+            kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
+        result = self._session._conn.execute(self._plan, to_arrow=True, **kwargs)
+
+        # if the returned result is not an Arrow Table, raise Exception
+        # this might happen when calling this method with non-select commands
+        if not isinstance(result, pyarrow.Table):
+            raise SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_ARROW(
+                "to_arrow() did not return an Arrow Table. "
+                "If you use session.sql(...).to_arrow(), the input query can only be a "
+                "SELECT statement. Or you can use session.sql(...).collect() to get a "
+                "list of Row objects for a non-SELECT statement."
+            )
+
+        return result
+
+    @df_action_telemetry
+    def to_arrow_batches(self, **kwargs) -> Iterator["pyarrow.Table"]:
+        """
+        Executes the query representing this DataFrame and returns an iterator of
+        `PyArrow Tables <https://arrow.apache.org/docs/python/generated/pyarrow.Table.html>`_
+        (containing a subset of rows) that you can use to retrieve the results.
+
+        Unlike :meth:`to_arrow`, this method does not load all data into memory
+        at once.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> for table in df.to_arrow_batches():
+            ...     print(table.to_pydict())
+            {'A': [1, 3], 'B': [2, 4]}
+
+        Note:
+            1. This method is only available if PyArrow is installed and available.
+
+            2. If you use :func:`Session.sql` with this method, the input query of
+            :func:`Session.sql` can only be a SELECT statement.
+        """
+        if not self._session.query_tag:
+            kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
+        yield from prefetch(
+            self._session._conn.execute(
+                self._plan, to_arrow=True, to_iter=True, **kwargs
+            ),
+            self._session.result_prefetch_depth,
+        )
+
+    @df_action_telemetry
+    def collect_columns(self, **kwargs) -> Dict[str, "numpy.ndarray"]:
+        """
+        Executes the query representing this DataFrame and returns the result as a
+        dict that maps each column name to a `NumPy array <https://numpy.org/doc/stable/reference/generated/numpy.ndarray.html>`_
+        of its values.
+
+        The arrays are built from the Arrow data fetched by the connector, without
+        creating a :class:`Row` or a Python object per value of a numeric column. The
+        dtype of an array is determined by the type of the column:
+
+            - ``int64`` for ``NUMBER`` columns with a scale of 0, and ``float64`` for
+              the other ``NUMBER`` columns and ``FLOAT`` columns.
+            - ``bool`` for ``BOOLEAN`` columns.
+            - ``datetime64[D]`` for ``DATE`` columns and ``datetime64[ns]`` for
+              ``TIMESTAMP`` columns, whose values are in UTC if they have a time zone.
+            - ``object`` for the other columns, e.g., text and semi-structured columns.
+
+        A column with null values is returned as a `masked array <https://numpy.org/doc/stable/reference/maskedarray.html>`_
+        whose mask is ``True`` for the null values.
+
+        Example::
+
+            >>> df = session.create_dataframe([[1, 2.5], [3, None]], schema=["a", "b"])
+            >>> columns = df.collect_columns()
+            >>> columns["A"]
+            array([1, 3])
+            >>> columns["B"].mask.tolist()
+            [False, True]
+
+        Note:
+            1. This method is only available if PyArrow is installed and available.
+
+            2. If you use :func:`Session.sql` with this method, the input query of
+            :func:`Session.sql` can only be a SELECT statement.
+
+            3. If the DataFrame has duplicate column names, the first column of a name
+            is returned.
+        """
+        if not self._session.query_tag:
+            kwargs["_statement_params"] = {"QUERY_TAG": create_statement_query_tag(2)}
+        result = self._session._conn.execute(self._plan, to_numpy=True, **kwargs)
+
+        if not isinstance(result, dict):
+            raise SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_ARROW(
+                "collect_columns() did not return NumPy arrays. "
+                "If you use session.sql(...).collect_columns(), the input query can "
+                "only be a SELECT statement."
+            )
+
+        return result
+
+    @df_action_telemetry
+    async def to_pandas_batches_async(self) -> AsyncIterator["pandas.DataFrame"]:
+        """The asynchronous iterator version of :meth:`to_pandas_batches`, which
+        doesn't block the event loop or a thread while the query runs or while the
+        batches are downloaded.
+
+        Example::
+
+            >>> import asyncio
+            >>> async def print_batches(df):
+            ...     async for pandas_df in df.to_pandas_batches_async():
+            ...         print(pandas_df)
+            >>> asyncio.run(print_batches(session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])))
+               A  B
+            0  1  2
+            1  3  4
+        """
+        batches = await self._execute_async(_AsyncResultType.PANDAS_BATCH)
+        async for batch in _iterate_async(batches):
+            yield batch
+
     def to_df(self, *names: Union[str, Iterable[str]]) -> "DataFrame":
         """
         Creates a new DataFrame containing columns with the specified names.
@@ -664,7 +1034,7 @@ class DataFrame:
                     "The input of select() must be Column, column name, or a list of them"
                 )
 
-        return self._with_plan(Project(names, self._plan))
+        return self._with_plan(Project(names, self._logical_plan))
 
     def select_expr(self, *exprs: Union[str, Iterable[str]]) -> "DataFrame":
         """
@@ -778,7 +1148,7 @@ class DataFrame:
         return self._with_plan(
             Filter(
                 _to_col_if_sql_expr(expr, "filter/where")._expression,
-                self._plan,
+                self._logical_plan,
             )
         )
 
@@ -870,7 +1240,7 @@ class DataFrame:
                     SortOrder(exprs[idx], orders[idx] if orders else Ascending())
                 )
 
-        return self._with_plan(Sort(sort_exprs, True, self._plan))
+        return self._with_plan(Sort(sort_exprs, True, self._logical_plan))
 
     def agg(
         self,
@@ -1122,7 +1492,8 @@ class DataFrame:
         rownum = row_number().over(
             snowflake.snowpark.Window.partition_by(*filter_cols).order_by(*filter_cols)
         )
-        rownum_name = generate_random_alphanumeric()
+        with deterministic_names(self._session.deterministic_names_enabled):
+            rownum_name = generate_alphanumeric(*self.columns)
         return (
             self.select(*output_cols, rownum.as_(rownum_name))
             .where(col(rownum_name) == 1)
@@ -1209,7 +1580,7 @@ class DataFrame:
         """
         column_exprs = self._convert_cols_to_exprs("unpivot()", column_list)
         return self._with_plan(
-            Unpivot(value_column, name_column, column_exprs, self._plan)
+            Unpivot(value_column, name_column, column_exprs, self._logical_plan)
         )
 
     def limit(self, n: int) -> "DataFrame":
@@ -1221,7 +1592,7 @@ class DataFrame:
         Args:
             n: Number of rows to return.
         """
-        return self._with_plan(Limit(Literal(n), self._plan))
+        return self._with_plan(Limit(Literal(n), self._logical_plan))
 
     def union(self, other: "DataFrame") -> "DataFrame":
         """Returns a new DataFrame that contains all the rows in the current DataFrame
@@ -1244,7 +1615,9 @@ class DataFrame:
         Args:
             other: the other :class:`DataFrame` that contains the rows to include.
         """
-        return self._with_plan(UnionPlan(self._plan, other._plan, is_all=False))
+        return self._with_plan(
+            UnionPlan(self._logical_plan, other._logical_plan, is_all=False)
+        )
 
     def union_all(self, other: "DataFrame") -> "DataFrame":
         """Returns a new DataFrame that contains all the rows in the current DataFrame
@@ -1269,7 +1642,9 @@ class DataFrame:
         Args:
             other: the other :class:`DataFrame` that contains the rows to include.
         """
-        return self._with_plan(UnionPlan(self._plan, other._plan, is_all=True))
+        return self._with_plan(
+            UnionPlan(self._logical_plan, other._logical_plan, is_all=True)
+        )
 
     @df_usage_telemetry
     def union_by_name(self, other: "DataFrame") -> "DataFrame":
@@ -1351,10 +1726,12 @@ class DataFrame:
         ]
 
         right_child = self._with_plan(
-            Project(right_project_list + not_found_attrs, other._plan)
+            Project(right_project_list + not_found_attrs, other._logical_plan)
         )
 
-        return self._with_plan(UnionPlan(self._plan, right_child._plan, is_all))
+        return self._with_plan(
+            UnionPlan(self._logical_plan, right_child._logical_plan, is_all)
+        )
 
     def intersect(self, other: "DataFrame") -> "DataFrame":
         """Returns a new DataFrame that contains the intersection of rows from the
@@ -1377,7 +1754,7 @@ class DataFrame:
             other: the other :class:`DataFrame` that contains the rows to use for the
                 intersection.
         """
-        return self._with_plan(Intersect(self._plan, other._plan))
+        return self._with_plan(Intersect(self._logical_plan, other._logical_plan))
 
     def except_(self, other: "DataFrame") -> "DataFrame":
         """Returns a new DataFrame that contains all the rows from the current DataFrame
@@ -1400,7 +1777,7 @@ class DataFrame:
         Args:
             other: The :class:`DataFrame` that contains the rows to exclude.
         """
-        return self._with_plan(Except(self._plan, other._plan))
+        return self._with_plan(Except(self._logical_plan, other._logical_plan))
 
     def natural_join(
         self, right: "DataFrame", join_type: Optional[str] = None
@@ -1439,8 +1816,8 @@ class DataFrame:
         join_type = join_type or "inner"
         return self._with_plan(
             Join(
-                self._plan,
-                right._plan,
+                self._logical_plan,
+                right._logical_plan,
                 NaturalJoin(create_join_type(join_type)),
                 None,
             )
@@ -1546,7 +1923,7 @@ class DataFrame:
             <BLANKLINE>
         """
         if isinstance(right, DataFrame):
-            if self is right or self._plan is right._plan:
+            if self is right or self._logical_plan is right._logical_plan:
                 raise SnowparkClientExceptionMessages.DF_SELF_JOIN_NOT_SUPPORTED()
 
             if isinstance(join_type, Cross) or (
@@ -1661,7 +2038,9 @@ class DataFrame:
         func_expr = _create_table_function_expression(
             func, *func_arguments, **func_named_arguments
         )
-        return DataFrame(self._session, TableFunctionJoin(self._plan, func_expr))
+        return DataFrame(
+            self._session, TableFunctionJoin(self._logical_plan, func_expr)
+        )
 
     def cross_join(self, right: "DataFrame") -> "DataFrame":
         """Performs a cross join, which returns the Cartesian product of the current
@@ -1714,8 +2093,8 @@ class DataFrame:
             lhs, rhs = _disambiguate(self, right, join_type, using_columns)
             return self._with_plan(
                 Join(
-                    lhs._plan,
-                    rhs._plan,
+                    lhs._logical_plan,
+                    rhs._logical_plan,
                     UsingJoin(join_type, using_columns),
                     None,
                 )
@@ -1728,8 +2107,8 @@ class DataFrame:
         expression = join_exprs._expression if join_exprs is not None else None
         return self._with_plan(
             Join(
-                lhs._plan,
-                rhs._plan,
+                lhs._logical_plan,
+                rhs._logical_plan,
                 join_type,
                 expression,
             )
@@ -1813,11 +2192,22 @@ class DataFrame:
         return self.select([*old_cols, *new_cols])
 
     @df_action_telemetry
-    def count(self) -> int:
+    def count(self, *, block: bool = True) -> Union[int, AsyncJob]:
         """Executes the query representing this DataFrame and returns the number of
         rows in the result (similar to the COUNT function in SQL).
+
+        Args:
+            block: A bool value indicating whether this function will wait until the
+                result is available. When it is ``False``, this function submits the
+                query and returns an :class:`AsyncJob` whose result is the number of
+                rows.
         """
-        return self.agg(("*", "count"))._internal_collect_with_tag()[0][0]
+        df = self.agg(("*", "count"))
+        if not block:
+            return df._internal_collect_with_tag(
+                block=False, data_type=_AsyncResultType.COUNT
+            )
+        return df._internal_collect_with_tag()[0][0]
 
     @property
     def write(self) -> DataFrameWriter:
@@ -1853,8 +2243,9 @@ class DataFrame:
         target_columns: Optional[Iterable[str]] = None,
         transformations: Optional[Iterable[ColumnOrName]] = None,
         format_type_options: Optional[Dict[str, Any]] = None,
+        block: bool = True,
         **copy_options: Any,
-    ) -> List[Row]:
+    ) -> Union[List[Row], AsyncJob]:
         """Executes a `COPY INTO <table> <https://docs.snowflake.com/en/sql-reference/sql/copy-into-table.html>`__ command to load data from files in a stage location into a specified table.
 
         It returns the load result described in `OUTPUT section of the COPY INTO <table> command <https://docs.snowflake.com/en/sql-reference/sql/copy-into-table.html#output>`__.
@@ -1904,6 +2295,9 @@ class DataFrame:
             target_columns: Name of the columns in the table where the data should be saved.
             transformations: A list of column transformations.
             format_type_options: A dict that contains the ``formatTypeOptions`` of the ``COPY INTO <table>`` command.
+            block: A bool value indicating whether this function will wait until the
+                load result is available. When it is ``False``, this function submits
+                the ``COPY INTO <table>`` command and returns an :class:`AsyncJob`.
             copy_options: The kwargs that is used to specify the ``copyOptions`` of the ``COPY INTO <table>`` command.
         """
         if not self._reader or not self._reader._file_path:
@@ -1982,7 +2376,7 @@ class DataFrame:
                 cur_options=self._reader._cur_options,
                 create_table_from_infer_schema=create_table_from_infer_schema,
             ),
-        )._internal_collect_with_tag()
+        )._internal_collect_with_tag(block=block)
 
     @df_action_telemetry
     def show(self, n: int = 10, max_width: int = 50) -> None:
@@ -2091,20 +2485,20 @@ class DataFrame:
         ]
         common_col_names = [k for k, v in Counter(result_columns).items() if v > 1]
         if len(common_col_names) == 0:
-            return DataFrame(self._session, Lateral(self._plan, table_function))
-        prefix = _generate_prefix("a")
+            return DataFrame(self._session, Lateral(self._logical_plan, table_function))
+        prefix = _generate_prefix(
+            "a", self._session.deterministic_names_enabled, result_columns
+        )
         child = self.select(
             [
                 _alias_if_needed(self, attr.name, prefix, common_col_names)
                 for attr in self._output
             ]
         )
-        return DataFrame(self._session, Lateral(child._plan, table_function))
+        return DataFrame(self._session, Lateral(child._logical_plan, table_function))
 
     def _show_string(self, n: int = 10, max_width: int = 50, **kwargs) -> str:
-        query = self._plan.queries[-1].sql.strip().lower()
-
-        if query.startswith("select"):
+        if is_sql_select_statement(self._plan.queries[-1].sql):
             result, meta = self._session._conn.get_result_and_metadata(
                 self.limit(n)._plan, **kwargs
             )
@@ -2248,7 +2642,7 @@ class DataFrame:
         cmd = CreateViewCommand(
             view_name,
             view_type,
-            self._plan,
+            self._logical_plan,
         )
 
         return self._session._conn.execute(
@@ -2292,7 +2686,7 @@ class DataFrame:
         """
         DataFrame._validate_sample_input(frac, n)
         return self._with_plan(
-            Sample(self._plan, probability_fraction=frac, row_count=n)
+            Sample(self._logical_plan, probability_fraction=frac, row_count=n)
         )
 
     @staticmethod
@@ -2487,18 +2881,28 @@ class DataFrame:
         Returns:
              A :class:`DataFrame` object that holds the cached result in a temporary table.
              All operations on this new DataFrame have no effect on the original.
+
+        Note:
+            The temporary table is created by one ``CREATE TABLE ... AS SELECT``
+            statement, and every call takes a new snapshot by default. If
+            :attr:`Session.cache_result_reuse_enabled` is ``True``, caching a
+            DataFrame of deterministic ``SELECT`` queries that has the same
+            :attr:`fingerprint` as a DataFrame cached before in the same context
+            (role, warehouse, database and schema) reuses the snapshot taken then,
+            i.e., returns a DataFrame of the same table, unless a table named in its
+            SQL has been changed by this session since then. Changes made by other
+            sessions, or to the tables read by views and UDFs, don't take a new
+            snapshot. The table is dropped when the session ends, or, if
+            :attr:`Session.cache_result_auto_drop_enabled` is ``True``, when neither
+            the returned DataFrames nor any DataFrame derived from them are referenced
+            anymore.
         """
-        temp_table_name = random_name_for_temp_object(TempObjectType.TABLE)
-        create_temp_table = self._session._plan_builder.create_temp_table(
-            temp_table_name, self._plan
-        )
-        self._session._conn.execute(
-            create_temp_table,
+        new_plan = self._session._materializations.cache(
+            self._plan,
             _statement_params={"QUERY_TAG": create_statement_query_tag(2)}
             if not self._session.query_tag
             else None,
         )
-        new_plan = self._session.table(temp_table_name)._plan
         return DataFrame(session=self._session, plan=new_plan, is_cached=True)
 
     @df_action_telemetry
@@ -2576,6 +2980,31 @@ class DataFrame:
             "post_actions": [query.sql.strip() for query in self._plan.post_actions],
         }
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """
+        A hash of the structure of the plan of this DataFrame, which is the same for
+        DataFrames that describe the same computation, even if they are built
+        separately. The random IDs of columns and the names generated for the SQL
+        queries, e.g., the aliases of the columns of a join, don't affect it, and it
+        doesn't depend on whether the DataFrame is analyzed lazily.
+
+        The fingerprint doesn't reflect the data a DataFrame reads: tables are
+        referred to by their names, so it doesn't change when a table is changed,
+        and the result of :meth:`cache_result` has a different fingerprint from the
+        DataFrame it's cached from. Computing it doesn't execute any query.
+
+        Example::
+
+            >>> df1 = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df2 = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df1.filter(col("a") > 1).fingerprint == df2.filter(col("a") > 1).fingerprint
+            True
+            >>> df1.filter(col("a") > 1).fingerprint == df1.filter(col("a") > 2).fingerprint
+            False
+        """
+        return fingerprint(self._logical_plan)
+
     def explain(self) -> None:
         """
         Prints the list of queries that will be executed to evaluate this DataFrame.
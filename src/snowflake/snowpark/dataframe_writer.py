@@ -17,6 +17,7 @@ from snowflake.snowpark._internal.utils import (
     str_to_enum,
     validate_object_name,
 )
+from snowflake.snowpark.async_job import AsyncJob, _AsyncResultType
 from snowflake.snowpark.column import Column
 from snowflake.snowpark.functions import sql_expr
 from snowflake.snowpark.row import Row
@@ -68,7 +69,8 @@ class DataFrameWriter:
         *,
         mode: Optional[str] = None,
         create_temp_table: bool = False,
-    ) -> None:
+        block: bool = True,
+    ) -> Optional[AsyncJob]:
         """Writes the data to the specified table in a Snowflake database.
 
         Args:
@@ -86,6 +88,9 @@ class DataFrameWriter:
                 "ignore": Ignore this operation if data already exists.
 
             create_temp_table: The to-be-created table will be temporary if this is set to ``True``.
+            block: A bool value indicating whether this function will wait until the
+                table is written. When it is ``False``, this function submits the query
+                and returns an :class:`AsyncJob` whose result is ``None``.
 
         Examples::
 
@@ -107,12 +112,15 @@ class DataFrameWriter:
         create_table_logic_plan = SnowflakeCreateTable(
             full_table_name,
             save_mode,
-            self._dataframe._plan,
+            self._dataframe._logical_plan,
             create_temp_table,
         )
         session = self._dataframe._session
         snowflake_plan = session._analyzer.resolve(create_table_logic_plan)
-        session._conn.execute(snowflake_plan)
+        result = session._conn.execute(
+            snowflake_plan, block=block, data_type=_AsyncResultType.NO_RESULT
+        )
+        return result if not block else None
 
     def copy_into_location(
         self,
@@ -172,7 +180,7 @@ class DataFrameWriter:
             )
         return self._dataframe._with_plan(
             CopyIntoLocationNode(
-                self._dataframe._plan,
+                self._dataframe._logical_plan,
                 stage_location,
                 partition_by=partition_by,
                 file_format_name=file_format_name,
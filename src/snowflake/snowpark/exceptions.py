@@ -225,7 +225,7 @@ class SnowparkQueryCancelledException(SnowparkServerException):
 class SnowparkFetchDataException(SnowparkServerException):
     """Exception for when we are trying to fetch data from Snowflake.
 
-    Includes error codes: 1406.
+    Includes error codes: 1406, 1412.
     """
 
     pass
@@ -152,7 +152,7 @@ class RelationalGroupedDataFrame:
         if isinstance(self._group_type, _GroupByType):
             return DataFrame(
                 self._df._session,
-                Aggregate(self._grouping_exprs, aliased_agg, self._df._plan),
+                Aggregate(self._grouping_exprs, aliased_agg, self._df._logical_plan),
             )
         if isinstance(self._group_type, _RollupType):
             return DataFrame(
@@ -160,13 +160,15 @@ class RelationalGroupedDataFrame:
                 Aggregate(
                     [Rollup(self._grouping_exprs)],
                     aliased_agg,
-                    self._df._plan,
+                    self._df._logical_plan,
                 ),
             )
         if isinstance(self._group_type, _CubeType):
             return DataFrame(
                 self._df._session,
-                Aggregate([Cube(self._grouping_exprs)], aliased_agg, self._df._plan),
+                Aggregate(
+                    [Cube(self._grouping_exprs)], aliased_agg, self._df._logical_plan
+                ),
             )
         if isinstance(self._group_type, _PivotType):
             if len(agg_exprs) != 1:
@@ -177,7 +179,7 @@ class RelationalGroupedDataFrame:
                     self._group_type.pivot_col,
                     self._group_type.values,
                     agg_exprs,
-                    self._df._plan,
+                    self._df._logical_plan,
                 ),
             )
 
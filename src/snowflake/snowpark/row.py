@@ -2,7 +2,11 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
-from typing import Any, Dict, Iterable, Union
+import functools
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, Union
+
+# The number of distinct lists of fields whose row classes are kept
+_MAX_ROW_SCHEMAS = 1024
 
 
 def _restore_row_from_pickle(values, named_values, fields):
@@ -14,6 +18,36 @@ def _restore_row_from_pickle(values, named_values, fields):
     return row
 
 
+class _RowSchema:
+    """The fields of a row and the index of the first occurrence of each of them. It's
+    shared by all rows with the same fields, e.g., the rows of a result set."""
+
+    __slots__ = ("fields", "indices", "has_duplicates")
+
+    def __init__(self, fields: Tuple[str, ...]) -> None:
+        self.fields = fields
+        self.indices: Dict[str, int] = {}
+        for i, field in enumerate(fields):
+            self.indices.setdefault(field, i)
+        self.has_duplicates = len(self.indices) != len(fields)
+
+
+@functools.lru_cache(maxsize=_MAX_ROW_SCHEMAS)
+def _row_class(fields: Tuple[str, ...]) -> Type["Row"]:
+    # Rows with the same fields are instances of the same subclass of Row, which holds
+    # their schema, so a row takes no more memory than a plain tuple.
+    return type(
+        Row.__name__,
+        (Row,),
+        {
+            "__slots__": (),
+            "__module__": Row.__module__,
+            "__qualname__": Row.__qualname__,
+            "_schema": _RowSchema(fields),
+        },
+    )
+
+
 class Row(tuple):
     """Represents a row in :class:`DataFrame`.
 
@@ -50,28 +84,49 @@ class Row(tuple):
 
     """
 
+    __slots__ = ()
+
+    # The schema shared by the rows with the same fields, or None if there are no fields
+    _schema: Optional[_RowSchema] = None
+
     def __new__(cls, *values: Any, **named_values: Any):
         if values and named_values:
             raise ValueError("Either values or named_values is required but not both.")
         if named_values:
             # After py3.7, dict is ordered(not sorted) by item insertion sequence.
             # If we support 3.6 or older someday, this implementation needs changing.
-            row = tuple.__new__(cls, tuple(named_values.values()))
-            row.__dict__["_named_values"] = named_values
-            row.__dict__["_fields"] = tuple(named_values.keys())
-        else:
-            row = tuple.__new__(cls, values)
-            row.__dict__["_named_values"] = None
-            row.__dict__["_fields"] = None
-
-        # _fields is for internal use only. Users shouldn't set this attribute.
-        # It contains a list of str representing column names. It also allows duplicates.
-        # snowflake DB can return duplicate column names, for instance, "select a, a from a_table."
-        # When return a DataFrame from a sql, duplicate column names can happen.
-        # But using duplicate column names is obviously a bad practice even though we allow it.
-        # It's value is assigned in __setattr__ if internal code assign value explicitly.
-        row.__dict__["_has_duplicates"] = None
-        return row
+            return tuple.__new__(
+                _row_class(tuple(named_values.keys())), tuple(named_values.values())
+            )
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def _with_fields(cls, fields: Iterable[str]) -> Type["Row"]:
+        """Returns the class of the rows with the given fields, which are shared by all
+        its instances. Its ``_make`` method creates a row from an iterable of values."""
+        return _row_class(tuple(fields))
+
+    @classmethod
+    def _make(cls, values: Iterable[Any]) -> "Row":
+        return tuple.__new__(cls, values)
+
+    # _fields is for internal use only. Users shouldn't set this attribute.
+    # It contains a list of str representing column names. It also allows duplicates.
+    # snowflake DB can return duplicate column names, for instance, "select a, a from a_table."
+    # When return a DataFrame from a sql, duplicate column names can happen.
+    # But using duplicate column names is obviously a bad practice even though we allow it.
+    # It's value is assigned in __setattr__ if internal code assign value explicitly.
+    @property
+    def _fields(self) -> Optional[Tuple[str, ...]]:
+        return self._schema.fields if self._schema else None
+
+    @property
+    def _named_values(self) -> Optional[Dict[str, Any]]:
+        # the field-value pairs, or None if there are no fields or they have duplicates
+        schema = self._schema
+        if schema is None or schema.has_duplicates:
+            return None
+        return dict(zip(schema.fields, self))
 
     def __getitem__(self, item: Union[int, str, slice]):
         if isinstance(item, int):
@@ -79,50 +134,29 @@ class Row(tuple):
         elif isinstance(item, slice):
             return Row(*super().__getitem__(item))
         else:  # str
-            self._populate_named_values_from_fields()
-            # get from _named_values first
-            if self._named_values:
-                return self._named_values[item]
-            # we have duplicated fields and _named_values is not populated,
-            # so indexing fields
-            elif self._fields and self._check_if_having_duplicates():
-                try:
-                    index = self._fields.index(item)  # may throw ValueError
-                    return super().__getitem__(index)  # may throw IndexError
-                except (IndexError, ValueError):
-                    raise KeyError(item)
-            # no column names/keys/fields
-            else:
+            index = self._index_of(item)
+            if index is None:
                 raise KeyError(item)
+            return super().__getitem__(index)
 
     def __setitem__(self, key, value):
         raise TypeError("Row object does not support item assignment")
 
     def __getattr__(self, item):
-        self._populate_named_values_from_fields()
-        if self._named_values and item in self._named_values:
-            return self._named_values[item]
-        elif self._fields and self._check_if_having_duplicates():
-            try:
-                index = self._fields.index(item)  # may throw ValueError
-                return self[index]  # may throw IndexError
-            except (IndexError, ValueError):
-                raise AttributeError(f"Row object has no attribute {item}")
-        else:
+        index = self._index_of(item)
+        if index is None:
             raise AttributeError(f"Row object has no attribute {item}")
+        return tuple.__getitem__(self, index)
 
     def __setattr__(self, key, value):
         if key != "_fields":
             raise AttributeError("Can't set attribute to Row object")
         if value is not None:
-            self.__dict__["_fields"] = value
+            object.__setattr__(self, "__class__", _row_class(tuple(value)))
 
     def __contains__(self, item):
-        self._populate_named_values_from_fields()
-        if self._named_values:
-            return item in self._named_values
-        elif self._fields:
-            return item in self._fields
+        if self._schema:
+            return self._index_of(item) is not None
         else:
             return super().__contains__(item)
 
@@ -134,22 +168,21 @@ class Row(tuple):
             )
         elif args and len(args) != len(self):
             raise ValueError(f"{len(self)} values are expected.")
-        self._populate_named_values_from_fields()
-        if self._named_values:
+        named_values = self._named_values
+        if named_values:
             if args:
                 raise ValueError(
                     "The Row object can't be called with a list of values"
                     "because it already has fields and values."
                 )
-            new_row = Row(**self._named_values)
             for input_key, input_value in kwargs.items():
-                if input_key not in self._named_values:
+                if input_key not in named_values:
                     raise ValueError(
                         f"Wrong keyword argument {input_key} for Row f{self}"
                     )
-                new_row._named_values[input_key] = input_value
-            return new_row
-        elif self._fields and self._check_if_having_duplicates():
+                named_values[input_key] = input_value
+            return Row(**named_values)
+        elif self._schema and self._schema.has_duplicates:
             raise ValueError(
                 "The Row object can't be called because it has duplicate fields"
             )
@@ -168,25 +201,19 @@ class Row(tuple):
             return Row(**{k: v for k, v in zip(self, args)})
 
     def __copy__(self):
-        return _restore_row_from_pickle(self, self._named_values, self._fields)
+        return tuple.__new__(type(self), tuple(self))
 
     def __repr__(self):
         if self._fields:
             return "Row({})".format(
                 ", ".join(f"{k}={v!r}" for k, v in zip(self._fields, self))
             )
-        elif self._named_values:
-            return "Row({})".format(
-                ", ".join(f"{k}={v!r}" for k, v in self._named_values.items())
-            )
         else:
             return "Row({})".format(", ".join(f"{v!r}" for v in self))
 
     def __reduce__(self):
-        return (
-            _restore_row_from_pickle,
-            (tuple(self), self._named_values, self._fields),
-        )
+        # The fields are enough to restore the named values, so they aren't pickled.
+        return (_restore_row_from_pickle, (tuple(self), None, self._fields))
 
     def as_dict(self, recursive: bool = False) -> Dict:
         """Convert to a dict if this row object has both keys and values.
@@ -200,14 +227,14 @@ class Row(tuple):
         >>> row.as_dict(True)
         {'name1': 1, 'name2': 2, 'name3': {'childname': 3}}
         """
-        self._populate_named_values_from_fields()
-        if not self._named_values:
+        named_values = self._named_values
+        if not named_values:
             raise TypeError(
                 "Cannot convert a Row without key values or duplicated keys to a dict."
             )
         if not recursive:
-            return dict(self._named_values)
-        return self._convert_dict(self._named_values)
+            return named_values
+        return self._convert_dict(named_values)
 
     def _convert_dict(
         self, obj: Union["Row", Dict, Iterable[Union["Row", Dict]]]
@@ -224,22 +251,13 @@ class Row(tuple):
 
         return obj
 
-    def _populate_named_values_from_fields(self) -> None:
-        # populate _named_values dict if we have unduplicated fields
-        if (
-            self._named_values is None
-            and self._fields
-            and not self._check_if_having_duplicates()
-        ):
-            self.__dict__["_named_values"] = {k: v for k, v in zip(self._fields, self)}
-
-    def _check_if_having_duplicates(self) -> bool:
-        if self._has_duplicates is None:
-            # Usually we don't have duplicate keys
-            self.__dict__["_has_duplicates"] = bool(
-                len(set(self._fields)) != len(self._fields)
-            )
-        return self._has_duplicates
+    def _index_of(self, field: Any) -> Optional[int]:
+        # the index of the first value of the field, or None if there is no such value
+        schema = self._schema
+        if schema is None:
+            return None
+        index = schema.indices.get(field)
+        return index if index is not None and index < len(self) else None
 
     # Add aliases for user code migration
     asDict = as_dict
@@ -3,22 +3,34 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 import datetime
-import decimal
 import json
 import logging
 import os
+import sys
 from array import array
 from functools import reduce
 from logging import getLogger
 from threading import RLock
 from types import ModuleType
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import cloudpickle
 import pkg_resources
 
 from snowflake.connector import ProgrammingError, SnowflakeConnection
-from snowflake.connector.options import installed_pandas, pandas
+from snowflake.connector.options import installed_pandas, pandas, pyarrow
 from snowflake.connector.pandas_tools import write_pandas
 from snowflake.snowpark._internal.analyzer.analyzer import Analyzer
 from snowflake.snowpark._internal.analyzer.analyzer_utils import (
@@ -27,9 +39,12 @@ from snowflake.snowpark._internal.analyzer.analyzer_utils import (
 )
 from snowflake.snowpark._internal.analyzer.datatype_mapper import str_to_sql, to_sql
 from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.analyzer.resolution_cache import ResolutionCacheInfo
+from snowflake.snowpark._internal.analyzer.schema_cache import SchemaCache
 from snowflake.snowpark._internal.analyzer.snowflake_plan import SnowflakePlanBuilder
 from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
     Range,
+    SnowflakeArrowValues,
     SnowflakeValues,
 )
 from snowflake.snowpark._internal.analyzer.table_function import (
@@ -37,9 +52,19 @@ from snowflake.snowpark._internal.analyzer.table_function import (
     TableFunctionRelation,
 )
 from snowflake.snowpark._internal.error_message import SnowparkClientExceptionMessages
+from snowflake.snowpark._internal.materialization import Materializations
+from snowflake.snowpark._internal.result_cache import (
+    DEFAULT_RESULT_CACHE_DISK_SIZE,
+    DEFAULT_RESULT_CACHE_MEMORY_SIZE,
+    DEFAULT_RESULT_CACHE_TTL,
+    ResultCache,
+    ResultCacheInfo,
+)
 from snowflake.snowpark._internal.server_connection import ServerConnection
 from snowflake.snowpark._internal.type_utils import (
+    PYTHON_TO_SNOW_TYPE_MAPPINGS,
     ColumnOrName,
+    convert_arrow_to_sp_schema,
     infer_schema,
     infer_type,
     merge_type,
@@ -84,6 +109,7 @@ from snowflake.snowpark.functions import (
 from snowflake.snowpark.query_history import QueryHistory
 from snowflake.snowpark.row import Row
 from snowflake.snowpark.stored_procedure import StoredProcedureRegistration
+from snowflake.snowpark.stream_writer import StreamWriter
 from snowflake.snowpark.table import Table
 from snowflake.snowpark.table_function import (
     TableFunctionCall,
@@ -91,6 +117,7 @@ from snowflake.snowpark.table_function import (
 )
 from snowflake.snowpark.types import (
     ArrayType,
+    DataType,
     DateType,
     DecimalType,
     GeographyType,
@@ -105,12 +132,92 @@ from snowflake.snowpark.types import (
 from snowflake.snowpark.udf import UDFRegistration
 from snowflake.snowpark.udtf import UDTFRegistration
 
+if TYPE_CHECKING:
+    import numpy
+
 _logger = getLogger(__name__)
 
+# The number of rows of local data the schema is inferred from when the data consists
+# of plain lists or tuples, see _is_inferred_from_sample()
+_INFER_SCHEMA_SAMPLE_SIZE = 1000
+
 _session_management_lock = RLock()
 _active_sessions: Set["Session"] = set()
 
 
+def _local_data_columns(data: Any) -> Optional[List[Sequence]]:
+    """Returns the values of each column of local data if it can be transposed without
+    inspecting every row, i.e., for a NumPy array, for rows that are plain lists or
+    tuples of the same non-zero length and for rows that are scalar values of the
+    types a schema can be inferred from, and ``None`` otherwise, e.g., for dicts and
+    :class:`Row` objects."""
+    if _is_numpy_array(data):
+        # the values of the array are converted to Python objects column by column
+        return data.T.tolist() if data.ndim == 2 else [data.tolist()]
+    row_types = set(map(type, data))
+    if row_types <= {list, tuple}:
+        lengths = set(map(len, data))
+        if len(lengths) == 1 and 0 not in lengths:
+            return list(zip(*data))
+        return None
+    if row_types <= PYTHON_TO_SNOW_TYPE_MAPPINGS.keys():
+        return [data]
+    return None
+
+
+def _is_numpy_array(data: Any) -> bool:
+    # NumPy is not a dependency, but an array can only be created if it's imported
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(data, numpy.ndarray)
+
+
+def _is_inferred_from_sample(column: Sequence, sample_size: int) -> bool:
+    # The type inferred from a value whose Python type is mapped to a Snowpark type
+    # only depends on its Python type, so a column whose values are of the Python types
+    # of its sample has the type inferred from the sample.
+    types = set(map(type, column))
+    return (
+        types <= set(map(type, column[:sample_size]))
+        and types - {type(None)} <= PYTHON_TO_SNOW_TYPE_MAPPINGS.keys()
+    )
+
+
+def _local_value_converter(data_type: DataType) -> Optional[Callable[[Any], Any]]:
+    """Returns the function that converts a non-null value of a column of local data to
+    the value inserted into the temporary table, or ``None`` if it's inserted as is.
+    Variant, time, date, timestamp, array and map values are converted to strings,
+    which are converted back by the projection of the created DataFrame."""
+
+    def to_json(value: Any) -> str:
+        return json.dumps(value, cls=PythonObjJSONEncoder)
+
+    def check(value_type: type, convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def convert_checked(value: Any) -> Any:
+            if not isinstance(value, value_type):
+                raise TypeError(
+                    f"Cannot cast {type(value)}({value}) to {str(data_type)}."
+                )
+            return convert(value)
+
+        return convert_checked
+
+    if isinstance(data_type, TimestampType):
+        return lambda v: str(v) if isinstance(v, datetime.datetime) else v
+    if isinstance(data_type, TimeType):
+        return lambda v: str(v) if isinstance(v, datetime.time) else v
+    if isinstance(data_type, DateType):
+        return lambda v: str(v) if isinstance(v, datetime.date) else v
+    if isinstance(data_type, (_AtomicType, GeographyType)):
+        return None
+    if isinstance(data_type, ArrayType):
+        return check((list, tuple, array), to_json)
+    if isinstance(data_type, MapType):
+        return check(dict, to_json)
+    if isinstance(data_type, VariantType):
+        return to_json
+    return check((), to_json)
+
+
 def _get_active_session() -> Optional["Session"]:
     with _session_management_lock:
         if len(_active_sessions) == 1:
@@ -244,10 +351,24 @@ class Session:
         self._plan_builder = SnowflakePlanBuilder(self)
         self._last_action_id = 0
         self._last_canceled_id = 0
+        self._action_id_lock = RLock()
 
         self._file = FileOperation(self)
 
         self._analyzer = Analyzer(self)
+        self._lazy_analysis_enabled = False
+        self._schema_cache = SchemaCache()
+        self._schema_cache_enabled = False
+        self._sql_simplifier_enabled = False
+        self._cte_optimization_enabled = False
+        self._pipelined_execution_enabled = False
+        self._result_prefetch_depth = 0
+        self._deterministic_names_enabled = False
+        self._result_cache: Optional[ResultCache] = None
+        self._result_spill_threshold: Optional[int] = None
+        self._cache_result_auto_drop_enabled = False
+        self._cache_result_reuse_enabled = False
+        self._materializations = Materializations(self)
         _logger.info("Snowpark Session information: %s", self._session_info)
 
     def __enter__(self):
@@ -257,8 +378,9 @@ class Session:
         self.close()
 
     def _generate_new_action_id(self) -> int:
-        self._last_action_id += 1
-        return self._last_action_id
+        with self._action_id_lock:
+            self._last_action_id += 1
+            return self._last_action_id
 
     def close(self) -> None:
         """Close this session."""
@@ -277,6 +399,8 @@ class Session:
             raise SnowparkClientExceptionMessages.SERVER_FAILED_CLOSE_SESSION(str(ex))
         finally:
             try:
+                self.disable_result_cache()
+                self._materializations.close()
                 self._conn.close()
                 _logger.info("Closed session: %s", self._session_id)
             finally:
@@ -910,7 +1034,13 @@ class Session:
         ]
 
     def _get_result_attributes(self, query: str) -> List[Attribute]:
-        return self._conn.get_result_attributes(query)
+        if not self._schema_cache_enabled:
+            return self._conn.get_result_attributes(query)
+        attributes = self._schema_cache.get(query)
+        if attributes is None:
+            attributes = self._conn.get_result_attributes(query)
+            self._schema_cache.put(query, attributes)
+        return attributes
 
     def get_session_stage(self) -> str:
         """
@@ -1030,9 +1160,62 @@ class Session:
                 str(ci_output)
             )
 
+    def write_stream(
+        self,
+        table_name: Union[str, Iterable[str]],
+        schema: StructType,
+        *,
+        create_table: bool = True,
+        create_temp_table: bool = False,
+        target_file_size: int = 64 * 1024 * 1024,
+        files_per_copy: int = 16,
+        max_pending_files: int = 4,
+    ) -> StreamWriter:
+        """Returns a :class:`StreamWriter` that writes batches of data to a table as
+        they arrive, e.g., from a generator or a message queue consumer, without holding
+        all of the data in memory.
+
+        Args:
+            table_name: A string or list of strings that specify the table name or
+                fully-qualified object identifier (database name, schema name, and
+                table name).
+            schema: A :class:`~snowflake.snowpark.types.StructType` containing the names
+                and data types of the columns of the table. The columns of the batches
+                are matched to them by position.
+            create_table: Whether to create the table if it doesn't exist.
+            create_temp_table: Whether to create the table as a temporary table if it
+                doesn't exist.
+            target_file_size: The number of bytes of buffered Arrow data that are
+                written to one Parquet file and uploaded to the session stage.
+            files_per_copy: The number of files that are loaded into the table by one
+                ``COPY INTO`` statement.
+            max_pending_files: The maximum number of files that are written and
+                uploaded concurrently, which bounds the memory used by the writer.
+
+        Example::
+
+            >>> from snowflake.snowpark.types import IntegerType, StringType, StructField
+            >>> schema = StructType([StructField("id", IntegerType()), StructField("name", StringType())])
+            >>> with session.write_stream("write_stream_table", schema, create_temp_table=True) as writer:
+            ...     writer.write([(1, "Steve"), (2, "Bob")])
+            ...     writer.write([(3, "Alice")])
+            >>> session.table("write_stream_table").sort("id").collect()
+            [Row(ID=1, NAME='Steve'), Row(ID=2, NAME='Bob'), Row(ID=3, NAME='Alice')]
+        """
+        return StreamWriter(
+            self,
+            table_name,
+            schema,
+            create_table=create_table,
+            create_temp_table=create_temp_table,
+            target_file_size=target_file_size,
+            files_per_copy=files_per_copy,
+            max_pending_files=max_pending_files,
+        )
+
     def create_dataframe(
         self,
-        data: Union[List, Tuple, "pandas.DataFrame"],
+        data: Union[List, Tuple, "numpy.ndarray", "pyarrow.Table", "pandas.DataFrame"],
         schema: Optional[Union[StructType, List[str]]] = None,
     ) -> DataFrame:
         """Creates a new DataFrame containing the specified values from the local data.
@@ -1045,14 +1228,20 @@ class Session:
 
         Args:
             data: The local data for building a :class:`DataFrame`. ``data`` can only
-                be a :class:`list`, :class:`tuple` or pandas DataFrame. Every element in
-                ``data`` will constitute a row in the DataFrame.
+                be a :class:`list`, :class:`tuple`, a one or two dimensional NumPy array,
+                a structured NumPy array, a PyArrow Table or pandas DataFrame. Every
+                element in ``data`` will constitute a row in the DataFrame.
             schema: A :class:`~snowflake.snowpark.types.StructType` containing names and
                 data types of columns, or a list of column names, or ``None``.
                 When ``schema`` is a list of column names or ``None``, the schema of the
-                DataFrame will be inferred from the data across all rows. To improve
-                performance, provide a schema. This avoids the need to infer data types
-                with large data sets.
+                DataFrame will be inferred from the data across all rows. When the rows
+                are lists, tuples or scalar values, the types are inferred from the first
+                1000 rows, and only inferred from all rows if the values of the other
+                rows have different Python types. To improve performance, provide a
+                schema. This avoids the need to infer data types with large data sets.
+                The schema of a PyArrow Table or a structured NumPy array is derived
+                from its Arrow types, and its column names are kept as they are unless
+                ``schema`` is provided.
 
         Examples::
 
@@ -1076,6 +1265,16 @@ class Session:
             >>> session.createDataFrame([{"a": 1}, {"b": 2}]).collect()
             [Row(A=1, B=None), Row(A=None, B=2)]
 
+            >>> # create a dataframe from a NumPy array
+            >>> import numpy as np
+            >>> session.create_dataframe(np.array([[1, 2], [3, 4]]), schema=["a", "b"]).collect()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+
+            >>> # create a dataframe from a PyArrow Table
+            >>> import pyarrow as pa
+            >>> session.create_dataframe(pa.table({"a": [1, 2], "b": ["x", "y"]})).collect()
+            [Row(a=1, b='x'), Row(a=2, b='y')]
+
             >>> # create a dataframe from a pandas Dataframe
             >>> import pandas as pd
             >>> session.create_dataframe(pd.DataFrame([(1, 2, 3, 4)], columns=["a", "b", "c", "d"])).collect()
@@ -1088,14 +1287,41 @@ class Session:
         if isinstance(data, Row):
             raise TypeError("create_dataframe() function does not accept a Row object.")
 
-        if not isinstance(data, (list, tuple)) and (
+        if _is_numpy_array(data):
+            if (
+                data.ndim not in (1, 2)
+                or data.ndim == 2
+                and (data.shape[1] == 0 or data.dtype.names is not None)
+            ):
+                raise TypeError(
+                    "create_dataframe() function only accepts a NumPy array with one "
+                    "or two dimensions and at least one column, or a structured NumPy "
+                    "array with one dimension."
+                )
+        elif not isinstance(data, (list, tuple)) and (
             not installed_pandas
-            or (installed_pandas and not isinstance(data, pandas.DataFrame))
+            or (
+                installed_pandas
+                and not isinstance(data, (pandas.DataFrame, pyarrow.Table))
+            )
         ):
             raise TypeError(
-                "create_dataframe() function only accepts data as a list, tuple or a pandas DataFrame."
+                "create_dataframe() function only accepts data as a list, tuple, a "
+                "NumPy array, a PyArrow Table or a pandas DataFrame."
             )
 
+        # a PyArrow Table or a structured NumPy array is loaded column by column
+        if _is_numpy_array(data) and data.dtype.names is not None:
+            if not installed_pandas:
+                raise ImportError(
+                    "create_dataframe() function requires PyArrow to create a "
+                    "DataFrame from a structured NumPy array. Install it with "
+                    '`pip install "snowflake-snowpark-python[pandas]"`.'
+                )
+            return self._create_dataframe_from_arrow(data, schema)
+        if installed_pandas and isinstance(data, pyarrow.Table):
+            return self._create_dataframe_from_arrow(data, schema)
+
         # check to see if it is a Pandas DataFrame and if so, write that to a temp
         # table and return as a DataFrame
         if installed_pandas and isinstance(data, pandas.DataFrame):
@@ -1116,18 +1342,36 @@ class Session:
             )
 
         # infer the schema based on the data
+        columns = _local_data_columns(data)
         names = None
         if isinstance(schema, StructType):
             new_schema = schema
         else:
-            if not data:
+            if len(data) == 0:
                 raise ValueError("Cannot infer schema from empty data")
             if isinstance(schema, list):
                 names = schema
-            new_schema = reduce(
-                merge_type,
-                (infer_schema(row, names) for row in data),
-            )
+            if columns is None:
+                new_schema = reduce(
+                    merge_type,
+                    (infer_schema(row, names) for row in data),
+                )
+            else:
+                # the schema is inferred from a sample of rows, unless a value of a
+                # column may have a different type than the values in the sample
+                size = _INFER_SCHEMA_SAMPLE_SIZE
+                new_schema = reduce(
+                    merge_type,
+                    (
+                        infer_schema(row, names)
+                        for row in zip(*(c[:size] for c in columns))
+                    ),
+                )
+                if not all(_is_inferred_from_sample(c, size) for c in columns):
+                    new_schema = reduce(
+                        merge_type,
+                        (infer_schema(row, names) for row in zip(*columns)),
+                    )
         if len(new_schema.fields) == 0:
             raise ValueError(
                 "The provided schema or inferred schema cannot be None or empty"
@@ -1169,7 +1413,10 @@ class Session:
                 new_schema.fields[i].name = name
         else:
             names = [f.name for f in new_schema.fields]
-        rows = [convert_row_to_list(row, names) for row in data]
+        if columns is None or len(columns) != len(names):
+            columns = list(zip(*(convert_row_to_list(row, names) for row in data))) or [
+                [] for _ in names
+            ]
 
         # get attributes and data types
         attrs, data_types = [], []
@@ -1193,46 +1440,17 @@ class Session:
             attrs.append(Attribute(quote_name(field.name), sf_type, field.nullable))
             data_types.append(field.datatype)
 
-        # convert all variant/time/geography/array/map data to string
-        converted = []
-        for row in rows:
-            converted_row = []
-            for value, data_type in zip(row, data_types):
-                if value is None:
-                    converted_row.append(None)
-                elif isinstance(value, decimal.Decimal) and isinstance(
-                    data_type, DecimalType
-                ):
-                    converted_row.append(value)
-                elif isinstance(value, datetime.datetime) and isinstance(
-                    data_type, TimestampType
-                ):
-                    converted_row.append(str(value))
-                elif isinstance(value, datetime.time) and isinstance(
-                    data_type, TimeType
-                ):
-                    converted_row.append(str(value))
-                elif isinstance(value, datetime.date) and isinstance(
-                    data_type, DateType
-                ):
-                    converted_row.append(str(value))
-                elif isinstance(data_type, _AtomicType):  # consider inheritance
-                    converted_row.append(value)
-                elif isinstance(value, (list, tuple, array)) and isinstance(
-                    data_type, ArrayType
-                ):
-                    converted_row.append(json.dumps(value, cls=PythonObjJSONEncoder))
-                elif isinstance(value, dict) and isinstance(data_type, MapType):
-                    converted_row.append(json.dumps(value, cls=PythonObjJSONEncoder))
-                elif isinstance(data_type, VariantType):
-                    converted_row.append(json.dumps(value, cls=PythonObjJSONEncoder))
-                elif isinstance(data_type, GeographyType):
-                    converted_row.append(value)
-                else:
-                    raise TypeError(
-                        f"Cannot cast {type(value)}({value}) to {str(data_type)}."
-                    )
-            converted.append(Row(*converted_row))
+        # convert all variant/time/geography/array/map data to string, one column
+        # at a time with the converter of its type
+        converted_columns = []
+        for values, data_type in zip(columns, data_types):
+            converter = _local_value_converter(data_type)
+            converted_columns.append(
+                values
+                if converter is None
+                else [None if v is None else converter(v) for v in values]
+            )
+        converted = list(map(Row._make, zip(*converted_columns)))
 
         # construct a project statement to convert string value back to variant
         project_columns = []
@@ -1272,6 +1490,49 @@ class Session:
             project_columns
         )
 
+    def _create_dataframe_from_arrow(
+        self,
+        data: Union["pyarrow.Table", "numpy.ndarray"],
+        schema: Optional[Union[StructType, List[str]]],
+    ) -> DataFrame:
+        if not isinstance(data, pyarrow.Table):
+            # each field of a structured array is converted to an Arrow array, which
+            # doesn't convert its values to Python objects unless their dtype is object
+            names = list(data.dtype.names)
+            data = pyarrow.Table.from_arrays(
+                [pyarrow.array(data[name]) for name in names], names=names
+            )
+
+        if isinstance(schema, StructType):
+            new_schema = schema
+        else:
+            new_schema = convert_arrow_to_sp_schema(data.schema)
+            if isinstance(schema, list):
+                if len(schema) != len(new_schema.fields):
+                    raise ValueError(
+                        f"{len(schema)} fields are provided by schema but the data "
+                        f"has {len(new_schema.fields)} columns."
+                    )
+                for field, name in zip(new_schema.fields, schema):
+                    field.name = name
+        if len(new_schema.fields) == 0:
+            raise ValueError(
+                "The provided schema or inferred schema cannot be None or empty"
+            )
+        if len(new_schema.fields) != data.num_columns:
+            raise ValueError(
+                f"{len(new_schema.fields)} fields are required by schema but the data "
+                f"has {data.num_columns} columns."
+            )
+
+        # the temporary table has the types of the schema, so unlike other local data,
+        # no column is loaded as text and converted by a projection
+        attrs = [
+            Attribute(quote_name(field.name), field.datatype, field.nullable)
+            for field in new_schema.fields
+        ]
+        return DataFrame(self, SnowflakeArrowValues(attrs, data))
+
     def range(self, start: int, end: Optional[int] = None, step: int = 1) -> DataFrame:
         """
         Creates a new DataFrame from a range of numbers. The resulting DataFrame has
@@ -1401,6 +1662,360 @@ class Session:
             self._conn._conn.telemetry_enabled = False
             self._conn._telemetry_client.telemetry._enabled = False
 
+    @property
+    def lazy_analysis_enabled(self) -> bool:
+        """
+        Whether DataFrames created in this session resolve their logical plans lazily.
+        The default value is ``False``.
+
+        When it is ``False``, every transformation (e.g., :meth:`DataFrame.select`,
+        :meth:`DataFrame.filter`) resolves the new DataFrame's plan immediately. When it
+        is ``True``, a DataFrame keeps its logical plan and only resolves it when an
+        action (e.g., :meth:`DataFrame.collect`, :meth:`DataFrame.to_pandas`) or a
+        property such as :attr:`DataFrame.queries` or :attr:`DataFrame.schema` needs the
+        generated SQL. This reduces the client-side cost of building long chains of
+        transformations. Note that errors in a transformation might only be raised when
+        the DataFrame is resolved.
+
+        Example::
+
+            >>> session.lazy_analysis_enabled
+            False
+            >>> session.lazy_analysis_enabled = True
+            >>> from snowflake.snowpark.functions import col
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.filter(col("a") > 1).select(col("b")).collect()
+            [Row(B=4)]
+            >>> session.lazy_analysis_enabled = False
+        """
+        return self._lazy_analysis_enabled
+
+    @lazy_analysis_enabled.setter
+    def lazy_analysis_enabled(self, value: bool) -> None:
+        self._lazy_analysis_enabled = value
+
+    @property
+    def schema_cache_enabled(self) -> bool:
+        """
+        Whether the schemas of queries described in this session are cached on the
+        client. The default value is ``False``.
+
+        Snowpark describes the query of a DataFrame to get its schema, e.g., when you
+        call :attr:`DataFrame.schema` or build a transformation that refers to its
+        columns. When it is ``True``, the attributes returned by the server are cached
+        by the text of the query, so building the same pipeline again doesn't send
+        another ``DESCRIBE`` request. The cache is bounded in size and is cleared when
+        a statement that can change a schema (e.g., ``ALTER TABLE``, ``CREATE OR
+        REPLACE TABLE``, ``USE SCHEMA``) is executed in this session. Changes made to a
+        table from another session are not detected, so disable the cache or set it
+        again to clear it in that case.
+
+        Example::
+
+            >>> session.schema_cache_enabled
+            False
+            >>> session.schema_cache_enabled = True
+            >>> session.sql("select 1 as a, 2 as b").columns
+            ['A', 'B']
+            >>> # the schema of the same query is now read from the cache
+            >>> session.sql("select 1 as a, 2 as b").columns
+            ['A', 'B']
+            >>> session.schema_cache_enabled = False
+        """
+        return self._schema_cache_enabled
+
+    @schema_cache_enabled.setter
+    def schema_cache_enabled(self, value: bool) -> None:
+        if self._schema_cache_enabled:
+            self._conn.remove_query_listener(self._schema_cache)
+        self._schema_cache.clear()
+        if value:
+            self._conn.add_query_listener(self._schema_cache)
+        self._schema_cache_enabled = value
+
+    @property
+    def sql_simplifier_enabled(self) -> bool:
+        """
+        Whether the SQL generated for DataFrames in this session is simplified by
+        merging adjacent projections and filters into one ``SELECT`` statement. The
+        default value is ``False``.
+
+        By default, every :meth:`DataFrame.select`, :meth:`DataFrame.filter` or
+        :meth:`DataFrame.with_column` wraps the query of its DataFrame in a subquery, so
+        a long chain of transformations generates deeply nested SQL that takes a long
+        time to compile. When it is ``True``, a projection or filter is merged into the
+        ``SELECT`` statement below it when it doesn't change the result, e.g., the
+        statements are not merged if the projection depends on a column computed by
+        the statement below it, or the filter would be evaluated before a window
+        function. Sorts, limits, samples, aggregations and joins are not merged.
+
+        Example::
+
+            >>> session.sql_simplifier_enabled = True
+            >>> from snowflake.snowpark.functions import col
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.filter(col("a") > 1).select(col("b")).filter(col("b") < 5).collect()
+            [Row(B=4)]
+            >>> session.sql_simplifier_enabled = False
+        """
+        return self._sql_simplifier_enabled
+
+    @sql_simplifier_enabled.setter
+    def sql_simplifier_enabled(self, value: bool) -> None:
+        self._sql_simplifier_enabled = value
+
+    @property
+    def cte_optimization_enabled(self) -> bool:
+        """
+        Whether a subquery that occurs more than once in the SQL generated for a
+        DataFrame is extracted as a common table expression (CTE) in a ``WITH`` clause.
+        The default value is ``False``.
+
+        When the same DataFrame is used more than once, e.g., when the filtered copies
+        of a DataFrame are joined or unioned, its query is copied into the generated SQL
+        each time. When it is ``True``, such a query is only generated once, which
+        reduces the size and the compile time of the SQL. Queries that use random or
+        sampling functions are not extracted, since a CTE may be evaluated only once.
+
+        Example::
+
+            >>> session.cte_optimization_enabled = True
+            >>> from snowflake.snowpark.functions import col
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.filter(col("a") == 1).union_all(df.filter(col("a") == 3)).sort("a").collect()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+            >>> session.cte_optimization_enabled = False
+        """
+        return self._cte_optimization_enabled
+
+    @cte_optimization_enabled.setter
+    def cte_optimization_enabled(self, value: bool) -> None:
+        self._cte_optimization_enabled = value
+
+    @property
+    def pipelined_execution_enabled(self) -> bool:
+        """
+        Whether the queries of a DataFrame action that don't depend on each other run
+        concurrently. The default value is ``False``.
+
+        Some DataFrames run more than one query for an action, e.g., a DataFrame that
+        reads files creates a temporary file format first, and a join of two large
+        local relations creates and loads a temporary table for each of them. When it
+        is ``True``, a query starts as soon as the queries it depends on finish, e.g.,
+        the temporary tables of both sides of the join are created and loaded at the
+        same time, and only the last query waits for all of them. The temporary
+        objects are dropped asynchronously after the action returns, and the next
+        action waits for them to be dropped before it starts. Queries
+        run in a stored procedure are always executed one after another.
+
+        Example::
+
+            >>> session.pipelined_execution_enabled = True
+            >>> df1 = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df2 = session.create_dataframe([[1, 5], [3, 6]], schema=["a", "c"])
+            >>> df1.join(df2, "a").sort("a").collect()
+            [Row(A=1, B=2, C=5), Row(A=3, B=4, C=6)]
+            >>> session.pipelined_execution_enabled = False
+        """
+        return self._pipelined_execution_enabled
+
+    @pipelined_execution_enabled.setter
+    def pipelined_execution_enabled(self, value: bool) -> None:
+        self._pipelined_execution_enabled = value
+
+    @property
+    def result_prefetch_depth(self) -> int:
+        """
+        The number of batches of a result that a background thread fetches ahead of the
+        consumer of :meth:`DataFrame.to_local_iterator`,
+        :meth:`DataFrame.to_pandas_batches` and :meth:`DataFrame.to_arrow_batches`.
+        The default value is 0, which means the result is only fetched when the next
+        item is requested.
+
+        When it is greater than 0, downloading the result chunks and converting them to
+        :class:`Row` objects or Pandas DataFrames overlaps with the processing of the
+        previous items. A batch is a Pandas DataFrame or a PyArrow Table for the batch
+        methods, and 1000 rows for :meth:`DataFrame.to_local_iterator`, so at most
+        this number of batches is held in memory in addition to the current one. The
+        thread stops when the iterator is exhausted or closed.
+
+        Example::
+
+            >>> session.result_prefetch_depth = 2
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> list(df.to_local_iterator())
+            [Row(A=1, B=2), Row(A=3, B=4)]
+            >>> session.result_prefetch_depth = 0
+        """
+        return self._result_prefetch_depth
+
+    @result_prefetch_depth.setter
+    def result_prefetch_depth(self, value: int) -> None:
+        self._result_prefetch_depth = value
+
+    @property
+    def deterministic_names_enabled(self) -> bool:
+        """
+        Whether the names that Snowpark generates in the SQL of a DataFrame, e.g., the
+        aliases of subqueries, joins and inlined local data, the prefixes of ambiguous
+        join columns, and the names of common table expressions, are derived from the
+        content they are generated for instead of being random. The default value is
+        ``False``.
+
+        When it is ``True``, the same DataFrame built twice, in the same or another
+        process, is translated to the same SQL text, so its queries can be cached and
+        compared, e.g., by the result cache of Snowflake and in query history. The
+        temporary objects that Snowpark creates, such as tables and stages, still get
+        random names, because concurrent actions must not share them. The placeholders
+        for the query ids read by ``RESULT_SCAN``, e.g., after a ``SHOW`` command, are
+        also unique, and they're replaced with the query ids when the action runs.
+
+        Example::
+
+            >>> session.deterministic_names_enabled = True
+            >>> df1 = session.create_dataframe([[1, 2]], schema=["a", "b"])
+            >>> df2 = session.create_dataframe([[1, 2]], schema=["a", "b"])
+            >>> df1.queries["queries"] == df2.queries["queries"]
+            True
+            >>> session.deterministic_names_enabled = False
+        """
+        return self._deterministic_names_enabled
+
+    @deterministic_names_enabled.setter
+    def deterministic_names_enabled(self, value: bool) -> None:
+        self._deterministic_names_enabled = value
+
+    @property
+    def result_spill_threshold(self) -> Optional[int]:
+        """
+        The size in bytes above which the result of :meth:`DataFrame.collect` or
+        :meth:`DataFrame.to_pandas` is spilled to a local file instead of being held in
+        memory. The default value is ``None``, which means results are never spilled.
+
+        When it is set, a result whose uncompressed size, as reported by Snowflake,
+        exceeds the threshold is fetched as Arrow tables, and a smaller result is
+        fetched as usual. Once the size of the Arrow tables exceeds the threshold, they
+        are written to a temporary Arrow IPC file as they are downloaded, and the result
+        is read from the memory-mapped file, so its data is paged in from disk when
+        it's accessed:
+
+        - :meth:`DataFrame.collect` returns a read-only sequence of :class:`Row`
+          objects instead of a list, whose rows are converted from the file when they
+          are accessed. The values of the rows have the same types as the values of
+          rows that aren't spilled, except that the values of ``TIMESTAMP_TZ`` columns
+          are in UTC.
+        - :meth:`DataFrame.to_pandas` returns a Pandas DataFrame whose numeric columns
+          without null values refer to the file instead of being copied to memory.
+
+        The file is created in the default temporary directory of Python, see
+        :func:`tempfile.gettempdir`, and is removed when the result is garbage
+        collected. Spilled results are not cached by :meth:`enable_result_cache`.
+
+        Example::
+
+            >>> session.result_spill_threshold = 1
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> rows = df.collect()
+            >>> len(rows), rows[1]
+            (2, Row(A=3, B=4))
+            >>> session.result_spill_threshold = None
+        """
+        return self._result_spill_threshold
+
+    @result_spill_threshold.setter
+    def result_spill_threshold(self, value: Optional[int]) -> None:
+        self._result_spill_threshold = value
+
+    @property
+    def cursor_pool_size(self) -> Optional[int]:
+        """
+        The maximum number of queries of this session that are run concurrently by
+        different threads, or ``None`` if all threads share one cursor of the
+        connection. The default value is ``None``.
+
+        When it is set, each DataFrame action leases a cursor from a bounded pool of
+        cursors of the connection of this session, so actions called by different
+        threads run their queries concurrently without sharing the state of a cursor.
+        An action waits for a cursor to be released when all cursors are leased. All
+        cursors run their queries in the same Snowflake session, so the query tag, the
+        current database and schema and the temporary objects are shared by all
+        threads. A cursor whose result is read by an iterator, e.g., from
+        :meth:`DataFrame.to_local_iterator`, is not leased again.
+
+        Example::
+
+            >>> from concurrent.futures import ThreadPoolExecutor
+            >>> session.cursor_pool_size = 4
+            >>> dfs = [session.create_dataframe([[i]], schema=["a"]) for i in range(8)]
+            >>> with ThreadPoolExecutor(max_workers=4) as executor:
+            ...     results = list(executor.map(lambda df: df.collect(), dfs))
+            >>> results[7]
+            [Row(A=7)]
+            >>> session.cursor_pool_size = None
+        """
+        return self._conn.cursor_pool_size
+
+    @cursor_pool_size.setter
+    def cursor_pool_size(self, value: Optional[int]) -> None:
+        self._conn.cursor_pool_size = value
+
+    @property
+    def cache_result_auto_drop_enabled(self) -> bool:
+        """
+        Whether the temporary table created by :meth:`DataFrame.cache_result` is
+        dropped once no DataFrame refers to it. The default value is ``False``, which
+        means the table is dropped when the session ends.
+
+        When it is ``True``, the table is dropped when the DataFrames returned by
+        :meth:`DataFrame.cache_result`, and all DataFrames derived from them, are
+        garbage collected, so a long-running session doesn't accumulate tables. Only
+        enable it if the table isn't used otherwise, e.g., by a view created by
+        :meth:`DataFrame.create_or_replace_temp_view` or by the SQL of
+        :attr:`DataFrame.queries` run later, since these don't refer to a DataFrame.
+        Tables created while it's ``False`` are not dropped.
+
+        Example::
+
+            >>> session.cache_result_auto_drop_enabled = True
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.cache_result().collect()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+            >>> session.cache_result_auto_drop_enabled = False
+        """
+        return self._cache_result_auto_drop_enabled
+
+    @cache_result_auto_drop_enabled.setter
+    def cache_result_auto_drop_enabled(self, value: bool) -> None:
+        self._cache_result_auto_drop_enabled = value
+
+    @property
+    def cache_result_reuse_enabled(self) -> bool:
+        """
+        Whether :meth:`DataFrame.cache_result` reuses the temporary table it created
+        for a DataFrame with the same :attr:`DataFrame.fingerprint`, instead of taking
+        a new snapshot. The default value is ``False``.
+
+        When it is ``True``, a DataFrame of deterministic ``SELECT`` queries that is
+        cached again in the same role, warehouse, database and schema reads the table
+        created before, unless a table named in its SQL has been changed by this
+        session since then. Only enable it if the data it reads isn't changed otherwise:
+        changes made by other sessions, and changes of the tables read by views and
+        UDFs it refers to, aren't detected, so the cached result can be stale.
+
+        Example::
+
+            >>> session.cache_result_reuse_enabled = True
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.cache_result().queries == df.cache_result().queries
+            True
+            >>> session.cache_result_reuse_enabled = False
+        """
+        return self._cache_result_reuse_enabled
+
+    @cache_result_reuse_enabled.setter
+    def cache_result_reuse_enabled(self, value: bool) -> None:
+        self._cache_result_reuse_enabled = value
+
     @property
     def file(self) -> FileOperation:
         """
@@ -1559,6 +2174,130 @@ class Session:
         self._conn.add_query_listener(query_listener)
         return query_listener
 
+    def enable_result_cache(
+        self,
+        ttl: float = DEFAULT_RESULT_CACHE_TTL,
+        max_memory_size: int = DEFAULT_RESULT_CACHE_MEMORY_SIZE,
+        disk_cache_dir: Optional[str] = None,
+        max_disk_size: int = DEFAULT_RESULT_CACHE_DISK_SIZE,
+    ) -> None:
+        """
+        Enables a client-side cache of the results of :meth:`DataFrame.collect`,
+        :meth:`DataFrame.to_pandas`, :meth:`DataFrame.to_arrow` and the other blocking
+        actions that fetch the whole result of a query, so running the same DataFrame
+        again returns the cached result without running its queries in the warehouse.
+        A cache that was enabled before is replaced and cleared.
+
+        Results are cached by the SQL text of the queries of the DataFrame and the
+        current role, warehouse, database and schema of the session. When this session
+        executes a statement that can change data, e.g., ``INSERT``, ``MERGE`` or
+        ``CREATE OR REPLACE TABLE``, the cached results of the queries that refer to
+        the changed table are invalidated. Changes made outside of this session are not
+        detected, so call :meth:`invalidate_result_cache` or rely on ``ttl`` in that
+        case. Queries calling non-deterministic functions, e.g., ``RANDOM()`` or
+        ``CURRENT_TIMESTAMP()``, also return their cached results until they expire.
+
+        Args:
+            ttl: The number of seconds a result is cached for.
+            max_memory_size: The maximum estimated size of the results held in memory,
+                in bytes. The least recently used results are evicted when it's
+                exceeded.
+            disk_cache_dir: If it's set, the results evicted from memory are written
+                to Arrow IPC files in a new directory in it, which are memory-mapped
+                when they are read. Only the results of :meth:`DataFrame.to_pandas` and
+                :meth:`DataFrame.to_arrow` are written, and the rows of
+                :meth:`DataFrame.collect`, whose values wouldn't keep their Python types
+                through Arrow, are dropped, like results that can't be converted to
+                Arrow tables.
+            max_disk_size: The maximum size of the files written to
+                ``disk_cache_dir``, in bytes.
+
+        Example::
+
+            >>> session.enable_result_cache(ttl=60)
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> df.collect()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+            >>> df.collect()
+            [Row(A=1, B=2), Row(A=3, B=4)]
+            >>> session.result_cache_info().hits
+            1
+            >>> session.disable_result_cache()
+        """
+        self.disable_result_cache()
+        self._result_cache = ResultCache(
+            ttl, max_memory_size, disk_cache_dir, max_disk_size
+        )
+        self._conn.add_query_listener(self._result_cache)
+
+    def disable_result_cache(self) -> None:
+        """Disables the result cache enabled by :meth:`enable_result_cache` and
+        removes its results from memory and disk."""
+        cache, self._result_cache = self._result_cache, None
+        if cache is not None:
+            self._conn.remove_query_listener(cache)
+            cache.close()
+
+    def invalidate_result_cache(
+        self, table_name: Optional[Union[str, Iterable[str]]] = None
+    ) -> None:
+        """
+        Removes the cached results of the queries that refer to a table or view, e.g.,
+        after it's changed by another session, or all cached results if
+        ``table_name`` is ``None``.
+
+        Args:
+            table_name: A string or list of strings that specify the table name or
+                fully-qualified object identifier (database name, schema name, and table
+                name). Results are matched by the name of the table only, so the results
+                of the tables of the same name in other schemas are also invalidated.
+        """
+        if self._result_cache is None:
+            return
+        if table_name is not None and not isinstance(table_name, str):
+            table_name = ".".join(table_name)
+        self._result_cache.invalidate(table_name)
+
+    def result_cache_info(self) -> Optional[ResultCacheInfo]:
+        """
+        Returns the statistics of the result cache enabled by
+        :meth:`enable_result_cache` as a named tuple of the numbers of ``hits``,
+        ``disk_hits`` and ``misses``, and the number and size in bytes of the cached
+        results in memory (``memory_entries``, ``memory_size``) and on disk
+        (``disk_entries``, ``disk_size``). Returns ``None`` if the cache is disabled.
+        """
+        return (
+            self._result_cache.cache_info() if self._result_cache is not None else None
+        )
+
+    def resolution_cache_info(self) -> ResolutionCacheInfo:
+        """
+        Returns the statistics of the cache of resolved plans of this session as a
+        named tuple of the numbers of ``hits`` and ``misses``, the maximum number of
+        cached plans (``max_size``) and the number of plans in the cache
+        (``current_size``).
+
+        The logical plan of every DataFrame is resolved to the SQL queries that
+        evaluate it, and its resolved plan is cached as long as the DataFrame is
+        referenced, so a subtree shared by several DataFrames is only resolved once. A
+        plan resolved with other values of :attr:`sql_simplifier_enabled`,
+        :attr:`cte_optimization_enabled` or :attr:`deterministic_names_enabled` isn't
+        reused.
+
+        Example::
+
+            >>> session.lazy_analysis_enabled = True
+            >>> df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+            >>> hits = session.resolution_cache_info().hits
+            >>> _ = df.select("a").queries
+            >>> _ = df.select("b").queries
+            >>> # the plan of df is resolved for the first select and reused by the second
+            >>> session.resolution_cache_info().hits - hits
+            1
+            >>> session.lazy_analysis_enabled = False
+        """
+        return self._analyzer.resolution_cache.cache_info()
+
     def _table_exists(self, table_name: str):
         tables = self._run_query(f"show tables like '{table_name}'")
         return tables is not None and len(tables) > 0
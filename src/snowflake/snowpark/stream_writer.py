@@ -0,0 +1,286 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import io
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, List, Sequence, Union
+
+import snowflake.snowpark
+from snowflake.connector.options import installed_pandas, pandas, pyarrow
+from snowflake.snowpark._internal.analyzer.analyzer_utils import (
+    attribute_to_schema_string,
+    copy_into_table,
+    create_table_statement,
+    quote_name,
+    staged_parquet_column,
+)
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.server_connection import _arrow_table_to_file_table
+from snowflake.snowpark._internal.utils import (
+    PythonObjJSONEncoder,
+    generate_random_alphanumeric,
+    validate_object_name,
+)
+from snowflake.snowpark.row import Row
+from snowflake.snowpark.table import Table
+from snowflake.snowpark.types import StructType
+
+_StreamBatch = Union[
+    "pandas.DataFrame", "pyarrow.Table", "pyarrow.RecordBatch", Sequence[Row]
+]
+
+
+def _rows_to_table(
+    rows: Sequence[Sequence], column_names: List[str]
+) -> "pyarrow.Table":
+    # The Arrow types of the columns are inferred from their values, so nested values
+    # are written as nested Parquet columns, and values of mixed types as text.
+    columns = []
+    for i in range(len(column_names)):
+        values = [row[i] for row in rows]
+        try:
+            columns.append(pyarrow.array(values))
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, OverflowError):
+            columns.append(
+                pyarrow.array(
+                    [
+                        None
+                        if v is None
+                        else json.dumps(v, cls=PythonObjJSONEncoder)
+                        if isinstance(v, (list, tuple, dict))
+                        else str(v)
+                        for v in values
+                    ],
+                    pyarrow.string(),
+                )
+            )
+    return pyarrow.Table.from_arrays(columns, names=column_names)
+
+
+class StreamWriter:
+    """Writes data that arrives in batches to a table, without holding all of it in
+    memory. It's returned by :meth:`Session.write_stream`.
+
+    Each batch passed to :meth:`write` is converted to an Arrow table and buffered.
+    When the buffered data reaches ``target_file_size`` bytes, it's written to a Parquet
+    file that is uploaded to the session stage by a background thread while more batches
+    arrive. Every ``files_per_copy`` files are loaded into the table by one
+    ``COPY INTO`` statement, which also runs in the background. When
+    ``max_pending_files`` files are being written or uploaded, :meth:`write` waits for
+    the oldest one, so the memory used by the writer is bounded.
+
+    Call :meth:`flush` to load all data written so far, and :meth:`close` when all data
+    has been written. Each ``COPY INTO`` statement is committed on its own, so the rows
+    of a batch are visible in the table after the statement that loads them finishes.
+
+    See :meth:`Session.write_stream` for an example.
+    """
+
+    def __init__(
+        self,
+        session: "snowflake.snowpark.session.Session",
+        table_name: Union[str, Iterable[str]],
+        schema: StructType,
+        *,
+        create_table: bool = True,
+        create_temp_table: bool = False,
+        target_file_size: int = 64 * 1024 * 1024,
+        files_per_copy: int = 16,
+        max_pending_files: int = 4,
+    ) -> None:
+        if not isinstance(schema, StructType) or not schema.fields:
+            raise ValueError(
+                "The schema of a stream writer must be a non-empty StructType"
+            )
+        if target_file_size <= 0 or files_per_copy <= 0 or max_pending_files <= 0:
+            raise ValueError(
+                "target_file_size, files_per_copy and max_pending_files must be positive"
+            )
+        self._session = session
+        self._table_name = (
+            table_name if isinstance(table_name, str) else ".".join(table_name)
+        )
+        validate_object_name(self._table_name)
+        self._attributes = [
+            Attribute(quote_name(field.name), field.datatype, field.nullable)
+            for field in schema.fields
+        ]
+        self._file_column_names = [f"C{i}" for i in range(len(self._attributes))]
+        self._target_file_size = target_file_size
+        self._files_per_copy = files_per_copy
+        self._max_pending_files = max_pending_files
+        if create_table or create_temp_table:
+            session._conn.run_query(
+                create_table_statement(
+                    self._table_name,
+                    attribute_to_schema_string(self._attributes),
+                    error=False,
+                    temp=create_temp_table,
+                )
+            )
+
+        # the files of each COPY INTO statement are uploaded to their own directory
+        self._stage_location = (
+            f"{session.get_session_stage()}/STREAM_{generate_random_alphanumeric()}"
+        )
+        self._buffer: List["pyarrow.Table"] = []
+        self._buffer_size = 0
+        self._directory_index = 0
+        self._directory_uploads: List[Future] = []
+        self._pending_uploads: List[Future] = []
+        self._copies: List[Future] = []
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=max_pending_files, thread_name_prefix="snowpark-stream-upload"
+        )
+        # COPY INTO statements run one at a time, in the order of their files
+        self._copy_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="snowpark-stream-copy"
+        )
+        self._closed = False
+
+    def __enter__(self) -> "StreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown()
+
+    def write(self, batch: _StreamBatch) -> None:
+        """Buffers a batch of data, which can be a pandas DataFrame, a PyArrow Table or
+        RecordBatch, or a list of rows, e.g., :class:`Row` objects or tuples. The
+        columns of the batch are matched to the columns of the schema by position, and
+        are cast to their types.
+
+        The errors of files that were uploaded or loaded in the background since the
+        previous call are raised by this method.
+        """
+        self._check_open()
+        self._raise_background_error()
+        table = self._to_file_table(batch)
+        if table.num_rows == 0:
+            return
+        if self._buffer and table.schema != self._buffer[0].schema:
+            # e.g., a column that's written as text in one batch and not in another
+            self._write_file()
+        self._buffer.append(table)
+        self._buffer_size += table.nbytes
+        if self._buffer_size >= self._target_file_size:
+            self._write_file()
+
+    def flush(self) -> None:
+        """Writes the buffered data to a file and waits until all files are loaded into
+        the table."""
+        self._check_open()
+        self._write_file()
+        self._submit_copy()
+        copies, self._copies = self._copies, []
+        for copy in copies:
+            copy.result()
+
+    def close(self) -> Table:
+        """Flushes the writer and stops its background threads. Returns a
+        :class:`Table` for the table the data was written to."""
+        if not self._closed:
+            try:
+                self.flush()
+            finally:
+                self._shutdown()
+        return self._session.table(self._table_name)
+
+    def _shutdown(self) -> None:
+        self._closed = True
+        self._buffer, self._buffer_size = [], 0
+        self._upload_executor.shutdown(wait=True)
+        self._copy_executor.shutdown(wait=True)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError("The stream writer is closed")
+
+    def _raise_background_error(self) -> None:
+        for future in self._pending_uploads + self._copies:
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+    def _to_file_table(self, batch: _StreamBatch) -> "pyarrow.Table":
+        if isinstance(batch, (list, tuple)):
+            if any(len(row) != len(self._attributes) for row in batch):
+                raise ValueError(
+                    f"{len(self._attributes)} fields are required by schema but a "
+                    f"row of the batch has a different number of values."
+                )
+            table = _rows_to_table(batch, self._file_column_names)
+        elif isinstance(batch, pyarrow.RecordBatch):
+            table = pyarrow.Table.from_batches([batch])
+        elif isinstance(batch, pyarrow.Table):
+            table = batch
+        elif installed_pandas and isinstance(batch, pandas.DataFrame):
+            table = pyarrow.Table.from_pandas(batch, preserve_index=False)
+        else:
+            raise TypeError(
+                "StreamWriter.write() only accepts a list or tuple of rows, a PyArrow "
+                "Table or RecordBatch, or a pandas DataFrame."
+            )
+        if table.num_columns != len(self._attributes):
+            raise ValueError(
+                f"{len(self._attributes)} fields are required by schema but the "
+                f"batch has {table.num_columns} columns."
+            )
+        return _arrow_table_to_file_table(
+            table, self._attributes, self._file_column_names
+        )
+
+    def _write_file(self) -> None:
+        if not self._buffer:
+            return
+        tables, self._buffer, self._buffer_size = self._buffer, [], 0
+        while len(self._pending_uploads) >= self._max_pending_files:
+            self._pending_uploads.pop(0).result()
+        location = f"{self._stage_location}/{self._directory_index}"
+        file_name = f"{len(self._directory_uploads)}.parquet"
+        upload = self._upload_executor.submit(
+            self._upload, pyarrow.concat_tables(tables), location, file_name
+        )
+        self._pending_uploads.append(upload)
+        self._directory_uploads.append(upload)
+        if len(self._directory_uploads) >= self._files_per_copy:
+            self._submit_copy()
+
+    def _upload(self, table: "pyarrow.Table", location: str, file_name: str) -> None:
+        import pyarrow.parquet
+
+        stream = io.BytesIO()
+        pyarrow.parquet.write_table(table, stream)
+        stream.seek(0)
+        self._session._conn._put_stream(stream, location, file_name)
+
+    def _submit_copy(self) -> None:
+        if not self._directory_uploads:
+            return
+        uploads, self._directory_uploads = self._directory_uploads, []
+        sql = copy_into_table(
+            self._table_name,
+            f"{self._stage_location}/{self._directory_index}/",
+            "PARQUET",
+            {"BINARY_AS_TEXT": False},
+            {"PURGE": True},
+            None,
+            column_names=[attr.name for attr in self._attributes],
+            transformations=[
+                staged_parquet_column(name, attr.datatype)
+                for name, attr in zip(self._file_column_names, self._attributes)
+            ],
+        )
+        self._directory_index += 1
+        self._copies.append(self._copy_executor.submit(self._copy, uploads, sql))
+
+    def _copy(self, uploads: List[Future], sql: str) -> None:
+        # the statement is submitted with its own cursor, so it doesn't use the cursor
+        # of the session while the thread that writes the batches runs other queries
+        for upload in uploads:
+            upload.result()
+        conn = self._session._conn
+        conn.wait_for_query(conn.submit_query(sql))
@@ -372,7 +372,9 @@ class Table(DataFrame):
                     for k, v in assignments.items()
                 },
                 condition._expression if condition is not None else None,
-                _disambiguate(self, source, create_join_type("left"), [])[1]._plan
+                _disambiguate(self, source, create_join_type("left"), [])[
+                    1
+                ]._logical_plan
                 if source
                 else None,
             )
@@ -432,7 +434,9 @@ class Table(DataFrame):
             TableDelete(
                 self.table_name,
                 condition._expression if condition is not None else None,
-                _disambiguate(self, source, create_join_type("left"), [])[1]._plan
+                _disambiguate(self, source, create_join_type("left"), [])[
+                    1
+                ]._logical_plan
                 if source
                 else None,
             )
@@ -497,7 +501,9 @@ class Table(DataFrame):
         new_df = self._with_plan(
             TableMerge(
                 self.table_name,
-                _disambiguate(self, source, create_join_type("left"), [])[1]._plan,
+                _disambiguate(self, source, create_join_type("left"), [])[
+                    1
+                ]._logical_plan,
                 join_expr._expression,
                 merge_exprs,
             )
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+"""Measures the memory and the time taken to create :class:`Row` objects from a
+result set and to access their values by name, compared with plain tuples.
+
+No connection is needed, the result set is generated locally::
+
+    python -m tests.benchmark.row_memory --rows 1000000 --columns 10
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from snowflake.connector.cursor import ResultMetadata
+from snowflake.snowpark._internal.utils import result_set_to_rows
+
+
+def generate_result_set(
+    rows: int, columns: int
+) -> Tuple[List[Tuple[int, ...]], List[ResultMetadata]]:
+    result_set = [tuple(range(i, i + columns)) for i in range(rows)]
+    result_meta = [
+        ResultMetadata(f"C{i}", 0, None, None, 38, 0, True) for i in range(columns)
+    ]
+    return result_set, result_meta
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main(rows: int, columns: int) -> None:
+    result_set, result_meta = generate_result_set(rows, columns)
+    print(f"{'':>24} {'time (s)':>10} {'memory (MB)':>12}")
+    for name, func in (
+        ("tuple", lambda: [tuple(list(data)) for data in result_set]),
+        ("Row", lambda: result_set_to_rows(result_set, result_meta)),
+    ):
+        _, elapsed, size = measure(func)
+        print(f"{name:>24} {elapsed:>10.3f} {size / 2 ** 20:>12.1f}")
+
+    collected = result_set_to_rows(result_set, result_meta)
+    start = time.perf_counter()
+    for row in collected:
+        row.C0, row["C1"]
+    elapsed = time.perf_counter() - start
+    print(f"{'access by name':>24} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--columns", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.columns)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+"""Compares the size and compile time of the SQL generated for deep chains of
+projections and filters, with and without ``Session.sql_simplifier_enabled``.
+
+Usage (connection parameters are read from ``tests/parameters.py``)::
+
+    python -m tests.benchmark.select_merge --depth 50 100 200
+"""
+import argparse
+import time
+from typing import List, Tuple
+
+from snowflake.snowpark import DataFrame, Session
+from snowflake.snowpark.functions import col
+
+
+def build_pipeline(session: Session, depth: int) -> DataFrame:
+    df = session.sql(
+        "select seq4() as a, uniform(1, 10, random()) as b from table(generator(rowcount => 100))"
+    )
+    for i in range(depth):
+        if i % 3 == 0:
+            df = df.filter(col("a") > i)
+        elif i % 3 == 1:
+            df = df.select(col("a"), col("b"))
+        else:
+            df = df.select(col("a"), (col("b") + i).alias("b"))
+    return df
+
+
+def measure(session: Session, depth: int) -> Tuple[int, float, float]:
+    start = time.perf_counter()
+    sql = build_pipeline(session, depth).queries["queries"][-1]
+    build_time = time.perf_counter() - start
+    # describing a query compiles it without executing it
+    start = time.perf_counter()
+    session._conn._cursor.describe(sql)
+    compile_time = time.perf_counter() - start
+    return len(sql), build_time, compile_time
+
+
+def main(depths: List[int]) -> None:
+    from tests.parameters import CONNECTION_PARAMETERS
+
+    with Session.builder.configs(CONNECTION_PARAMETERS).create() as session:
+        print(
+            f"{'depth':>6} {'simplified':>10} {'sql size':>10} "
+            f"{'build (s)':>10} {'compile (s)':>12}"
+        )
+        for depth in depths:
+            for enabled in (False, True):
+                session.sql_simplifier_enabled = enabled
+                size, build_time, compile_time = measure(session, depth)
+                print(
+                    f"{depth:>6} {str(enabled):>10} {size:>10} "
+                    f"{build_time:>10.3f} {compile_time:>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, nargs="+", default=[50, 100, 200])
+    main(parser.parse_args().depth)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+"""Measures the time and the memory taken to build the column expressions of a wide
+feature table, and the time taken to analyze them to SQL.
+
+No connection is needed, the columns of the table are generated locally::
+
+    python -m tests.benchmark.wide_expressions --columns 500 1000 2000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from snowflake.snowpark import Column
+from snowflake.snowpark._internal.analyzer.analyzer import Analyzer
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark.functions import coalesce, iff, lit
+from snowflake.snowpark.types import DoubleType
+
+
+def build_features(attributes: List[Attribute]) -> List[Column]:
+    features = []
+    for i, attribute in enumerate(attributes):
+        c = Column(attribute)
+        features.append(
+            iff(c.is_null(), lit(0.0), (c - lit(i)) / lit(i + 1))
+            .cast(DoubleType())
+            .alias(f"F{i}")
+        )
+        features.append(coalesce(c * c, lit(0.0)).alias(f"F{i}_SQUARED"))
+    return features
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main(columns: List[int], repeat: int) -> None:
+    analyzer = Analyzer(None)
+    analyzer.alias_maps_to_use = {}
+    print(f"{'columns':>8} {'build (s)':>10} {'memory (MB)':>12} {'analyze (s)':>12}")
+    for num_columns in columns:
+        attributes = [Attribute(f'"C{i}"', DoubleType()) for i in range(num_columns)]
+        build_time = analyze_time = float("inf")
+        for _ in range(repeat):
+            features, elapsed, size = measure(lambda: build_features(attributes))
+            build_time = min(build_time, elapsed)
+            start = time.perf_counter()
+            for feature in features:
+                analyzer.analyze(feature._expression)
+            analyze_time = min(analyze_time, time.perf_counter() - start)
+        print(
+            f"{num_columns:>8} {build_time:>10.4f} {size / 2 ** 20:>12.2f} "
+            f"{analyze_time:>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.columns, args.repeat)
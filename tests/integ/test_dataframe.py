@@ -2,6 +2,7 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
+import asyncio
 import datetime
 import json
 import math
@@ -10,12 +11,18 @@ from collections import namedtuple
 from decimal import Decimal
 from itertools import product
 
+import numpy
+import pyarrow
 import pytest
 
 from snowflake.snowpark import Column, Row
 from snowflake.snowpark._internal.analyzer.expression import Attribute, Star
 from snowflake.snowpark._internal.utils import TempObjectType
-from snowflake.snowpark.exceptions import SnowparkColumnException, SnowparkSQLException
+from snowflake.snowpark.exceptions import (
+    SnowparkColumnException,
+    SnowparkQueryCancelledException,
+    SnowparkSQLException,
+)
 from snowflake.snowpark.functions import col, concat, lit, when
 from snowflake.snowpark.types import (
     ArrayType,
@@ -34,7 +41,13 @@ from snowflake.snowpark.types import (
     TimeType,
     VariantType,
 )
-from tests.utils import IS_IN_STORED_PROC_LOCALFS, TestData, TestFiles, Utils
+from tests.utils import (
+    IS_IN_STORED_PROC,
+    IS_IN_STORED_PROC_LOCALFS,
+    TestData,
+    TestFiles,
+    Utils,
+)
 
 
 @pytest.mark.skipif(IS_IN_STORED_PROC_LOCALFS, reason="need resources")
@@ -1056,6 +1069,88 @@ def test_create_dataframe_large_without_batch_insert(session):
         analyzer.ARRAY_BIND_THRESHOLD = original_value
 
 
+def test_create_dataframe_large_with_bulk_load(session):
+    from snowflake.snowpark._internal.analyzer import analyzer
+
+    original_value = analyzer.BULK_LOAD_THRESHOLD
+    try:
+        analyzer.BULK_LOAD_THRESHOLD = 1000
+        data = [
+            [
+                i,
+                i * 0.5,
+                Decimal(i) / 100,
+                str(i) if i % 3 else None,
+                bytearray([i % 256]),
+                i % 2 == 0,
+                [i],
+                datetime.date(2022, 1, 1 + i % 28),
+            ]
+            for i in range(2000)
+        ]
+        schema = StructType(
+            [
+                StructField("a", LongType()),
+                StructField("b", DoubleType()),
+                StructField("c", DecimalType(10, 2)),
+                StructField("d", StringType()),
+                StructField("e", BinaryType()),
+                StructField("f", BooleanType()),
+                StructField("g", ArrayType(LongType())),
+                StructField("h", DateType()),
+            ]
+        )
+        df = session.create_dataframe(data, schema)
+        assert "COPY INTO" in df.queries["queries"][1]
+        Utils.check_answer(
+            df,
+            [
+                Row(
+                    a,
+                    b,
+                    c,
+                    d,
+                    bytes(e),
+                    f,
+                    f"[\n  {g[0]}\n]",
+                    h,
+                )
+                for a, b, c, d, e, f, g, h in data
+            ],
+        )
+    finally:
+        analyzer.BULK_LOAD_THRESHOLD = original_value
+
+
+def test_create_dataframe_from_arrow_table(session):
+    table = pyarrow.table(
+        {
+            "a": pyarrow.array(range(100), pyarrow.int32()),
+            "b": [str(i) if i % 3 else None for i in range(100)],
+            "c": pyarrow.array([bytes([i]) for i in range(100)]),
+            "d": [[i, i + 1] for i in range(100)],
+            "e": pyarrow.array(
+                [datetime.date(2022, 1, 1 + i % 28) for i in range(100)]
+            ),
+        }
+    )
+    df = session.create_dataframe(table)
+    assert df.columns == ['"a"', '"b"', '"c"', '"d"', '"e"']
+    Utils.check_answer(
+        df,
+        [
+            Row(i, str(i) if i % 3 else None, bytes([i]), f"[\n  {i},\n  {i + 1}\n]", d)
+            for i, d in zip(range(100), table.column("e").to_pylist())
+        ],
+    )
+
+    data = numpy.array(
+        [(i, i * 0.5) for i in range(10)], dtype=[("x", "i8"), ("y", "f8")]
+    )
+    df = session.create_dataframe(data, schema=["a", "b"])
+    Utils.check_answer(df, [Row(i, i * 0.5) for i in range(10)])
+
+
 def test_create_dataframe_with_invalid_data(session):
     # None input
     with pytest.raises(ValueError) as ex_info:
@@ -1065,13 +1160,22 @@ def test_create_dataframe_with_invalid_data(session):
     # input other than list and tuple
     with pytest.raises(TypeError) as ex_info:
         session.create_dataframe(1)
-    assert "only accepts data as a list, tuple or a pandas DataFrame" in str(ex_info)
+    assert (
+        "only accepts data as a list, tuple, a NumPy array, a PyArrow Table or a pandas DataFrame"
+        in str(ex_info)
+    )
     with pytest.raises(TypeError) as ex_info:
         session.create_dataframe({1, 2})
-    assert "only accepts data as a list, tuple or a pandas DataFrame" in str(ex_info)
+    assert (
+        "only accepts data as a list, tuple, a NumPy array, a PyArrow Table or a pandas DataFrame"
+        in str(ex_info)
+    )
     with pytest.raises(TypeError) as ex_info:
         session.create_dataframe({"a": 1, "b": 2})
-    assert "only accepts data as a list, tuple or a pandas DataFrame" in str(ex_info)
+    assert (
+        "only accepts data as a list, tuple, a NumPy array, a PyArrow Table or a pandas DataFrame"
+        in str(ex_info)
+    )
     with pytest.raises(TypeError) as ex_info:
         session.create_dataframe(Row(a=1, b=2))
     assert "create_dataframe() function does not accept a Row object" in str(ex_info)
@@ -1639,3 +1743,84 @@ def test_create_table_twice_no_error(session, resources_path):
         df2.join(df3),
         [Row(A=1, C=1.2), Row(A=1, C=2.2), Row(A=2, C=1.2), Row(A=2, C=2.2)],
     )
+
+
+@pytest.mark.parametrize("cte_optimization_enabled", [False, True])
+def test_join_and_union_of_filtered_copies(session, cte_optimization_enabled):
+    session.cte_optimization_enabled = cte_optimization_enabled
+    try:
+        df = session.create_dataframe([[1, 2], [3, 4], [5, 6]], schema=["a", "b"])
+        df = df.filter(col("a") > 1)
+        Utils.check_answer(
+            df.filter(col("a") == 3).union_all(df.filter(col("a") == 5)),
+            [Row(A=3, B=4), Row(A=5, B=6)],
+        )
+        df2 = df.select(col("a").alias("c"))
+        Utils.check_answer(
+            df.join(df2, df["a"] == df2["c"]),
+            [Row(A=3, B=4, C=3), Row(A=5, B=6, C=5)],
+        )
+    finally:
+        session.cte_optimization_enabled = False
+
+
+@pytest.mark.skipif(IS_IN_STORED_PROC, reason="async queries are not supported in SP")
+def test_async_actions(session):
+    df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+    with session.query_history() as history:
+        async_job = df.collect_nowait()
+    assert history.queries[-1].query_id == async_job.query_id
+    assert async_job.result() == [Row(A=1, B=2), Row(A=3, B=4)]
+    assert async_job.is_done()
+    assert df.count(block=False).result() == 2
+    pd_df = df.to_pandas_nowait().result()
+    assert pd_df.values.tolist() == [[1, 2], [3, 4]]
+
+    table_name = Utils.random_name_for_temp_object(TempObjectType.TABLE)
+    async_job = df.write.save_as_table(table_name, create_temp_table=True, block=False)
+    assert async_job.result() is None
+    Utils.check_answer(session.table(table_name), [Row(A=1, B=2), Row(A=3, B=4)])
+
+    async_job = session.sql("select system$wait(60)").collect_nowait()
+    session.cancel_all()
+    with pytest.raises(SnowparkQueryCancelledException):
+        async_job.result()
+
+
+@pytest.mark.skipif(IS_IN_STORED_PROC, reason="async queries are not supported in SP")
+def test_asyncio_actions(session):
+    df = session.create_dataframe([[1, 2], [3, 4]], schema=["a", "b"])
+
+    async def run_actions():
+        rows, pd_df = await asyncio.gather(df.collect_async(), df.to_pandas_async())
+        iterated_rows = [row async for row in df.to_local_iterator_async()]
+        batches = [batch async for batch in df.to_pandas_batches_async()]
+        return rows, pd_df, iterated_rows, batches
+
+    rows, pd_df, iterated_rows, batches = asyncio.run(run_actions())
+    assert rows == iterated_rows == [Row(A=1, B=2), Row(A=3, B=4)]
+    assert pd_df.values.tolist() == [[1, 2], [3, 4]]
+    assert sum(len(batch) for batch in batches) == 2
+
+
+def test_cache_result_reuses_table(session):
+    table_name = Utils.random_name_for_temp_object(TempObjectType.TABLE)
+    session._run_query(f"create temp table {table_name} (num int)")
+    session._run_query(f"insert into {table_name} values (1), (2)")
+    df = session.table(table_name).filter(col("num") > 1)
+    session.cache_result_reuse_enabled = True
+    try:
+        with session.query_history() as history:
+            df1 = df.cache_result()
+            df2 = df.cache_result()
+        assert df1.queries == df2.queries
+        assert len([q for q in history.queries if "CREATE" in q.sql_text.upper()]) == 1
+        Utils.check_answer(df1.join(df2), [Row(2, 2)])
+
+        session._run_query(f"insert into {table_name} values (3)")
+        df3 = df.cache_result()
+        assert df3.queries != df1.queries
+        Utils.check_answer(df1, [Row(2)])
+        Utils.check_answer(df3, [Row(2), Row(3)])
+    finally:
+        session.cache_result_reuse_enabled = False
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+from typing import Iterator
+
+import pyarrow
+import pytest
+
+from snowflake.snowpark._internal.utils import TempObjectType
+from snowflake.snowpark.exceptions import SnowparkFetchDataException
+from snowflake.snowpark.functions import col
+from snowflake.snowpark.types import DecimalType, IntegerType
+from tests.utils import IS_IN_STORED_PROC, Utils
+
+
+@pytest.mark.parametrize("to_arrow_api", ["to_arrow", "to_arrow_batches"])
+def test_to_arrow_cast_integer(session, to_arrow_api):
+    df = session.create_dataframe(
+        [["1", "1" * 20], ["2", "2" * 20]], schema=["a", "b"]
+    ).select(
+        col("a").cast(DecimalType(2, 0)),
+        col("a").cast(DecimalType(18, 0)),
+        col("a").cast(IntegerType()),
+        col("a").cast(DecimalType(10, 2)),
+        col("a"),
+        col("b").cast(IntegerType()),
+    )
+    table = df.to_arrow() if to_arrow_api == "to_arrow" else next(df.to_arrow_batches())
+    assert all(pyarrow.types.is_integer(t) for t in table.schema.types[:3])
+    assert pyarrow.types.is_decimal(table.schema.types[3])
+    assert pyarrow.types.is_string(table.schema.types[4])
+    # A 20-digit number is over int64 max, so it's kept as a decimal
+    assert not pyarrow.types.is_integer(table.schema.types[5])
+
+
+def test_to_arrow_empty_and_non_select(session):
+    table = session.create_dataframe([[1, "a"]], schema=["a", "b"]).limit(0).to_arrow()
+    assert table.num_rows == 0
+    assert table.schema.names == ["A", "B"]
+
+    temp_table_name = Utils.random_name_for_temp_object(TempObjectType.TABLE)
+    for query in ["show tables", f"create temporary table {temp_table_name}(a int)"]:
+        with pytest.raises(SnowparkFetchDataException) as ex_info:
+            session.sql(query).to_arrow()
+        assert "the input query can only be a SELECT statement" in str(ex_info.value)
+
+
+@pytest.mark.skipif(
+    IS_IN_STORED_PROC, reason="SNOW-507565: Need localaws for large result"
+)
+def test_to_arrow_batches(session):
+    df = session.range(100000).cache_result()
+    iterator = df.to_arrow_batches()
+    assert isinstance(iterator, Iterator)
+
+    entire_table = df.to_arrow()
+    tables = list(df.to_arrow_batches())
+    assert len(tables) > 1
+    assert pyarrow.concat_tables(tables).equals(entire_table)
+
+
+def test_collect_columns(session):
+    df = session.sql(
+        "select 1 :: int as a, 1.5 :: number(10, 2) as b, null :: double as c, "
+        "'abc' as d, true as e, '2022-01-01' :: date as f"
+    ).union_all(session.sql("select 2, null, 2.5, null, false, null :: date"))
+    columns = df.sort("a").collect_columns()
+    assert list(columns) == ["A", "B", "C", "D", "E", "F"]
+    assert columns["A"].dtype == "int64"
+    assert columns["A"].tolist() == [1, 2]
+    assert columns["B"].dtype == "float64"
+    assert columns["B"].tolist() == [1.5, None]
+    assert columns["C"].tolist() == [None, 2.5]
+    assert columns["D"].tolist() == ["abc", None]
+    assert columns["E"].dtype == "bool"
+    assert columns["F"].dtype == "datetime64[D]"
+    assert columns["F"].mask.tolist() == [False, True]
+
+    columns = df.limit(0).collect_columns()
+    assert len(columns["A"]) == 0
+
+    with pytest.raises(SnowparkFetchDataException) as ex_info:
+        session.sql("show tables").collect_columns()
+    assert "the input query can only be a SELECT statement" in str(ex_info.value)
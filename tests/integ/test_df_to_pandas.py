@@ -130,3 +130,38 @@ def test_to_pandas_batches(session):
     for df_batch in df.to_pandas_batches():
         assert_frame_equal(df_batch, entire_pandas_df.iloc[: len(df_batch)])
         break
+
+
+@pytest.mark.skipif(
+    IS_IN_STORED_PROC, reason="SNOW-507565: Need localaws for large result"
+)
+def test_to_pandas_batches_with_prefetch(session):
+    df = session.range(100000).cache_result()
+    entire_pandas_df = df.to_pandas()
+    session.result_prefetch_depth = 2
+    try:
+        pandas_df_list = list(df.to_pandas_batches())
+        assert len(pandas_df_list) > 1
+        assert_frame_equal(
+            pd.concat(pandas_df_list, ignore_index=True), entire_pandas_df
+        )
+
+        rows = df.sort("id").to_local_iterator()
+        assert [row[0] for row, _ in zip(rows, range(3))] == [0, 1, 2]
+        # the prefetching thread stops when the iterator is closed early
+        rows.close()
+        assert df.count() == 100000
+    finally:
+        session.result_prefetch_depth = 0
+
+
+@pytest.mark.skipif(
+    IS_IN_STORED_PROC, reason="SNOW-507565: Need localaws for large result"
+)
+def test_to_pandas_with_max_workers(session):
+    df = session.range(100000).select(
+        col("id"), (col("id") * 1.5).alias("f"), col("id").cast("string").alias("s")
+    )
+    df = df.cache_result()
+    assert_frame_equal(df.to_pandas(max_workers=4), df.to_pandas())
+    assert_frame_equal(df.limit(0).to_pandas(max_workers=4), df.limit(0).to_pandas())
@@ -4,6 +4,7 @@
 #
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
@@ -296,3 +297,34 @@ def test_get_current_schema(session):
     check("A", '"A"')
     check('"a b"', '"a b"')
     check('"a""b"', '"a""b"')
+
+
+def test_schema_cache(session):
+    table_name = Utils.random_name_for_temp_object(TempObjectType.TABLE)
+    session.schema_cache_enabled = True
+    try:
+        session.sql(f"create temp table {table_name}(a int)").collect()
+        assert session.table(table_name).columns == ["A"]
+        assert session._schema_cache.cache_info().current_size > 0
+        session.sql(f"alter table {table_name} add column b int").collect()
+        assert session.table(table_name).columns == ["A", "B"]
+    finally:
+        session.schema_cache_enabled = False
+        Utils.drop_table(session, table_name)
+
+
+def test_cursor_pool(session):
+    session.cursor_pool_size = 4
+    try:
+        session.query_tag = "cursor_pool"
+        dfs = [
+            session.sql(f"select {i} as a, current_query_tag() as tag")
+            for i in range(16)
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda df: df.collect(), dfs))
+        # the session state is shared by all cursors
+        assert results == [[Row(A=i, TAG="cursor_pool")] for i in range(16)]
+    finally:
+        session.query_tag = None
+        session.cursor_pool_size = None
@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import datetime
+from decimal import Decimal
+
+import pyarrow
+from pandas import DataFrame as PandasDF
+
+from snowflake.snowpark import Row
+from snowflake.snowpark._internal.utils import TempObjectType
+from snowflake.snowpark.types import (
+    ArrayType,
+    BinaryType,
+    DateType,
+    DecimalType,
+    LongType,
+    StringType,
+    StructField,
+    StructType,
+)
+from tests.utils import Utils
+
+
+def test_write_stream(session):
+    table_name = Utils.random_name_for_temp_object(TempObjectType.TABLE)
+    schema = StructType(
+        [
+            StructField("a", LongType()),
+            StructField("b", StringType()),
+            StructField("c", DecimalType(10, 2)),
+            StructField("d", DateType()),
+            StructField("e", BinaryType()),
+            StructField("f", ArrayType(LongType())),
+        ]
+    )
+
+    def rows(start):
+        return [
+            (
+                i,
+                str(i) if i % 2 else None,
+                Decimal(i) / 4,
+                datetime.date(2022, 1, 1 + i % 28),
+                bytes([i % 256]),
+                [i],
+            )
+            for i in range(start, start + 100)
+        ]
+
+    try:
+        with session.write_stream(
+            table_name,
+            schema,
+            create_temp_table=True,
+            target_file_size=1024,
+            files_per_copy=2,
+        ) as writer:
+            writer.write(rows(0))
+            writer.write(
+                pyarrow.table(
+                    dict(zip(["a", "b", "c", "d", "e", "f"], zip(*rows(100))))
+                )
+            )
+            writer.flush()
+            assert session.table(table_name).count() == 200
+            writer.write(PandasDF(rows(200), columns=["a", "b", "c", "d", "e", "f"]))
+        Utils.check_answer(
+            session.table(table_name),
+            [
+                Row(a, b, c, d, e, f"[\n  {f[0]}\n]")
+                for a, b, c, d, e, f in rows(0) + rows(100) + rows(200)
+            ],
+        )
+    finally:
+        Utils.drop_table(session, table_name)
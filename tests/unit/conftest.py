@@ -0,0 +1,22 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+from unittest import mock
+
+import pytest
+
+from snowflake.snowpark import Session
+from snowflake.snowpark._internal.server_connection import ServerConnection
+
+
+@pytest.fixture
+def mock_server_connection() -> ServerConnection:
+    fake_server_connection = mock.create_autospec(ServerConnection)
+    fake_server_connection._telemetry_client = mock.Mock()
+    fake_server_connection.get_session_id.return_value = 1
+    return fake_server_connection
+
+
+@pytest.fixture
+def mock_session(mock_server_connection) -> Session:
+    return Session(mock_server_connection)
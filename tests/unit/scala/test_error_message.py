@@ -370,6 +370,14 @@ def test_server_failed_fetch_pandas():
     assert ex.message == f"Failed to fetch a Pandas Dataframe. The error is: {message}"
 
 
+def test_server_failed_fetch_arrow():
+    message = "unknown"
+    ex = SnowparkClientExceptionMessages.SERVER_FAILED_FETCH_ARROW(message)
+    assert isinstance(ex, SnowparkFetchDataException)
+    assert ex.error_code == "1412"
+    assert ex.message == f"Failed to fetch an Arrow Table. The error is: {message}"
+
+
 def test_server_udf_upload_file_stream_closed():
     dest_filename = "file"
     ex = SnowparkClientExceptionMessages.SERVER_UDF_UPLOAD_FILE_STREAM_CLOSED(
@@ -3,6 +3,7 @@
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
 import os
+import threading
 import zipfile
 
 import pytest
@@ -12,6 +13,7 @@ from snowflake.snowpark._internal.utils import (
     get_stage_file_prefix_length,
     get_udf_upload_prefix,
     normalize_path,
+    prefetch,
     unwrap_stage_location_single_quote,
     validate_object_name,
     zip_file_or_directory_to_stream,
@@ -351,3 +353,31 @@ def test_get_stage_file_prefix_length():
 
     tableStage = "db.schema.%table/dir"  # dir/
     assert get_stage_file_prefix_length(tableStage) == 4
+
+
+def test_prefetch():
+    assert list(prefetch(iter(range(10)), 0)) == list(range(10))
+    assert list(prefetch(iter(range(10)), 2, batch_size=3)) == list(range(10))
+
+    def failing():
+        yield 1
+        raise ValueError("fetch failed")
+
+    iterator = prefetch(failing(), 2)
+    assert next(iterator) == 1
+    with pytest.raises(ValueError, match="fetch failed"):
+        next(iterator)
+
+    # the thread stops when the consumer closes the iterator early
+    fetched = []
+
+    def source():
+        for i in range(1000):
+            fetched.append(i)
+            yield i
+
+    iterator = prefetch(source(), 2)
+    assert next(iterator) == 0
+    iterator.close()
+    assert len(fetched) <= 4
+    assert not any(t.name == "snowpark-prefetch" for t in threading.enumerate())
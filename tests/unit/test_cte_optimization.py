@@ -0,0 +1,65 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import re
+
+from snowflake.snowpark._internal.analyzer.cte_optimization import (
+    with_common_table_expressions,
+)
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark.functions import col
+from snowflake.snowpark.types import LongType
+
+CTE_NAME_PATTERN = re.compile("SNOWPARK_TEMP_CTE_[0-9A-Z]+")
+
+
+def normalize(sql: str) -> str:
+    names = {}
+    return CTE_NAME_PATTERN.sub(
+        lambda m: names.setdefault(m.group(0), f"CTE{len(names)}"), sql
+    )
+
+
+def test_extract_repeated_subqueries():
+    inner = "SELECT * FROM t"
+    outer = f"SELECT * FROM ({inner}) WHERE a > 1"
+    query = f"({outer}) UNION ({outer}) UNION ({inner})"
+    assert normalize(
+        with_common_table_expressions(query, {inner, outer, "SELECT * FROM u"})
+    ) == (
+        " WITH CTE0 AS (SELECT * FROM t), "
+        "CTE1 AS (SELECT * FROM ( SELECT  *  FROM CTE0) WHERE a > 1)"
+        " SELECT  *  FROM (( SELECT  *  FROM CTE1) UNION ( SELECT  *  FROM CTE1)"
+        " UNION ( SELECT  *  FROM CTE0))"
+    )
+
+
+def test_keep_subqueries_occurring_once():
+    query = "SELECT * FROM (SELECT * FROM t) JOIN (SELECT * FROM t2)"
+    assert (
+        with_common_table_expressions(query, {"SELECT * FROM t", "SELECT * FROM t2"})
+        == query
+    )
+
+
+def test_keep_non_deterministic_subqueries():
+    sample = "SELECT * FROM t SAMPLE (10)"
+    query = f"({sample}) UNION ALL ({sample})"
+    assert with_common_table_expressions(query, {sample}) == query
+
+
+def test_union_of_filtered_copies(mock_session, mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', LongType()),
+    ]
+    mock_session.cte_optimization_enabled = True
+    df = mock_session.table("t").filter(col("a") > 1)
+    query = (
+        df.filter(col("b") == 1)
+        .union_all(df.filter(col("b") == 2))
+        .queries["queries"][-1]
+    )
+    assert query.startswith("WITH ")
+    assert query.count('("A" > 1 :: bigint)') == 1
+    assert len(set(CTE_NAME_PATTERN.findall(query))) == 1
@@ -2,8 +2,15 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
+from unittest import mock
+
 from snowflake.snowpark import DataFrame, DataFrameNaFunctions, DataFrameStatFunctions
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.analyzer.snowflake_plan import Query
+from snowflake.snowpark._internal.utils import deterministic_names
 from snowflake.snowpark.dataframe import _get_unaliased
+from snowflake.snowpark.functions import col
+from snowflake.snowpark.types import LongType, StringType
 
 
 def test_get_unaliased():
@@ -76,3 +83,64 @@ def test_dataframe_method_alias():
     assert (
         DataFrameStatFunctions.approxQuantile == DataFrameStatFunctions.approx_quantile
     )
+
+
+def test_lazy_analysis_defers_resolution(mock_session):
+    mock_session.lazy_analysis_enabled = True
+    base = mock_session.sql("select 1 as a, 2 as b")
+    with mock.patch.object(
+        mock_session._analyzer, "resolve", wraps=mock_session._analyzer.resolve
+    ) as resolve:
+        df = base.filter(col("a") > 1).select(col("a"), col("b")).sort(col("b"))
+        resolve.assert_not_called()
+        lazy_queries = df.queries
+        resolve_count = resolve.call_count
+        assert resolve_count > 0
+        # the resolved plan is reused by later actions
+        assert df.queries == lazy_queries
+        assert resolve.call_count == resolve_count
+
+    mock_session.lazy_analysis_enabled = False
+    eager_df = base.filter(col("a") > 1).select(col("a"), col("b")).sort(col("b"))
+    assert eager_df.queries == lazy_queries
+
+
+def test_lazy_analysis_resolves_shared_subtree_once(mock_session):
+    mock_session.lazy_analysis_enabled = True
+    shared = mock_session.sql("select 1 as a").filter(col("a") > 0)
+    df = shared.filter(col("a") > 1).union_all(shared.filter(col("a") < 1))
+    with mock.patch.object(
+        mock_session._analyzer,
+        "_resolve_plan",
+        wraps=mock_session._analyzer._resolve_plan,
+    ) as resolve_plan:
+        df.queries
+    resolved_nodes = [call.args[0] for call in resolve_plan.call_args_list]
+    assert len(resolved_nodes) == len({id(node) for node in resolved_nodes})
+    assert shared._logical_plan in resolved_nodes
+
+
+def test_deterministic_names(mock_session, mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', StringType()),
+    ]
+
+    def build():
+        df1 = mock_session.create_dataframe([[1, "a"]], schema=["a", "b"])
+        df2 = mock_session.create_dataframe([[2, "b"]], schema=["a", "b"])
+        return df1.join(df2, df1["a"] == df2["a"]).drop_duplicates()
+
+    assert build().queries != build().queries
+    mock_session.deterministic_names_enabled = True
+    assert build().queries == build().queries
+    # the names depend on the content they're generated for
+    df = mock_session.create_dataframe([[1, "a"]], schema=["a", "b"])
+    other = mock_session.create_dataframe([[1, "x"]], schema=["a", "b"])
+    assert df.queries != other.queries
+
+
+def test_query_id_placeholders_of_same_sql_are_distinct():
+    with deterministic_names(True):
+        first, second = Query("show tables"), Query("show tables")
+    assert first.query_id_place_holder != second.query_id_place_holder
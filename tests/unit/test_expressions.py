@@ -7,9 +7,17 @@ import decimal
 
 import pytest
 
-from snowflake.snowpark._internal.analyzer.expression import Literal
+from snowflake.snowpark._internal.analyzer.expression import (
+    Attribute,
+    Expression,
+    Literal,
+)
+from snowflake.snowpark._internal.analyzer.snowflake_plan_node import LogicalPlan
+from snowflake.snowpark._internal.analyzer.unary_plan_node import Filter
 from snowflake.snowpark._internal.type_utils import PYTHON_TO_SNOW_TYPE_MAPPINGS
 from snowflake.snowpark.exceptions import SnowparkPlanException
+from snowflake.snowpark.functions import col, sum as sum_
+from snowflake.snowpark.types import LongType
 
 
 def test_literal():
@@ -35,3 +43,29 @@ def test_literal():
         with pytest.raises(SnowparkPlanException) as ex_info:
             Literal(d)
         assert "Cannot create a Literal" in str(ex_info)
+
+
+def _subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def test_expressions_and_plan_nodes_have_slots():
+    for base in (Expression, LogicalPlan):
+        for cls in [base, *_subclasses(base)]:
+            # the resolved SnowflakePlan keeps its cached attributes in __dict__
+            if cls.__name__ != "SnowflakePlan":
+                assert not cls.__dictoffset__, cls
+
+    expr = (col("a") + sum_(col("b")).over()).alias("c")._expression
+    assert not hasattr(expr, "__dict__")
+    assert isinstance(expr.children, tuple)
+    assert isinstance(expr.child.children, tuple)
+
+    a = Attribute('"A"', LongType())
+    b = a.with_name('"B"')
+    assert isinstance(a.expr_id, int) and b.expr_id != a.expr_id
+    assert a.with_name('"A"') is a
+    node = Filter(expr, LogicalPlan())
+    assert node.children == (node.child,)
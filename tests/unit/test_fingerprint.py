@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import pytest
+
+from snowflake.connector.options import pyarrow
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.analyzer.fingerprint import fingerprint
+from snowflake.snowpark.functions import col, lit
+from snowflake.snowpark.types import LongType, StringType
+
+
+@pytest.fixture
+def attributes(mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', StringType()),
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_fingerprint_of_separately_built_dataframes(mock_session, attributes, lazy):
+    mock_session.lazy_analysis_enabled = lazy
+
+    def build(value=1, how="inner"):
+        df1 = mock_session.create_dataframe([[1, "a"]], schema=["a", "b"])
+        df2 = mock_session.table("t").select(col("a"), lit(value).alias("b"))
+        # the columns of both sides are disambiguated with random prefixes
+        return df1.join(df2, df1["a"] == df2["a"], how).sort(df1["b"])
+
+    assert build().queries != build().queries
+    assert build().fingerprint == build().fingerprint
+    assert build().fingerprint != build(2).fingerprint
+    assert build().fingerprint != build(how="left").fingerprint
+
+
+def test_fingerprint_distinguishes_columns_of_join_sides(mock_session, attributes):
+    df1 = mock_session.table("t")
+    df2 = mock_session.table("t")
+    joined = df1.join(df2, df1["a"] == df2["a"])
+    assert joined.select(df1["b"]).fingerprint != joined.select(df2["b"]).fingerprint
+    assert joined.select(df1["b"]).fingerprint == joined.select(df1["b"]).fingerprint
+
+
+def test_fingerprint_of_lazily_analyzed_dataframe(mock_session, attributes):
+    df = mock_session.table("t").filter(col("a") > 1)
+    mock_session.lazy_analysis_enabled = True
+    lazy_df = mock_session.table("t").filter(col("a") > 1)
+    assert lazy_df._resolved_plan is None
+    assert lazy_df.fingerprint == df.fingerprint
+    # computing the fingerprint doesn't resolve the plan
+    assert lazy_df._resolved_plan is None
+
+
+def test_fingerprint_of_data_and_sql(mock_session, attributes):
+    def values(*rows):
+        return mock_session.create_dataframe(list(rows), schema=["a", "b"])
+
+    assert values([1, "a"]).fingerprint == values([1, "a"]).fingerprint
+    assert values([1, "a"]).fingerprint != values([1, "b"]).fingerprint
+    table = pyarrow.table({"A": [1, 2], "B": ["a", "b"]})
+    assert (
+        mock_session.create_dataframe(table).fingerprint
+        == mock_session.create_dataframe(table.slice(0)).fingerprint
+    )
+    assert (
+        mock_session.create_dataframe(table).fingerprint
+        != mock_session.create_dataframe(table.slice(1)).fingerprint
+    )
+    assert (
+        mock_session.sql("select 1").fingerprint
+        == mock_session.sql("select 1").fingerprint
+    )
+    assert (
+        mock_session.sql("select 1").fingerprint
+        != mock_session.sql("select 2").fingerprint
+    )
+
+
+def test_fingerprint_of_expressions():
+    assert fingerprint((col("a") + 1)._expression) == fingerprint(
+        (col("a") + 1)._expression
+    )
+    assert fingerprint((col("a") + 1)._expression) != fingerprint(
+        (col("a") + 2)._expression
+    )
+    assert fingerprint(col("a").alias("x")._expression) != fingerprint(
+        col("a").alias("y")._expression
+    )
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import gc
+import time
+
+import pytest
+
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark.functions import random
+from snowflake.snowpark.query_history import QueryRecord
+from snowflake.snowpark.types import LongType
+
+
+@pytest.fixture
+def reuse(mock_session, mock_server_connection):
+    mock_server_connection._session_context.return_value = ("R", "W", "D", "S")
+    mock_session.cache_result_reuse_enabled = True
+
+
+def _created_tables(mock_server_connection):
+    return [
+        call[0][0].queries[-1].sql
+        for call in mock_server_connection.execute.call_args_list
+    ]
+
+
+def _table_name(df):
+    return df._plan.queries[-1].sql.split()[-1].strip("()")
+
+
+def test_cache_result_takes_new_snapshot(mock_session, mock_server_connection):
+    df = mock_session.table("t").filter("a > 1")
+    assert _table_name(df.cache_result()) != _table_name(df.cache_result())
+    assert len(_created_tables(mock_server_connection)) == 2
+
+
+def test_cache_result_reuses_table(mock_session, mock_server_connection, reuse):
+    df = mock_session.table("t").filter("a > 1")
+    cached = df.cache_result()
+    assert cached.is_cached
+    table_name = _table_name(cached)
+    # the same plan is cached once, with one CTAS statement
+    assert _table_name(df.cache_result()) == table_name
+    # a separately built DataFrame with the same fingerprint reuses the table too
+    assert _table_name(mock_session.table("t").filter("a > 1").cache_result()) == (
+        table_name
+    )
+    (create_sql,) = _created_tables(mock_server_connection)
+    assert create_sql.startswith(" CREATE  TEMPORARY  TABLE  SNOWPARK_TEMP_TABLE_")
+    assert " AS  SELECT" in create_sql
+    assert "a > 1" in create_sql
+
+    # the plan is cached again after a table it reads is changed, or in another context
+    mock_session._materializations._add_query(QueryRecord("1", "update u set a = 1"))
+    assert _table_name(df.cache_result()) == table_name
+    mock_session._materializations._add_query(
+        QueryRecord("2", "insert into T values (1)")
+    )
+    assert _table_name(df.cache_result()) != table_name
+    mock_server_connection._session_context.return_value = ("R", "W", "D", "S2")
+    df.cache_result()
+    assert len(_created_tables(mock_server_connection)) == 3
+
+
+def test_join_reused_tables(mock_session, mock_server_connection, reuse):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType())
+    ]
+    df = mock_session.table("t")
+    cached1 = df.cache_result()
+    cached2 = df.cache_result()
+    assert _table_name(cached1) == _table_name(cached2)
+    assert cached1._plan is not cached2._plan
+    cached1.join(cached2, cached1["a"] == cached2["a"])
+
+
+def test_non_deterministic_plan_is_cached_again(
+    mock_session, mock_server_connection, reuse
+):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType())
+    ]
+    df = mock_session.table("t")
+    for non_deterministic in [
+        df.sample(frac=0.1),
+        df.select(random().alias("r")),
+        df.filter("created < current_timestamp()"),
+    ]:
+        assert _table_name(non_deterministic.cache_result()) != _table_name(
+            non_deterministic.cache_result()
+        )
+    assert len(_created_tables(mock_server_connection)) == 6
+
+
+def test_unreferenced_table_is_kept(mock_session, mock_server_connection, reuse):
+    df = mock_session.table("t")
+    table_name = _table_name(df.cache_result())
+    gc.collect()
+    time.sleep(0.1)
+    mock_server_connection.submit_query.assert_not_called()
+    # the table may still be read by a view or SQL text, so it's reused
+    assert _table_name(df.cache_result()) == table_name
+    assert len(_created_tables(mock_server_connection)) == 1
+
+
+def _wait_for_drop(mock_server_connection):
+    for _ in range(50):
+        if mock_server_connection.submit_query.called:
+            break
+        time.sleep(0.1)
+
+
+def test_unreferenced_table_is_dropped(mock_session, mock_server_connection, reuse):
+    mock_session.cache_result_auto_drop_enabled = True
+    df = mock_session.table("t")
+    cached = df.cache_result()
+    derived = cached.filter("a > 1")
+    # another plan is returned for the same table, which is counted separately
+    other = df.cache_result()
+    table_name = _table_name(cached)
+    assert _table_name(other) == table_name
+    del cached, other
+    gc.collect()
+    time.sleep(0.1)
+    mock_server_connection.submit_query.assert_not_called()
+
+    del derived
+    gc.collect()
+    _wait_for_drop(mock_server_connection)
+    mock_server_connection.submit_query.assert_called_once()
+    assert mock_server_connection.submit_query.call_args[0][0].endswith(table_name)
+    # a dropped table isn't reused
+    assert _table_name(df.cache_result()) != table_name
+    mock_session._materializations.close()
+
+
+def test_non_select_statement_is_cached_again(
+    mock_session, mock_server_connection, reuse
+):
+    mock_server_connection.get_result_attributes.return_value = []
+    df = mock_session.sql("show tables")
+    assert _table_name(df.cache_result()) != _table_name(df.cache_result())
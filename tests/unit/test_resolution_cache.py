@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import gc
+from concurrent.futures import ThreadPoolExecutor
+
+from snowflake.snowpark._internal.analyzer.resolution_cache import ResolutionCache
+from snowflake.snowpark._internal.analyzer.snowflake_plan_node import (
+    LogicalPlan,
+    UnresolvedRelation,
+)
+from snowflake.snowpark.functions import col
+
+
+def test_lru_eviction():
+    cache = ResolutionCache(max_size=2)
+    nodes = [LogicalPlan() for _ in range(3)]
+    for i, node in enumerate(nodes):
+        cache.put(node, f"plan{i}", {}, [])
+    assert len(cache) == 2
+    assert cache.get(nodes[0]) is None
+    assert cache.get(nodes[1])[0] == "plan1"
+    assert cache.get(nodes[2])[0] == "plan2"
+    # evicted entries are removed from the node
+    assert not hasattr(nodes[0], ResolutionCache._ENTRY_ATTR)
+    assert cache.cache_info() == (2, 1, 2, 2)
+
+
+def test_entry_released_with_node():
+    cache = ResolutionCache()
+    node = UnresolvedRelation("t")
+    # a resolved plan references its source plan, which must not keep it alive
+    cache.put(node, node, {}, [])
+    assert len(cache) == 1
+    del node
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_concurrent_access():
+    cache = ResolutionCache(max_size=8)
+    nodes = [LogicalPlan() for _ in range(32)]
+
+    def access(offset):
+        for i in range(2000):
+            node = nodes[(offset + i) % len(nodes)]
+            if cache.get(node) is None:
+                cache.put(node, "plan", {}, [])
+            # nodes that are collected while other threads evict entries
+            cache.put(LogicalPlan(), "plan", {}, [])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(access, range(4)))
+    assert len(cache) <= 8
+    info = cache.cache_info()
+    assert info.hits + info.misses == 8000
+
+
+def test_shared_subtree_is_resolved_once(mock_session):
+    mock_session.lazy_analysis_enabled = True
+    cache = mock_session._analyzer.resolution_cache
+    shared = mock_session.table("t").filter(col("a") > 0)
+    shared_node = shared._logical_plan
+    df1 = shared.select(col("a"))
+    df2 = shared.select(col("b"))
+    cache.clear()
+
+    df1.queries
+    misses = cache.misses
+    df2.queries
+    assert cache.hits >= 1
+    # only the select on top of the shared subtree is resolved for df2
+    assert cache.misses == misses + 1
+    settings = mock_session._analyzer.resolution_settings()
+    assert shared._plan is cache.get(shared_node, settings)[0]
+
+
+def test_session_settings_are_part_of_entries(mock_session):
+    mock_session.lazy_analysis_enabled = True
+    df = mock_session.table("t").select(col("a")).filter(col("a") > 1)
+    node = df._logical_plan
+    queries = df.queries
+    info = mock_session.resolution_cache_info()
+    assert info.current_size > 0
+    assert mock_session._analyzer.resolve(node) is df._plan
+    assert mock_session.resolution_cache_info().hits == info.hits + 1
+
+    # a plan resolved with other settings isn't reused
+    for setting in (
+        "sql_simplifier_enabled",
+        "cte_optimization_enabled",
+        "deterministic_names_enabled",
+    ):
+        setattr(mock_session, setting, True)
+        misses = mock_session.resolution_cache_info().misses
+        mock_session._analyzer.resolve(node)
+        assert mock_session.resolution_cache_info().misses > misses
+        setattr(mock_session, setting, False)
+    mock_session.sql_simplifier_enabled = True
+    assert mock_session._analyzer.resolve(node).queries[-1].sql.count(
+        "SELECT"
+    ) < queries["queries"][-1].count("SELECT")
@@ -0,0 +1,173 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import datetime
+import threading
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from snowflake.connector.cursor import SnowflakeCursor
+from snowflake.connector.options import pandas, pyarrow
+from snowflake.snowpark._internal import result_cache
+from snowflake.snowpark._internal.analyzer.snowflake_plan import Query
+from snowflake.snowpark._internal.result_cache import ResultCache
+from snowflake.snowpark._internal.server_connection import ServerConnection
+from snowflake.snowpark.query_history import QueryRecord
+from snowflake.snowpark.row import Row
+
+ROWS = [(1, "a", Decimal("1.5"), datetime.date(2022, 1, 1), None)]
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        pandas.DataFrame({"A": [1, 2], "B": ["x", None]}),
+        pyarrow.table({"A": [1, 2], "B": ["x", None]}),
+    ],
+)
+def test_spill_to_disk(tmp_path, result):
+    cache = ResultCache(max_memory_size=0, disk_cache_dir=str(tmp_path))
+    cache.put("key", "select * from t", result, [], cache.version)
+    info = cache.cache_info()
+    assert (info.memory_entries, info.disk_entries) == (0, 1)
+    assert info.disk_size > 0
+
+    cached, _ = cache.get("key")
+    assert cached.equals(result)
+    assert cache.cache_info()[:3] == (1, 1, 0)
+
+    cache.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_evicted_rows_are_not_spilled(tmp_path):
+    # the types of the values wouldn't survive a round trip through Arrow
+    rows = [
+        (
+            bytearray(b"x"),
+            datetime.datetime(
+                2022, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=2))
+            ),
+        )
+    ]
+    cache = ResultCache(max_memory_size=0, disk_cache_dir=str(tmp_path))
+    cache.put("key", "select * from t", rows, [], cache.version)
+    assert cache.cache_info().disk_entries == 0
+    assert cache.get("key") is None
+    assert not list(tmp_path.glob("*/*"))
+
+
+def test_spill_without_holding_lock(tmp_path, monkeypatch):
+    cache = ResultCache(max_memory_size=0, disk_cache_dir=str(tmp_path))
+    to_arrow_table = result_cache._result_to_arrow_table
+    acquired = []
+
+    def result_to_arrow_table(result):
+        # another thread can use the cache while the file is written
+        thread = threading.Thread(
+            target=lambda: acquired.append(cache._lock.acquire(timeout=5))
+            or cache._lock.release()
+        )
+        thread.start()
+        thread.join()
+        # the cache is invalidated meanwhile
+        cache.invalidate("t")
+        return to_arrow_table(result)
+
+    monkeypatch.setattr(result_cache, "_result_to_arrow_table", result_to_arrow_table)
+    cache.put("key", "select * from t", pyarrow.table({"A": [1]}), [], cache.version)
+    assert acquired == [True]
+    # the file of a result invalidated while it's written is removed
+    assert cache.cache_info().disk_entries == 0
+    assert not list(tmp_path.glob("*/*"))
+
+
+def test_lru_eviction_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl=10, max_memory_size=2 * result_cache._result_size(ROWS))
+    for i in range(3):
+        cache.put(i, f"select {i}", ROWS, [], cache.version)
+    assert cache.get(0) is None
+    assert cache.get(1)[0] == ROWS
+    # the returned list is a copy
+    cache.get(2)[0].clear()
+    assert cache.get(2)[0] == ROWS
+
+    now[0] = 11
+    assert cache.get(1) is None
+    assert len(cache) == 1
+    assert cache.cache_info()[:3] == (3, 0, 2)
+
+
+def test_invalidation():
+    cache = ResultCache()
+    cache.put("t", 'select * from db.schema.t join "u" using (a)', ROWS, [], 0)
+    cache.put("v", 'select * from "V"', ROWS, [], 0)
+
+    # a result fetched while the cache was invalidated is not cached
+    cache.invalidate("x")
+    cache.put("x", "select * from x", ROWS, [], 0)
+    assert cache.get("x") is None
+
+    for sql in [
+        "select * from t",
+        "alter session set query_tag = 'tag'",
+        "create temp table SNOWPARK_TEMP_TABLE_ABC(a int)",
+        "insert into U values (1)",
+    ]:
+        cache._add_query(QueryRecord("id", sql))
+    assert len(cache) == 2
+
+    cache._add_query(QueryRecord("id", 'insert into "u" values (1)'))
+    assert cache.get("t") is None
+    assert cache.get("v") is not None
+
+    cache.invalidate('"DB"."SCHEMA".v')
+    assert cache.get("v") is None
+
+    cache.put("t", "select * from t", ROWS, [], cache.version)
+    # the target of the statement is unknown
+    cache._add_query(QueryRecord("id", "call proc()"))
+    assert len(cache) == 0
+
+
+def test_execute_with_result_cache():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    cursor = mock.MagicMock(spec=SnowflakeCursor)
+    cursor.execute.return_value = cursor
+    cursor.fetchall.return_value = [(1,)]
+    cursor.description = None
+    cursor.query = cursor.sfqid = None
+    conn.cursor.return_value = cursor
+    server_connection = ServerConnection({}, conn)
+
+    plan = mock.Mock()
+    plan.session.pipelined_execution_enabled = False
+    plan.session._generate_new_action_id.return_value = 1
+    plan.session._last_canceled_id = 0
+    plan.session._result_cache = ResultCache()
+    plan.session._result_spill_threshold = None
+    plan.queries = [Query("select 1")]
+    plan.post_actions = []
+
+    assert server_connection.execute(plan) == [Row(1)]
+    assert server_connection.execute(plan) == [Row(1)]
+    assert cursor.execute.call_count == 1
+
+    # the context of the session is a part of the key
+    conn.role = "other_role"
+    assert server_connection.execute(plan) == [Row(1)]
+    assert cursor.execute.call_count == 2
+
+    # iterators are not cached
+    server_connection.execute(plan, to_iter=True)
+    assert cursor.execute.call_count == 3
+
+    plan.queries = [Query("insert into t values (1)")]
+    server_connection.execute(plan)
+    server_connection.execute(plan)
+    assert cursor.execute.call_count == 5
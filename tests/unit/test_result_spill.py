@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from snowflake.connector.constants import FIELD_NAME_TO_ID
+from snowflake.connector.cursor import ResultMetadata
+from snowflake.connector.options import pandas, pyarrow
+from snowflake.snowpark._internal.analyzer.snowflake_plan import Query
+from snowflake.snowpark._internal.result_spill import SpilledRows, spill_arrow_batches
+from snowflake.snowpark._internal.server_connection import ServerConnection
+from snowflake.snowpark.row import Row
+
+DESCRIPTION = [
+    ResultMetadata("A", FIELD_NAME_TO_ID["FIXED"], None, None, 38, 0, False),
+    ResultMetadata("B", FIELD_NAME_TO_ID["TEXT"], None, None, None, None, True),
+]
+
+
+def _table(start: int, num_rows: int = 2) -> "pyarrow.Table":
+    return pyarrow.table(
+        {
+            "A": pyarrow.array(range(start, start + num_rows), pyarrow.int64()),
+            "B": [str(i) for i in range(start, start + num_rows)],
+        }
+    )
+
+
+def test_spill_arrow_batches(tmp_path):
+    tables = [_table(0), _table(2)]
+    assert spill_arrow_batches(iter(tables), tables[0].nbytes * 2) == tables
+
+    narrow = _table(4).cast(
+        pyarrow.schema([("A", pyarrow.int8()), ("B", pyarrow.string())])
+    )
+    spilled = spill_arrow_batches(
+        iter(tables + [narrow]), tables[0].nbytes, str(tmp_path)
+    )
+    assert spilled.equals(pyarrow.concat_tables(tables + [_table(4)]))
+    # the file is removed once it's mapped
+    assert not list(tmp_path.iterdir())
+
+
+def test_spilled_rows():
+    rows = SpilledRows(pyarrow.concat_tables([_table(0), _table(2, 3)]), DESCRIPTION)
+    expected = [Row(A=i, B=str(i)) for i in range(5)]
+    assert len(rows) == 5
+    assert rows == expected
+    assert list(rows) == expected
+    assert rows[2] == expected[2]
+    assert rows[-1].B == "4"
+    assert rows[1:4] == expected[1:4]
+    with pytest.raises(IndexError):
+        rows[5]
+
+
+@pytest.mark.parametrize("to_pandas", [False, True])
+def test_execute_with_spill(to_pandas):
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    cursor = server_connection._cursor
+    cursor.execute.return_value = cursor
+    cursor.description = DESCRIPTION
+    cursor.query = cursor.sfqid = None
+
+    plan = mock.Mock()
+    plan.session.pipelined_execution_enabled = False
+    plan.session._generate_new_action_id.return_value = 1
+    plan.session._last_canceled_id = 0
+    plan.session._result_cache = None
+    plan.queries = [Query("select * from t")]
+    plan.post_actions = []
+
+    tables = [_table(0), _table(2)]
+    # the result is fetched as Arrow batches when their uncompressed size, which is
+    # larger than the size of the Arrow tables, exceeds the threshold
+    cursor.get_result_batches.return_value = [
+        mock.Mock(uncompressed_size=table.nbytes * 2) for table in tables
+    ]
+    for threshold, spilled in [(tables[0].nbytes * 2, False), (0, True)]:
+        plan.session._result_spill_threshold = threshold
+        cursor.fetch_arrow_batches.return_value = iter(tables)
+        result = server_connection.execute(plan, to_pandas=to_pandas)
+        cursor.fetchall.assert_not_called()
+        if to_pandas:
+            assert isinstance(result, pandas.DataFrame)
+            assert result["A"].tolist() == [0, 1, 2, 3]
+        else:
+            assert isinstance(result, SpilledRows) is spilled
+            assert result == [Row(A=i, B=str(i)) for i in range(4)]
+
+
+def test_collect_with_spill_keeps_value_types():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    cursor = server_connection._cursor
+    cursor.execute.return_value = cursor
+    cursor.description = [
+        ResultMetadata("T", FIELD_NAME_TO_ID["TIMESTAMP_NTZ"], None, None, 0, 9, True),
+        ResultMetadata("B", FIELD_NAME_TO_ID["BINARY"], None, None, None, None, True),
+        ResultMetadata("D", FIELD_NAME_TO_ID["FIXED"], None, None, 10, 2, True),
+    ]
+    cursor.query = cursor.sfqid = None
+    timestamp = datetime.datetime(2022, 1, 2, 3, 4, 5, 123456)
+    # the rows fetched by the connector and the same result as an Arrow table
+    cursor.fetchall.return_value = [(timestamp, bytearray(b"x"), Decimal("1.50"))]
+    table = pyarrow.table(
+        {
+            "T": pyarrow.array([timestamp], pyarrow.timestamp("ns")),
+            "B": pyarrow.array([b"x"], pyarrow.binary()),
+            "D": pyarrow.array([Decimal("1.50")], pyarrow.decimal128(10, 2)),
+        }
+    )
+    cursor.get_result_batches.return_value = [mock.Mock(uncompressed_size=100)]
+
+    plan = mock.Mock()
+    plan.session.pipelined_execution_enabled = False
+    plan.session._generate_new_action_id.return_value = 1
+    plan.session._last_canceled_id = 0
+    plan.session._result_cache = None
+    plan.queries = [Query("select * from t")]
+    plan.post_actions = []
+
+    def collect(threshold):
+        plan.session._result_spill_threshold = threshold
+        cursor.fetch_arrow_batches.return_value = iter([table])
+        return server_connection.execute(plan)
+
+    fetched = collect(None)
+    # below the threshold, the rows are fetched by the connector
+    below = collect(1000)
+    assert cursor.fetchall.call_count == 2
+    spilled = collect(0)
+    assert isinstance(spilled, SpilledRows)
+    for rows in (below, spilled, spilled[:1]):
+        assert list(rows) == fetched
+        assert [type(v) for v in rows[0]] == [type(v) for v in fetched[0]]
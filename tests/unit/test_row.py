@@ -204,3 +204,21 @@ def test_mul_rmul(row):
 
 def test_aliases():
     assert Row.asDict == Row.as_dict
+
+
+def test_rows_share_schema():
+    row_class = Row._with_fields(["a", "b", "a"])
+    rows = [row_class._make((i, i + 1, i + 2)) for i in range(3)]
+    assert all(type(r) is row_class for r in rows)
+    assert row_class is Row._with_fields(("a", "b", "a"))
+    assert not hasattr(rows[0], "__dict__")
+    assert rows[1]["a"] == rows[1].a == 1
+    assert rows[1].b == 2
+    assert rows[1]._named_values is None
+    assert rows[1] == Row(1, 2, 3)
+
+    row = Row(1, 2)
+    row._fields = ["x", "y"]
+    assert type(row) is Row._with_fields(["x", "y"])
+    assert row.as_dict() == {"x": 1, "y": 2}
+    assert type(Row(x=3, y=4)) is type(row)
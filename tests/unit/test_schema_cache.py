@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import pytest
+
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.analyzer.schema_cache import (
+    SchemaCache,
+    is_schema_changing_statement,
+)
+from snowflake.snowpark.functions import col
+from snowflake.snowpark.query_history import QueryRecord
+from snowflake.snowpark.types import LongType
+
+
+def test_lru_eviction():
+    cache = SchemaCache(max_size=2)
+    for i in range(3):
+        cache.put(f"select {i}", [Attribute(f'"{i}"', LongType())])
+    assert len(cache) == 2
+    assert cache.get("select 0") is None
+    assert cache.get("select 1")[0].name == '"1"'
+    # the query text is normalized
+    assert cache.get("  select 2;\n")[0].name == '"2"'
+    assert cache.cache_info() == (2, 1, 2, 2)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("select * from t", False),
+        ("insert into t values (1)", False),
+        ("alter table t add column c int", True),
+        ("CREATE OR REPLACE TABLE t (a int)", True),
+        ("drop view v", True),
+        ("use schema s", True),
+        ("alter session set timestamp_type_mapping = 'TIMESTAMP_LTZ'", True),
+        ("alter session set query_tag = 'tag'", False),
+        ("alter session unset query_tag", False),
+        (" CREATE  TEMPORARY  TABLE SNOWPARK_TEMP_TABLE_ABC(a int)", False),
+        ("DROP  TABLE  IF  EXISTS  SNOWPARK_TEMP_TABLE_ABC", False),
+        ("create table t as select * from SNOWPARK_TEMP_TABLE_ABC", True),
+    ],
+)
+def test_is_schema_changing_statement(query, expected):
+    assert is_schema_changing_statement(query) is expected
+
+
+def test_repeated_pipeline_is_described_once(mock_session, mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', LongType()),
+    ]
+    mock_session.schema_cache_enabled = True
+    mock_server_connection.add_query_listener.assert_called_once_with(
+        mock_session._schema_cache
+    )
+
+    def build():
+        df = mock_session.sql("select a, b from t")
+        return df.select(df["a"]).filter(col("a") > 0)
+
+    build().schema
+    call_count = mock_server_connection.get_result_attributes.call_count
+    assert call_count > 0
+    build().schema
+    assert mock_server_connection.get_result_attributes.call_count == call_count
+
+    # ddl executed in the session invalidates the cache
+    mock_session._schema_cache._add_query(
+        QueryRecord("id", "alter table t add column c int")
+    )
+    build().schema
+    assert mock_server_connection.get_result_attributes.call_count > call_count
+
+    mock_session.schema_cache_enabled = False
+    mock_server_connection.remove_query_listener.assert_called_once_with(
+        mock_session._schema_cache
+    )
+    assert len(mock_session._schema_cache) == 0
@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import pytest
+
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark.functions import col, sql_expr, upper
+from snowflake.snowpark.types import LongType, StringType
+
+
+@pytest.fixture
+def describe(mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType(), nullable=False),
+        Attribute('"B"', StringType()),
+    ]
+    return mock_server_connection.get_result_attributes
+
+
+def test_infer_attributes_of_projection_and_filters(mock_session, describe):
+    df = mock_session.sql("select a, b from t")
+    df = (
+        df.filter(col("a") > 1)
+        .sort(col("b"))
+        .limit(10)
+        .sample(n=5)
+        .select(df["a"], col("b").alias("c"), "*")
+    )
+    attributes = df._plan.attributes
+    assert [(a.name, a.datatype, a.nullable) for a in attributes] == [
+        ('"A"', LongType(), False),
+        ('"C"', StringType(), True),
+        ('"A"', LongType(), False),
+        ('"B"', StringType(), True),
+    ]
+    # only the query of the source is described
+    describe.assert_called_once_with("select a, b from t")
+
+
+def test_infer_attributes_of_union(mock_session, describe):
+    df = mock_session.sql("select a, b from t")
+    assert df.union_all(df.filter(col("a") > 1)).columns == ["A", "B"]
+    assert describe.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "column", [upper(col("b")), sql_expr("b || 'x'"), col("a").alias("c") + 1]
+)
+def test_fall_back_to_describe(mock_session, describe, column):
+    df = mock_session.sql("select a, b from t").select(column)
+    df.schema
+    # the projection is described without describing its child
+    describe.assert_called_once()
+    assert describe.call_args[0][0] != "select a, b from t"
+
+
+def test_fall_back_to_describe_for_unknown_column(mock_session, describe):
+    df = mock_session.sql("select a, b from t").select(col("d"))
+    df.schema
+    assert describe.call_count == 2
@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import pytest
+
+from snowflake.snowpark import Window
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark.functions import col, lit, rank, sql_expr, sum as sum_, upper
+from snowflake.snowpark.types import LongType
+
+
+@pytest.fixture
+def df(mock_session, mock_server_connection):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', LongType()),
+    ]
+    mock_session.sql_simplifier_enabled = True
+    return mock_session.sql("select a, b from t")
+
+
+def last_query(df) -> str:
+    return df.queries["queries"][-1]
+
+
+def test_merge_filters_and_projections(df):
+    df = df.filter(col("a") > 1).select(col("a"), col("b")).filter(col("b") < 3)
+    assert last_query(df) == (
+        'SELECT "A", "B" FROM (select a, b from t) '
+        'WHERE (("A" > 1 :: bigint)) AND (("B" < 3 :: bigint))'
+    )
+    df = df.select((col("a") + col("b")).alias("c"))
+    assert last_query(df) == (
+        'SELECT ("A" + "B") AS "C" FROM (select a, b from t) '
+        'WHERE (("A" > 1 :: bigint)) AND (("B" < 3 :: bigint))'
+    )
+
+
+def test_merge_projection_of_computed_columns(df):
+    df = df.select(col("a"), (col("b") + 1).alias("c"))
+    df = df.select(col("c"), upper(col("a")).alias("d"))
+    assert last_query(df) == (
+        'SELECT ("B" + 1 :: bigint) AS "C", upper("A") AS "D" '
+        "FROM (select a, b from t)"
+    )
+
+
+@pytest.mark.parametrize(
+    "transform",
+    [
+        # depends on an alias of the child
+        lambda df: df.select(col("a"), (col("b") + 1).alias("c")).select(
+            (col("c") + 1).alias("d")
+        ),
+        # can't be evaluated before a window function
+        lambda df: df.select(
+            col("a"), rank().over(Window.order_by("b")).alias("r")
+        ).filter(col("r") == 1),
+        # a constant on top of an aggregation
+        lambda df: df.select(sum_(col("a")).alias("s")).select(lit(1).alias("one")),
+        # SQL text
+        lambda df: df.select(col("a"), (col("b") + 1).alias("c")).select(
+            sql_expr("a + 1")
+        ),
+        # a sort is a boundary
+        lambda df: df.sort(col("a")).filter(col("b") > 1),
+    ],
+)
+def test_no_merge(df, transform):
+    assert last_query(transform(df)).count("FROM") == 2
+
+
+def test_disabled_by_default(mock_session):
+    assert mock_session.sql_simplifier_enabled is False
+    df = mock_session.sql("select a, b from t").filter(col("a") > 1).select(col("a"))
+    assert last_query(df).count("FROM") == 2
+
+
+def test_no_merge_of_columns_dropped_by_child(df):
+    # the child drops "B", so the parent must not be evaluated on the FROM clause
+    df = df.select(col("a"))
+    assert last_query(df.select(col("b"))).count("FROM") == 2
+    assert last_query(df.filter(col("b") > 1)).count("FROM") == 2
+    assert last_query(df.filter(sql_expr("a > 1"))).count("FROM") == 2
+    # but the columns the child projects can be referenced
+    assert last_query(df.select(col("a"))) == 'SELECT "A" FROM (select a, b from t)'
+    assert last_query(df.filter(col("a") > 1)) == (
+        'SELECT "A" FROM (select a, b from t) WHERE ("A" > 1 :: bigint)'
+    )
+
+
+def test_merge_on_child_projecting_star(df):
+    df = df.filter(col("a") > 1)
+    assert last_query(df.select(col("b"))) == (
+        'SELECT "B" FROM (select a, b from t) WHERE ("A" > 1 :: bigint)'
+    )
+    assert last_query(df.filter(sql_expr("b < 3"))).count("FROM") == 1
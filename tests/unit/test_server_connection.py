@@ -0,0 +1,748 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import mock
+
+import numpy
+import pytest
+from pyarrow import parquet
+
+from snowflake.connector.constants import FIELD_NAME_TO_ID
+from snowflake.connector.cursor import ResultMetadata, SnowflakeCursor
+from snowflake.connector.errors import ProgrammingError
+from snowflake.connector.options import pandas, pyarrow
+from snowflake.connector.result_batch import ArrowResultBatch
+from snowflake.snowpark import DataFrame
+from snowflake.snowpark._internal.analyzer.analyzer import BULK_LOAD_THRESHOLD
+from snowflake.snowpark._internal.analyzer.analyzer_utils import (
+    batch_insert_into_statement,
+    create_file_format_statement,
+    create_table_statement,
+    drop_table_if_exists_statement,
+    insert_into_statement,
+)
+from snowflake.snowpark._internal.analyzer.expression import Attribute
+from snowflake.snowpark._internal.analyzer.snowflake_plan import (
+    BatchInsertQuery,
+    BulkLoadQuery,
+    Query,
+)
+from snowflake.snowpark._internal.server_connection import (
+    CursorPool,
+    ServerConnection,
+    _arrow_batches_to_numpy,
+    _query_dependencies,
+)
+from snowflake.snowpark.async_job import AsyncJob, _AsyncResultType, _iterate_async
+from snowflake.snowpark.exceptions import (
+    SnowparkFetchDataException,
+    SnowparkQueryCancelledException,
+)
+from snowflake.snowpark.query_history import QueryRecord
+from snowflake.snowpark.row import Row
+from snowflake.snowpark.types import (
+    ArrayType,
+    BinaryType,
+    DecimalType,
+    IntegerType,
+    LongType,
+)
+
+
+def test_query_dependencies():
+    queries = [
+        Query(create_table_statement("SNOWPARK_TEMP_TABLE_A", '"A" INT', temp=True)),
+        BatchInsertQuery(batch_insert_into_statement("SNOWPARK_TEMP_TABLE_A", ['"A"'])),
+        Query(create_table_statement("SNOWPARK_TEMP_TABLE_B", '"A" INT', temp=True)),
+        BatchInsertQuery(batch_insert_into_statement("SNOWPARK_TEMP_TABLE_B", ['"A"'])),
+        Query(
+            create_file_format_statement(
+                '"DB"."SCHEMA".SNOWPARK_TEMP_FILE_FORMAT_C',
+                "CSV",
+                {},
+                temp=True,
+                if_not_exist=True,
+            )
+        ),
+        Query("show tables"),
+        Query(
+            "select * from SNOWPARK_TEMP_TABLE_A join SNOWPARK_TEMP_TABLE_B using (a)"
+        ),
+    ]
+    queries.append(
+        Query(f"select * from table(result_scan('{queries[5].query_id_place_holder}'))")
+    )
+    # a temporary table created from a query depends on the previous queries
+    queries.append(
+        Query(
+            "create temporary table SNOWPARK_TEMP_TABLE_D as select * from t",
+        )
+    )
+    queries.append(
+        Query(insert_into_statement("SNOWPARK_TEMP_TABLE_E", "select * from t"))
+    )
+    assert _query_dependencies(queries) == [
+        set(),
+        {0},
+        set(),
+        {2},
+        set(),
+        {1, 3},
+        {0, 2, 5},
+        {5, 6},
+        {7},
+        {8},
+    ]
+
+
+def test_pipelined_get_result_set():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.is_still_running.return_value = False
+    conn.cursor.return_value.execute_async.side_effect = lambda query, **kwargs: {
+        "queryId": f"async {query}"
+    }
+    server_connection = ServerConnection({}, conn)
+    cursor = server_connection._cursor
+    cursor.execute.side_effect = lambda query, **kwargs: mock.Mock(
+        spec=SnowflakeCursor, sfqid=f"sync {query}", query=query, fetchall=lambda: []
+    )
+
+    plan = mock.Mock()
+    plan.session.pipelined_execution_enabled = True
+    plan.session._generate_new_action_id.return_value = 1
+    plan.session._last_canceled_id = 0
+    plan.queries = [
+        Query(
+            create_table_statement("SNOWPARK_TEMP_TABLE_A", '"A" INT', temp=True),
+            is_ddl_on_temp_object=True,
+        ),
+        Query("select 1"),
+        BatchInsertQuery(
+            batch_insert_into_statement("SNOWPARK_TEMP_TABLE_A", ['"A"']),
+            [Row(1)],
+        ),
+        Query("select * from SNOWPARK_TEMP_TABLE_A"),
+    ]
+    plan.post_actions = [
+        Query(
+            drop_table_if_exists_statement("SNOWPARK_TEMP_TABLE_A"),
+            is_ddl_on_temp_object=True,
+        )
+    ]
+    listener = mock.Mock()
+    server_connection.add_query_listener(listener)
+    server_connection.get_result_set(plan)
+
+    # the queries run by the threads block until they finish, and only the post
+    # action is submitted without waiting for it
+    async_queries = [
+        c.args[0] for c in conn.cursor.return_value.execute_async.call_args_list
+    ]
+    assert async_queries == [plan.post_actions[0].sql]
+    executed = [c.args[0] for c in cursor.execute.call_args_list]
+    assert sorted(executed[:2]) == sorted([plan.queries[0].sql, "select 1"])
+    assert executed[2:] == ["select * from SNOWPARK_TEMP_TABLE_A"]
+    conn.get_query_status_throw_if_error.assert_not_called()
+    assert cursor.executemany.call_count == 1
+    assert {c.args[0].query_id for c in listener._add_query.call_args_list} >= {
+        f"sync {plan.queries[0].sql}",
+        "sync select 1",
+    }
+    # the cursors of the threads are closed
+    assert conn.cursor.return_value.close.call_count == 3
+
+    # the post action is finished before the next action creates the table again
+    executed_before_wait = []
+    conn.get_query_status_throw_if_error.side_effect = (
+        lambda sfqid: executed_before_wait.append(cursor.execute.call_count)
+    )
+    server_connection.get_result_set(plan)
+    conn.get_query_status_throw_if_error.assert_called_once_with(
+        f"async {plan.post_actions[0].sql}"
+    )
+    assert executed_before_wait == [3]
+
+
+def test_pipelined_binary_plan_loads_sides_concurrently(
+    mock_session, mock_server_connection
+):
+    mock_server_connection.get_result_attributes.return_value = [
+        Attribute('"A"', LongType())
+    ]
+    df1 = mock_session.create_dataframe([[i] for i in range(1000)], schema=["a"])
+    df2 = mock_session.create_dataframe([[i] for i in range(1000)], schema=["a"])
+    plan = df1.union_all(df2)._plan
+    # create L, insert L, create R, insert R, select
+    assert [type(q) for q in plan.queries] == [
+        Query,
+        BatchInsertQuery,
+        Query,
+        BatchInsertQuery,
+        Query,
+    ]
+
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    # each insert waits for the other one, so they must run at the same time
+    both_inserting = threading.Barrier(2, timeout=10)
+    threads = set()
+
+    def executemany(query, params):
+        threads.add(threading.get_ident())
+        both_inserting.wait()
+        return mock.Mock(sfqid="insert", query=query)
+
+    cursor = conn.cursor.return_value
+    cursor.executemany.side_effect = executemany
+    cursor.execute.side_effect = lambda query, **kwargs: mock.Mock(
+        spec=SnowflakeCursor, sfqid=query, query=query, fetchall=lambda: []
+    )
+    mock_session.pipelined_execution_enabled = True
+    server_connection.get_result_set(plan)
+
+    assert len(threads) == 2
+    executed = [c.args[0] for c in cursor.execute.call_args_list]
+    assert sorted(executed[:2]) == sorted([plan.queries[0].sql, plan.queries[2].sql])
+    assert executed[2] == plan.queries[-1].sql
+    conn.get_query_status_throw_if_error.assert_not_called()
+
+
+def _mock_plan(queries, post_actions):
+    plan = mock.Mock()
+    plan.session.pipelined_execution_enabled = False
+    plan.session._result_cache = None
+    plan.session._result_spill_threshold = None
+    plan.session._generate_new_action_id.return_value = 1
+    plan.session._last_canceled_id = 0
+    plan.queries = queries
+    plan.post_actions = post_actions
+    return plan
+
+
+def test_async_job():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.is_still_running.return_value = False
+    conn.cursor.return_value.execute_async.return_value = {"queryId": "id"}
+    result_cursor = conn.cursor.return_value
+    result_cursor.fetchall.return_value = [(1,), (2,)]
+    result_cursor.description = [mock.Mock()]
+    result_cursor.description[0].name = "A"
+    server_connection = ServerConnection({}, conn)
+    plan = _mock_plan(
+        [Query("select a from t")],
+        [Query(drop_table_if_exists_statement("SNOWPARK_TEMP_TABLE_A"))],
+    )
+    plan.session._conn = server_connection
+    listener = mock.Mock()
+    server_connection.add_query_listener(listener)
+
+    async_job = server_connection.execute(plan, block=False)
+    assert isinstance(async_job, AsyncJob)
+    assert async_job.query_id == "id"
+    assert listener._add_query.call_args.args[0] == QueryRecord("id", "select a from t")
+    # the post actions run once the query is known to be finished
+    server_connection._cursor.execute.assert_not_called()
+    assert async_job.is_done()
+    server_connection._cursor.execute.assert_called_once()
+
+    assert async_job.result() == [Row(A=1), Row(A=2)]
+    result_cursor.query_result.assert_called_once_with("id")
+    assert async_job.result() == [Row(A=1), Row(A=2)]
+    assert result_cursor.query_result.call_count == 1
+    assert server_connection._cursor.execute.call_count == 1
+
+    async_job.cancel()
+    assert "SYSTEM$CANCEL_QUERY('id')" in (
+        server_connection._cursor.execute.call_args.args[0]
+    )
+
+
+def test_async_job_post_actions_run_on_cancel_or_collection():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.is_still_running.return_value = False
+    conn.cursor.return_value.execute_async.return_value = {"queryId": "id"}
+    server_connection = ServerConnection({}, conn)
+    drop = Query(drop_table_if_exists_statement("SNOWPARK_TEMP_TABLE_A"))
+    plan = _mock_plan([Query("select a from t")], [drop])
+    plan.session._conn = server_connection
+    cursor = server_connection._cursor
+
+    async_job = server_connection.execute(plan, block=False)
+    async_job.cancel()
+    assert [c.args[0] for c in cursor.execute.call_args_list] == [
+        "select SYSTEM$CANCEL_QUERY('id')",
+        drop.sql,
+    ]
+    # they only run once
+    async_job.cancel()
+    assert [c.args[0] for c in cursor.execute.call_args_list].count(drop.sql) == 1
+
+    # a job whose result is never fetched drops them after its query finishes
+    cursor.execute.reset_mock()
+    dropped = threading.Event()
+
+    def execute(query, **kwargs):
+        dropped.set()
+        return mock.Mock(sfqid="drop", query=query)
+
+    cursor.execute.side_effect = execute
+    server_connection.execute(plan, block=False)
+    assert dropped.wait(10)
+    conn.get_query_status_throw_if_error.assert_called_with("id")
+    assert cursor.execute.call_args.args[0] == drop.sql
+
+
+def test_copy_into_table_block_is_keyword_only():
+    parameter = inspect.signature(DataFrame.copy_into_table).parameters["block"]
+    assert parameter.kind is inspect.Parameter.KEYWORD_ONLY
+
+
+def test_async_job_canceled_by_cancel_all():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.is_still_running.return_value = False
+    conn.get_query_status_throw_if_error.side_effect = ProgrammingError("canceled")
+    conn.cursor.return_value.execute_async.return_value = {"queryId": "id"}
+    server_connection = ServerConnection({}, conn)
+    plan = _mock_plan([Query("select a from t")], [])
+    plan.session._conn = server_connection
+
+    async_job = server_connection.execute(
+        plan, block=False, data_type=_AsyncResultType.COUNT
+    )
+    plan.session._last_canceled_id = 2
+    with pytest.raises(SnowparkQueryCancelledException):
+        async_job.result()
+
+
+def test_async_job_result_async():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.is_still_running.side_effect = [True, True, False, False]
+    conn.cursor.return_value.execute_async.return_value = {"queryId": "id"}
+    result_cursor = conn.cursor.return_value
+    result_cursor.__iter__.return_value = iter([(i,) for i in range(5)])
+    result_cursor.description = [mock.Mock()]
+    result_cursor.description[0].name = "A"
+    server_connection = ServerConnection({}, conn)
+    plan = _mock_plan([Query("select a from t")], [])
+    plan.session._conn = server_connection
+
+    async_job = server_connection.execute(
+        plan, block=False, data_type=_AsyncResultType.ITERATOR
+    )
+
+    async def collect_rows():
+        rows = await async_job.result_async()
+        return [row async for row in _iterate_async(rows, batch_size=2)]
+
+    assert asyncio.run(collect_rows()) == [Row(A=i) for i in range(5)]
+    # the status is polled by the event loop until the query is done
+    assert conn.get_query_status.call_count == 3
+    conn.cursor.return_value.query_result.assert_called_once_with("id")
+
+
+def test_cursor_pool():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    conn.cursor.side_effect = lambda: mock.MagicMock(spec=SnowflakeCursor)
+    pool = CursorPool(conn, 2)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    # a third lease waits for a cursor to be released
+    leased = []
+    thread = threading.Thread(target=lambda: leased.append(pool.acquire()))
+    thread.start()
+    thread.join(0.1)
+    assert not leased
+    pool.release(first)
+    thread.join()
+    assert leased == [first]
+    # a cursor whose result is still read is not leased again
+    pool.release(second, reuse=False)
+    assert pool.acquire() not in (first, second)
+
+
+def test_concurrent_actions_lease_different_cursors():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    barrier = threading.Barrier(2, timeout=5)
+    executing_cursors = []
+
+    def new_cursor():
+        cursor = mock.MagicMock(spec=SnowflakeCursor)
+
+        def execute(query, **kwargs):
+            executing_cursors.append(cursor)
+            # both actions run their queries at the same time
+            barrier.wait()
+            cursor.fetchall.return_value = [(query,)]
+            return cursor
+
+        cursor.execute.side_effect = execute
+        cursor.description = None
+        cursor.query = cursor.sfqid = None
+        return cursor
+
+    conn.cursor.side_effect = new_cursor
+    server_connection = ServerConnection({}, conn)
+    server_connection.cursor_pool_size = 2
+
+    plans = [_mock_plan([Query(f"select {i}")], []) for i in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(server_connection.execute, plans))
+    assert results == [[Row("select 0")], [Row("select 1")]]
+    assert len(set(map(id, executing_cursors))) == 2
+    assert server_connection._default_cursor not in executing_cursors
+
+
+def test_run_query_to_arrow():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    cursor = server_connection._cursor
+    cursor.execute.return_value = cursor
+    cursor.description = [
+        ResultMetadata("A", FIELD_NAME_TO_ID["FIXED"], None, None, 38, 0, False),
+        ResultMetadata("B", FIELD_NAME_TO_ID["FIXED"], None, None, 38, 0, True),
+        ResultMetadata("C", FIELD_NAME_TO_ID["FIXED"], None, None, 10, 2, True),
+    ]
+    table = pyarrow.table(
+        {
+            "A": pyarrow.array([1, 2], pyarrow.decimal128(38, 0)),
+            "B": pyarrow.array([1, 10**20], pyarrow.decimal128(38, 0)),
+            "C": pyarrow.array([Decimal("1.50"), None], pyarrow.decimal128(10, 2)),
+        }
+    )
+    cursor.fetch_arrow_all.return_value = table
+    result = server_connection.run_query("select * from t", to_arrow=True)["data"]
+    # integers are cast unless they're out of the range of int64
+    assert result.schema.types == [
+        pyarrow.int64(),
+        pyarrow.decimal128(38, 0),
+        pyarrow.decimal128(10, 2),
+    ]
+    assert result.column(0).to_pylist() == [1, 2]
+
+    # the integers of each batch are fetched as the narrowest type of their values,
+    # and all batches are cast to one schema
+    narrow = pyarrow.table(
+        {
+            "A": pyarrow.array([1, 2], pyarrow.int8()),
+            "B": pyarrow.array([1, None], pyarrow.int16()),
+            "C": pyarrow.array([Decimal("1.50"), None], pyarrow.decimal128(10, 2)),
+        }
+    )
+    wide = pyarrow.table(
+        {
+            "A": pyarrow.array([1000, 2], pyarrow.decimal128(38, 0)),
+            "B": pyarrow.array([10**10, 1], pyarrow.int64()),
+            "C": pyarrow.array([None, None], pyarrow.decimal128(10, 2)),
+        }
+    )
+    cursor.fetch_arrow_batches.return_value = iter([narrow, wide, narrow])
+    batches = list(
+        server_connection.run_query("select * from t", to_iter=True, to_arrow=True)[
+            "data"
+        ]
+    )
+    assert len({batch.schema for batch in batches}) == 1
+    assert batches[0].schema.types == [
+        pyarrow.int64(),
+        pyarrow.int64(),
+        pyarrow.decimal128(10, 2),
+    ]
+    assert batches[1].column(1).to_pylist() == [10**10, 1]
+    # a batch can't be cast once the previous ones are returned
+    cursor.fetch_arrow_batches.return_value = iter([narrow, table])
+    with pytest.raises(SnowparkFetchDataException, match="out of the range of int64"):
+        list(
+            server_connection.run_query("select * from t", to_iter=True, to_arrow=True)[
+                "data"
+            ]
+        )
+
+    # the connector returns None for an empty result
+    cursor.fetch_arrow_all.return_value = None
+    result = server_connection.run_query("select * from t", to_arrow=True)["data"]
+    assert result.num_rows == 0
+    assert result.schema.names == ["A", "B", "C"]
+    assert result.schema.types[2] == pyarrow.decimal128(10, 2)
+
+
+def test_arrow_batches_to_numpy():
+    description = [
+        ResultMetadata("A", FIELD_NAME_TO_ID["FIXED"], None, None, 38, 0, True),
+        ResultMetadata("B", FIELD_NAME_TO_ID["FIXED"], None, None, 10, 2, True),
+        ResultMetadata("C", FIELD_NAME_TO_ID["TEXT"], None, None, None, None, True),
+        ResultMetadata("D", FIELD_NAME_TO_ID["DATE"], None, None, None, None, True),
+        ResultMetadata("A", FIELD_NAME_TO_ID["REAL"], None, None, None, None, True),
+    ]
+    batches = [
+        pyarrow.table(
+            [
+                pyarrow.array([1, 2], pyarrow.int8()),
+                pyarrow.array([Decimal("1.50"), Decimal("2.25")]),
+                pyarrow.array(["a", "b"]),
+                pyarrow.array([0, 1], pyarrow.date32()),
+                pyarrow.array([0.5, 1.5]),
+            ],
+            names=["A", "B", "C", "D", "A"],
+        ),
+        pyarrow.table(
+            [
+                pyarrow.array([None, 2**40], pyarrow.int64()),
+                pyarrow.array([Decimal("3.00"), None]),
+                pyarrow.array([None, "c"]),
+                pyarrow.array([2, 3], pyarrow.date32()),
+                pyarrow.array([2.5, 3.5]),
+            ],
+            names=["A", "B", "C", "D", "A"],
+        ),
+    ]
+    columns = _arrow_batches_to_numpy(batches, description)
+    # the first column of a duplicate name is returned
+    assert list(columns) == ["A", "B", "C", "D"]
+    assert columns["A"].dtype == "int64"
+    assert columns["A"].tolist() == [1, 2, None, 2**40]
+    assert columns["B"].dtype == "float64"
+    assert columns["B"].tolist() == [1.5, 2.25, 3.0, None]
+    assert columns["C"].dtype == object
+    assert columns["C"].mask.tolist() == [False, False, True, False]
+    assert columns["D"].dtype == "datetime64[D]"
+    assert columns["D"].astype(int).tolist() == [0, 1, 2, 3]
+
+    columns = _arrow_batches_to_numpy([], description[:2])
+    assert columns["A"].dtype == "int64"
+    assert len(columns["B"]) == 0
+
+
+def test_run_query_to_pandas_in_parallel():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    cursor = server_connection._cursor
+    cursor.execute.return_value = cursor
+    cursor.description = [
+        ResultMetadata("A", FIELD_NAME_TO_ID["FIXED"], None, None, 38, 0, False),
+    ]
+    batches = []
+    for i in range(4):
+        batch = mock.create_autospec(ArrowResultBatch)
+        batch.to_pandas.return_value = pandas.DataFrame({"A": [float(i), i + 0.0]})
+        batches.append(batch)
+    cursor.get_result_batches.return_value = batches
+    result = server_connection.run_query(
+        "select * from t", to_pandas=True, max_workers=2
+    )["data"]
+    # the chunks are concatenated in order, and integers are fixed per chunk
+    assert result["A"].tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert str(result["A"].dtype).startswith("int")
+    assert list(result.index) == list(range(8))
+    cursor.fetch_pandas_all.assert_not_called()
+    for batch in batches:
+        batch.to_pandas.assert_called_once_with(connection=conn)
+
+    # the chunks ahead of the one being collected are bounded
+    started = []
+
+    def to_pandas(i, connection):
+        started.append(i)
+        if i == 0:
+            # the other chunks can run meanwhile
+            time.sleep(0.2)
+            started_while_first_ran.extend(started)
+        return pandas.DataFrame({"A": [i]})
+
+    started_while_first_ran = []
+    batches = []
+    for i in range(20):
+        batch = mock.create_autospec(ArrowResultBatch)
+        batch.to_pandas.side_effect = functools.partial(to_pandas, i)
+        batches.append(batch)
+    cursor.get_result_batches.return_value = batches
+    result = server_connection.run_query(
+        "select * from t", to_pandas=True, max_workers=2
+    )["data"]
+    assert result["A"].tolist() == list(range(20))
+    assert len(started_while_first_ran) == 4
+
+    # a result that isn't fetched in the Arrow format is fetched as rows
+    cursor.get_result_batches.return_value = [mock.MagicMock(), mock.MagicMock()]
+    cursor.fetchall.return_value = [(1,)]
+    assert server_connection.run_query("show tables", to_pandas=True, max_workers=2)[
+        "data"
+    ] == [(1,)]
+
+
+def test_run_bulk_load():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    uploaded, executed = {}, []
+
+    def execute(sql, file_stream=None, **kwargs):
+        if file_stream is not None:
+            uploaded[sql] = parquet.read_table(file_stream)
+        else:
+            executed.append(sql)
+        return mock.MagicMock()
+
+    conn.cursor.return_value.execute.side_effect = execute
+    attributes = [
+        Attribute('"A"', LongType()),
+        Attribute('"B"', DecimalType(10, 2)),
+        Attribute('"C"', BinaryType()),
+    ]
+    rows = [Row(i, Decimal("1.5") if i % 2 else i, bytes([i])) for i in range(10)]
+    query = BulkLoadQuery(
+        "copy into t", rows, attributes, "@stage/dir", ["C0", "C1", "C2"]
+    )
+    with mock.patch(
+        "snowflake.snowpark._internal.server_connection._BULK_LOAD_CELLS_PER_FILE", 12
+    ):
+        server_connection.run_bulk_load(query)
+
+    # 4 rows of 3 columns per file, uploaded before the COPY statement runs
+    assert sorted(uploaded) == [
+        f"PUT 'file:///tmp/placeholder/{i}.parquet' '@stage/dir' PARALLEL = 1 "
+        "AUTO_COMPRESS = FALSE SOURCE_COMPRESSION = AUTO_DETECT OVERWRITE = TRUE"
+        for i in range(3)
+    ]
+    tables = [uploaded[sql] for sql in sorted(uploaded)]
+    assert [t.num_rows for t in tables] == [4, 4, 2]
+    table = pyarrow.concat_tables(tables)
+    assert table.column("C0").to_pylist() == list(range(10))
+    assert table.column("C1").type == pyarrow.decimal128(10, 2)
+    assert table.column("C1").to_pylist()[:2] == [Decimal("0.00"), Decimal("1.50")]
+    assert table.column("C2").to_pylist()[1] == "01"
+    assert executed == ["copy into t"]
+    # each upload thread closes its cursor
+    assert conn.cursor.return_value.close.call_count == 3
+
+
+def test_run_bulk_load_in_stored_procedure():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    uploaded = {}
+
+    def upload_stream(stream, path):
+        uploaded[path] = parquet.read_table(stream)
+
+    conn.cursor.return_value.upload_stream.side_effect = upload_stream
+    conn.cursor.return_value.execute.return_value = mock.MagicMock()
+    query = BulkLoadQuery(
+        "copy into t",
+        [Row(i) for i in range(3)],
+        [Attribute('"A"', LongType())],
+        "'@stage/dir'",
+        ["C0"],
+    )
+    with mock.patch(
+        "snowflake.snowpark._internal.server_connection._BULK_LOAD_CELLS_PER_FILE", 2
+    ), mock.patch(
+        "snowflake.snowpark._internal.server_connection.is_in_stored_procedure",
+        return_value=True,
+    ):
+        server_connection.run_bulk_load(query)
+    assert sorted(uploaded) == ["@stage/dir/0.parquet", "@stage/dir/1.parquet"]
+    assert uploaded["@stage/dir/1.parquet"].column("C0").to_pylist() == [2]
+
+
+def test_run_bulk_load_from_arrow_table():
+    conn = mock.MagicMock()
+    conn.is_closed.return_value = False
+    server_connection = ServerConnection({}, conn)
+    uploaded = {}
+
+    def execute(sql, file_stream=None, **kwargs):
+        if file_stream is not None:
+            uploaded[sql] = parquet.read_table(file_stream)
+        return mock.MagicMock()
+
+    conn.cursor.return_value.execute.side_effect = execute
+    table = pyarrow.table(
+        {
+            "a": pyarrow.array(range(5), pyarrow.int32()),
+            "b": pyarrow.array([b"x"] * 5),
+            "c": pyarrow.array([[i] for i in range(5)]),
+            "d": pyarrow.array([2**64 - 1] * 5, pyarrow.uint64()),
+        }
+    )
+    attributes = [
+        Attribute('"a"', IntegerType()),
+        Attribute('"b"', BinaryType()),
+        Attribute('"c"', ArrayType(LongType())),
+        Attribute('"d"', LongType()),
+    ]
+    query = BulkLoadQuery(
+        "copy into t", table, attributes, "@stage/dir", ["C0", "C1", "C2", "C3"]
+    )
+    with mock.patch(
+        "snowflake.snowpark._internal.server_connection._BULK_LOAD_CELLS_PER_FILE", 8
+    ):
+        server_connection.run_bulk_load(query)
+
+    tables = [uploaded[sql] for sql in sorted(uploaded)]
+    assert [t.num_rows for t in tables] == [2, 2, 1]
+    result = pyarrow.concat_tables(tables)
+    # columns are cast to the Arrow types of their attributes, except binary and
+    # nested columns, and values that can't be cast are written as text
+    assert result.schema == pyarrow.schema(
+        [
+            ("C0", pyarrow.int64()),
+            ("C1", pyarrow.binary()),
+            ("C2", pyarrow.list_(pyarrow.int64())),
+            ("C3", pyarrow.string()),
+        ]
+    )
+    assert result.column("C2").to_pylist() == [[i] for i in range(5)]
+    assert result.column("C3").to_pylist()[0] == str(2**64 - 1)
+
+
+def test_large_local_relation_is_bulk_loaded(mock_session):
+    mock_session.get_session_stage = mock.MagicMock(return_value="@db.s.stage")
+    df = mock_session.create_dataframe(
+        [[i, str(i)] for i in range(BULK_LOAD_THRESHOLD // 2)], schema=["a", "b"]
+    )
+    load_query = df._plan.queries[1]
+    assert isinstance(load_query, BulkLoadQuery)
+    assert load_query.stage_location.startswith("@db.s.stage/SNOWPARK_TEMP_TABLE_")
+    assert "$1:C0::BIGINT" in load_query.sql
+    assert "PURGE = True" in load_query.sql
+
+    df = mock_session.create_dataframe([[i] for i in range(1000)], schema=["a"])
+    assert isinstance(df._plan.queries[1], BatchInsertQuery)
+
+
+def test_arrow_table_is_bulk_loaded(mock_session):
+    mock_session.get_session_stage = mock.MagicMock(return_value="@db.s.stage")
+    table = pyarrow.table({"a": [1, 2], "b": [["x"], None]})
+    df = mock_session.create_dataframe(table)
+    create_query, load_query = df._plan.queries[:2]
+    assert '("a" BIGINT, "b" ARRAY)' in create_query.sql
+    assert isinstance(load_query, BulkLoadQuery)
+    assert load_query.rows is table
+    assert "$1:C0::BIGINT, $1:C1::ARRAY" in load_query.sql
+
+    # the fields of a structured array are converted to Arrow arrays
+    data = numpy.array([(1, 2.5)], dtype=[("x", "i2"), ("y", "f8")])
+    df = mock_session.create_dataframe(data, schema=["a", "b"])
+    create_query, load_query = df._plan.queries[:2]
+    assert '("A" SMALLINT, "B" DOUBLE)' in create_query.sql
+    assert load_query.rows.column("x").type == pyarrow.int16()
+
+    df = mock_session.create_dataframe(table.slice(0, 0))
+    assert len(df._plan.queries) == 1
@@ -1,9 +1,77 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
+import datetime
+from unittest import mock
 
-from snowflake.snowpark import Session
+import numpy
+import pytest
+
+from snowflake.snowpark import Row, Session
+from snowflake.snowpark.types import (
+    ArrayType,
+    DateType,
+    StringType,
+    StructField,
+    StructType,
+)
 
 
 def test_aliases():
     assert Session.createDataFrame == Session.create_dataframe
+
+
+def test_create_dataframe_infers_schema_beyond_sample(mock_session):
+    # the values after the first 1000 rows have a type that isn't in the sample
+    df = mock_session.create_dataframe(
+        [[None, "a"]] * 1000 + [[1, "b"]], schema=["a", "b"]
+    )
+    create_query, insert_query = df._plan.queries[:2]
+    assert '"A" BIGINT' in create_query.sql
+    assert insert_query.rows[-1] == Row(1, "b")
+
+    with pytest.raises(TypeError):
+        mock_session.create_dataframe([[1]] * 1000 + [["a"]], schema=["a"])
+
+
+def test_create_dataframe_from_numpy_array(mock_session):
+    df = mock_session.create_dataframe(
+        numpy.array([[1.5, 2], [3, 4]]), schema=["a", "b"]
+    )
+    assert (
+        "VALUES ('1.5' :: FLOAT, '2.0' :: FLOAT), ('3.0' :: FLOAT, '4.0' :: FLOAT)"
+        in df._plan.queries[-1].sql
+    )
+
+    df = mock_session.create_dataframe(numpy.array(["x", "y"]), schema=["a"])
+    assert "VALUES ('x' :: string), ('y' :: string)" in df._plan.queries[-1].sql
+
+    with pytest.raises(TypeError, match="NumPy array with one or two dimensions"):
+        mock_session.create_dataframe(numpy.zeros((2, 2, 2)))
+
+
+def test_create_dataframe_from_structured_numpy_array_without_pyarrow(mock_session):
+    data = numpy.array([(1, 2.5)], dtype=[("a", "i8"), ("b", "f8")])
+    with mock.patch("snowflake.snowpark.session.installed_pandas", False):
+        with pytest.raises(ImportError, match="requires PyArrow"):
+            mock_session.create_dataframe(data)
+        # an unstructured array doesn't need it
+        mock_session.create_dataframe(numpy.array([[1, 2]]), schema=["a", "b"])
+
+
+def test_create_dataframe_converts_values_by_column(mock_session):
+    schema = StructType(
+        [
+            StructField("a", ArrayType(StringType())),
+            StructField("b", DateType()),
+        ]
+    )
+    df = mock_session.create_dataframe(
+        [[["x"], datetime.date(2022, 1, 1)], [None, None]], schema
+    )
+    sql = df._plan.queries[-1].sql
+    assert "('[\"x\"]' :: string, '2022-01-01' :: string)" in sql
+    assert "(NULL :: string, NULL :: string)" in sql
+
+    with pytest.raises(TypeError, match="Cannot cast"):
+        mock_session.create_dataframe([["x", None]], schema)
@@ -0,0 +1,100 @@
+#
+# Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
+#
+from unittest import mock
+
+import pandas
+import pytest
+from pyarrow import parquet
+
+from snowflake.connector.options import pyarrow
+from snowflake.snowpark import Row
+from snowflake.snowpark.types import (
+    ArrayType,
+    LongType,
+    StringType,
+    StructField,
+    StructType,
+)
+
+SCHEMA = StructType(
+    [
+        StructField("a", LongType()),
+        StructField("b", StringType()),
+        StructField("c", ArrayType(LongType())),
+    ]
+)
+
+
+@pytest.fixture
+def uploaded(mock_session, mock_server_connection):
+    mock_session.get_session_stage = mock.MagicMock(return_value="@stage")
+    files = {}
+
+    def put_stream(stream, stage_location, file_name):
+        files[f"{stage_location}/{file_name}"] = parquet.read_table(stream)
+
+    mock_server_connection._put_stream.side_effect = put_stream
+    mock_server_connection.submit_query.side_effect = lambda sql: sql
+    return files
+
+
+def test_write_stream(mock_session, mock_server_connection, uploaded):
+    with mock_session.write_stream(
+        "t", SCHEMA, target_file_size=1, files_per_copy=2
+    ) as writer:
+        writer.write([Row(1, "x", [1]), (2, None, [2, 3])])
+        writer.write(pyarrow.table({"x": [3], "y": ["z"], "z": [[4]]}))
+        writer.write(pandas.DataFrame({"x": [4], "y": ["w"], "z": [[5]]}))
+        writer.write([])
+
+    create_sql = mock_server_connection.run_query.call_args_list[0][0][0]
+    assert create_sql.startswith(" CREATE  TABLE t")
+    assert "NOT  EXISTS" in create_sql
+
+    # one file per batch and one COPY INTO statement per directory of 2 files
+    assert len(uploaded) == 3
+    directories = sorted({name.rsplit("/", 2)[1] for name in uploaded})
+    assert directories == ["0", "1"]
+    copies = [c[0][0] for c in mock_server_connection.wait_for_query.call_args_list]
+    assert len(copies) == 2
+    assert all("PURGE = True" in sql for sql in copies)
+    assert copies[0].split("FROM @stage/")[1].split("/")[1] == "0"
+
+    table = pyarrow.concat_tables(uploaded[name] for name in sorted(uploaded))
+    assert table.column_names == ["C0", "C1", "C2"]
+    assert table.column("C0").to_pylist() == [1, 2, 3, 4]
+    assert table.column("C2").to_pylist() == [[1], [2, 3], [4], [5]]
+
+
+def test_write_stream_buffers_batches(mock_session, mock_server_connection, uploaded):
+    writer = mock_session.write_stream("t", SCHEMA, create_table=False)
+    for i in range(10):
+        writer.write([(i, str(i), [i])])
+    assert not uploaded
+    writer.flush()
+    assert len(uploaded) == 1
+    assert list(uploaded.values())[0].num_rows == 10
+    assert mock_server_connection.wait_for_query.call_count == 1
+    mock_server_connection.run_query.assert_not_called()
+
+    writer.close()
+    with pytest.raises(ValueError, match="closed"):
+        writer.write([(1, "a", [1])])
+
+
+def test_write_stream_raises_upload_error(mock_session, mock_server_connection):
+    mock_session.get_session_stage = mock.MagicMock(return_value="@stage")
+    mock_server_connection._put_stream.side_effect = RuntimeError("upload failed")
+    writer = mock_session.write_stream("t", SCHEMA, target_file_size=1)
+    writer.write([(1, "a", [1])])
+    with pytest.raises(RuntimeError, match="upload failed"):
+        writer.flush()
+    mock_server_connection.submit_query.assert_not_called()
+    # the data of the failed file is lost, so the writer can't be used anymore
+    with pytest.raises(RuntimeError, match="upload failed"):
+        writer.write([(2, "b", [2])])
+
+    writer = mock_session.write_stream("t", SCHEMA)
+    with pytest.raises(ValueError, match="fields are required"):
+        writer.write([(1, "a")])
@@ -2,7 +2,12 @@
 #
 # Copyright (c) 2012-2022 Snowflake Computing Inc. All rights reserved.
 #
-from snowflake.snowpark._internal.telemetry import safe_telemetry
+import asyncio
+import inspect
+from unittest import mock
+
+from snowflake.snowpark import DataFrame
+from snowflake.snowpark._internal.telemetry import df_action_telemetry, safe_telemetry
 
 
 @safe_telemetry
@@ -18,3 +23,38 @@ def raise_exception():
 # and then test the telemetry decorator that way
 def test_safe_telemetry_decorator():
     raise_exception()
+
+
+def test_df_action_telemetry_of_coroutines_and_async_iterators():
+    assert inspect.iscoroutinefunction(DataFrame.collect_async)
+    assert inspect.iscoroutinefunction(DataFrame.to_pandas_async)
+    assert inspect.isasyncgenfunction(DataFrame.to_local_iterator_async)
+    assert inspect.isasyncgenfunction(DataFrame.to_pandas_batches_async)
+
+    class FakeDataFrame:
+        def __init__(self):
+            self._session = mock.Mock()
+
+        @df_action_telemetry
+        async def collect_async(self):
+            return [1, 2]
+
+        @df_action_telemetry
+        async def to_local_iterator_async(self):
+            for i in range(2):
+                yield i
+
+    df = FakeDataFrame()
+    send = df._session._conn._telemetry_client.send_function_usage_telemetry
+    coroutine = df.collect_async()
+    # nothing is sent when the coroutine is created
+    send.assert_not_called()
+    assert asyncio.run(coroutine) == [1, 2]
+    assert send.call_args.args[0] == "action_collect_async"
+
+    async def iterate():
+        return [i async for i in df.to_local_iterator_async()]
+
+    assert asyncio.run(iterate()) == [0, 1]
+    assert send.call_count == 2
+    assert send.call_args.args[0] == "action_to_local_iterator_async"
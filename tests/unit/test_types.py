@@ -10,9 +10,12 @@ from datetime import date, datetime, time
 from decimal import Decimal
 
 import pandas
+import pyarrow
 import pytest
 
 from snowflake.snowpark._internal.type_utils import (
+    convert_arrow_to_sp_schema,
+    convert_arrow_to_sp_type,
     get_number_precision_scale,
     infer_type,
     python_type_to_snow_type,
@@ -42,6 +45,7 @@ from snowflake.snowpark.types import (
     ShortType,
     StringType,
     StructField,
+    StructType,
     TimestampType,
     TimeType,
     Variant,
@@ -257,6 +261,44 @@ def test_strip_unnecessary_quotes():
     assert func('" $abc  "') == '" $abc  "'
 
 
+def test_convert_arrow_to_sp_schema():
+    schema = convert_arrow_to_sp_schema(
+        pyarrow.schema(
+            [
+                pyarrow.field("a", pyarrow.int8(), nullable=False),
+                ("b", pyarrow.uint32()),
+                ("c", pyarrow.float32()),
+                ("d", pyarrow.decimal128(10, 2)),
+                ("e", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+                ("f", pyarrow.large_binary()),
+                ("g", pyarrow.timestamp("ns", tz="UTC")),
+                ("h", pyarrow.list_(pyarrow.date32())),
+                ("i", pyarrow.map_(pyarrow.string(), pyarrow.int64())),
+                ("j", pyarrow.struct([("x", pyarrow.time64("us"))])),
+                ("k", pyarrow.null()),
+            ]
+        )
+    )
+    assert schema == StructType(
+        [
+            StructField('"a"', ByteType(), nullable=False),
+            StructField('"b"', LongType()),
+            StructField('"c"', FloatType()),
+            StructField('"d"', DecimalType(10, 2)),
+            StructField('"e"', StringType()),
+            StructField('"f"', BinaryType()),
+            StructField('"g"', TimestampType()),
+            StructField('"h"', ArrayType(DateType())),
+            StructField('"i"', MapType(StringType(), LongType())),
+            StructField('"j"', MapType(StringType(), StringType())),
+            StructField('"k"', NullType()),
+        ]
+    )
+
+    with pytest.raises(TypeError, match="Unsupported Arrow type"):
+        convert_arrow_to_sp_type(pyarrow.decimal256(40, 0))
+
+
 def test_python_type_to_snow_type():
     def check_type(python_type, snow_type, is_nullable):
         assert python_type_to_snow_type(python_type) == (snow_type, is_nullable)